@@ -0,0 +1,126 @@
+# app/cache.py
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    In-process LRU cache with a per-entry TTL. Thread-safe; keeps hit/miss
+    counters so callers can expose a hit rate.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class RedisCache:
+    """
+    Shared cache stored in Redis so every uvicorn worker sees the same
+    entries and invalidations. Values must be JSON-serializable.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, namespace: str, ttl: float = 60.0):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("A redis:// cache URL was configured but the 'redis' package is not installed") from e
+        self._client = redis.Redis.from_url(url)
+        self.namespace = namespace
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key, default=None):
+        raw = self._client.get(self._key(key))
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value):
+        if self.ttl <= 0:
+            return
+        self._client.set(self._key(key), json.dumps(value, default=str), px=int(self.ttl * 1000))
+
+    def delete(self, key):
+        self._client.delete(self._key(key))
+
+    def clear(self):
+        for key in self._client.scan_iter(match=f"{self.namespace}:*"):
+            self._client.delete(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "redis",
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def make_cache(namespace: str, maxsize: int, ttl: float, url: str = ""):
+    """
+    Build a cache: shared Redis when `url` is set, in-process LRU otherwise.
+    """
+    if url:
+        return RedisCache(url, namespace, ttl)
+    return TTLCache(maxsize, ttl)
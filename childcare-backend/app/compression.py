@@ -0,0 +1,104 @@
+# app/compression.py
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware import gzip
+from starlette.middleware.gzip import IdentityResponder
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+# Bodies that are compressed already (gzipped exports, archives, media):
+# a second pass only costs CPU, and would hide a .gz download behind a
+# Content-Encoding the client strips
+COMPRESSED_MEDIA_TYPES = (
+    "application/gzip", "application/x-gzip", "application/zip", "application/zstd",
+    "application/x-bzip2", "application/x-xz", "application/x-7z-compressed",
+    "image/png", "image/jpeg", "image/gif", "image/webp", "audio/", "video/", "font/woff",
+)
+
+
+class _PassCompressed:
+    # Leave COMPRESSED_MEDIA_TYPES alone, like Starlette does event streams
+    async def send_with_compression(self, message):
+        await super().send_with_compression(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.content_type_is_excluded = self.content_type_is_excluded or content_type.startswith(COMPRESSED_MEDIA_TYPES)
+
+
+class GZipResponder(_PassCompressed, gzip.GZipResponder):
+    pass
+
+
+class BrotliResponder(_PassCompressed, IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app, minimum_size: int, quality: int = 4):
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        out = self.compressor.process(body)
+        # Flush each streamed chunk so clients see data as it is produced
+        return out + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+def _accepted_encodings(header: str) -> set:
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _weak_etag_send(send):
+    # A compressed body is a different representation: keep ETags weak
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/") and "content-encoding" in headers:
+                headers["etag"] = "W/" + etag
+        await send(message)
+    return wrapped
+
+
+class CompressionMiddleware:
+    """
+    Negotiated response compression above `minimum_size` bytes: brotli when
+    the client accepts it and the `brotli` package is installed, else gzip.
+    Responses that already set Content-Encoding, already compressed media
+    types (COMPRESSED_MEDIA_TYPES, e.g. `?gzip=true` exports served as
+    application/gzip files) and event streams pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif "gzip" in accepted:
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, _weak_etag_send(send))
@@ -1,5 +1,6 @@
 # app/config.py
 from dotenv import load_dotenv
+from pathlib import Path
 import os
 
 load_dotenv()  # Load environment variables from .env file
@@ -11,4 +12,96 @@ class Settings:
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES") or 60)
     FRONTEND_URL: str = os.getenv("FRONTEND_URL") or "http://localhost:5173"
 
+    # Migrations live in childcare-db-schema (`alembic upgrade head`); startup only
+    # compares the database revision with the head: "strict" refuses to start, "warn", "off"
+    ALEMBIC_CONFIG: str = os.getenv("ALEMBIC_CONFIG") or str(
+        Path(__file__).resolve().parents[2] / "childcare-db-schema" / "alembic.ini"
+    )
+    SCHEMA_CHECK: str = (os.getenv("SCHEMA_CHECK") or "strict").lower()
+
+    # Start-up warm-up (schema check, pool pre-warming, validator pre-compilation).
+    # "blocking" finishes it before serving; "background" opens the port at once
+    # and GET /health/ready answers 503 until it is done (scale-to-zero platforms)
+    STARTUP_MODE: str = (os.getenv("STARTUP_MODE") or "blocking").lower()
+    # Pool connections opened in parallel during warm-up (capped at the pool size)
+    POOL_PREWARM: int = int(os.getenv("POOL_PREWARM") or 1)
+
+    # "sync" (threadpool + SessionLocal) or "async" (AsyncEngine, handlers run on the event loop)
+    DB_MODE: str = (os.getenv("DB_MODE") or "sync").lower()
+    # Defaults to DATABASE_URL with the async driver (asyncpg / aiosqlite) swapped in
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL") or ""
+
+    # Optional read replica: GET/HEAD requests read from it, except for a user's
+    # requests within REPLICA_READ_YOUR_WRITES_SECONDS of their last write.
+    # Keep the window above the replica's worst-case lag, or a user may not see
+    # their own write once it ends (ETags stay correct: see conditional_get)
+    DATABASE_REPLICA_URL: str = os.getenv("DATABASE_REPLICA_URL") or ""
+    ASYNC_DATABASE_REPLICA_URL: str = os.getenv("ASYNC_DATABASE_REPLICA_URL") or ""
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = float(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS") or 5)
+
+    # SQLAlchemy connection pool, per engine and per uvicorn worker: keep
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below Postgres max_connections
+    # (or PgBouncer's pool). Defaults are SQLAlchemy's.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE") or 5)
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW") or 10)
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT") or 30)
+    # Seconds before a connection is replaced (-1: never); set below any idle timeout on the way to the server
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE") or -1)
+    DB_POOL_PRE_PING: bool = (os.getenv("DB_POOL_PRE_PING") or "").lower() in ("1", "true", "yes")
+    # Behind PgBouncer in transaction mode: no client-side pool (NullPool) and no
+    # asyncpg prepared statement caching
+    DB_PGBOUNCER: bool = (os.getenv("DB_PGBOUNCER") or "").lower() in ("1", "true", "yes")
+
+    # bcrypt process pool (0 workers = hash inline); requests beyond workers + queue get a 503.
+    # With DB_MODE=sync waiting requests hold threadpool threads, so in-flight hashes are
+    # also capped at a quarter of the threadpool (anyio's 40 threads by default: 10).
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS") or 2)
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE") or 32)
+
+    # Authenticated principal cache for get_current_user (TTL 0 disables).
+    # Set CACHE_REDIS_URL to share caches (and their invalidations) across workers.
+    # ETags don't need it: their table versions are kept in the database.
+    PRINCIPAL_CACHE_TTL: float = float(os.getenv("PRINCIPAL_CACHE_TTL") or 60)
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE") or 1024)
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL") or ""
+    # Follow the table versions over PostgreSQL LISTEN (one extra connection per
+    # worker) so ETag revalidations are answered without a query. LISTEN needs a
+    # direct or session-mode connection: off by default with DB_PGBOUNCER.
+    TABLE_VERSIONS_LISTEN: bool = (
+        os.getenv("TABLE_VERSIONS_LISTEN") or ("false" if DB_PGBOUNCER else "true")
+    ).lower() in ("1", "true", "yes")
+
+    # GET /dashboard metrics cache (seconds; 0 disables). Writes invalidate it.
+    DASHBOARD_CACHE_TTL: float = float(os.getenv("DASHBOARD_CACHE_TTL") or 15)
+    # GET /activities/calendar expansions of recurring activities (seconds; 0 disables).
+    # Keyed by the activity table versions, so writes never serve a stale window.
+    CALENDAR_CACHE_TTL: float = float(os.getenv("CALENDAR_CACHE_TTL") or 300)
+
+    # Opt-in fast responses: orjson for plain responses, and response models
+    # validated and dumped straight to JSON bytes by cached TypeAdapters
+    FAST_JSON: bool = (os.getenv("FAST_JSON") or "").lower() in ("1", "true", "yes")
+    # gzip / brotli (if the `brotli` package is installed) above this many bytes; 0 disables
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE") or 1024)
+
+    # GET /health-records/search ranks at most this many of the newest matching
+    # records (a very common term still answers in tens of ms); older matches
+    # follow, newest first with rank 0, so paging still returns all; 0 ranks all
+    SEARCH_RANK_WINDOW: int = int(os.getenv("SEARCH_RANK_WINDOW") or 2000)
+
+    # Per-route request / SQL metrics on GET /metrics (Prometheus text format).
+    # METRICS_TOKEN, if set, must be sent as `Authorization: Bearer <token>`.
+    METRICS_ENABLED: bool = (os.getenv("METRICS_ENABLED") or "true").lower() in ("1", "true", "yes")
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN") or ""
+    # Requests running more SQL statements than this are logged and counted
+    # (N+1 lazy loads); 0 disables
+    METRICS_QUERY_WARN: int = int(os.getenv("METRICS_QUERY_WARN") or 20)
+
+    # Live feed (/live/ws, /live/events): events buffered per client before the
+    # oldest are dropped, and seconds between heartbeats on a quiet stream.
+    # LIVE_PG_NOTIFY relays events between workers over PostgreSQL LISTEN/NOTIFY
+    # (one extra connection per worker); required for a complete feed with several workers.
+    LIVE_QUEUE_SIZE: int = int(os.getenv("LIVE_QUEUE_SIZE") or 256)
+    LIVE_HEARTBEAT: float = float(os.getenv("LIVE_HEARTBEAT") or 15)
+    LIVE_PG_NOTIFY: bool = (os.getenv("LIVE_PG_NOTIFY") or "").lower() in ("1", "true", "yes")
+
 settings = Settings()
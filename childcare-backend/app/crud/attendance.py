@@ -0,0 +1,64 @@
+# app/crud/attendance.py
+from sqlalchemy import false, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.attendance import Attendance
+from app.models.child import Child
+from app.crud.bulk import conflict_insert, execute_chunked
+
+
+def lock_children(db: Session, child_ids) -> set:
+    """
+    Lock the `child_ids` rows (FOR NO KEY UPDATE, in id order) before
+    reading the attendance statuses a SummaryDelta replaces: attendance
+    writes for the same child then run one after another, so a concurrent
+    write can't change (or insert) a row between the read and the write.
+    Doesn't conflict with the key-share locks of the attendance FK checks.
+    Returns which of `child_ids` exist.
+    """
+    ids = sorted({child_id for child_id in child_ids if child_id is not None})
+    if not ids:
+        return set()
+    if db.get_bind().dialect.name == "sqlite":
+        # No row locks (and reads run outside the transaction until the first
+        # write): take the database write lock with a write that matches nothing
+        children = Child.__table__
+        db.connection().execute(update(children).where(false()).values(id=children.c.id))
+    return set(db.scalars(select(Child.id).where(Child.id.in_(ids)).order_by(Child.id).with_for_update(key_share=True)))
+
+
+def is_duplicate_attendance(error: IntegrityError) -> bool:
+    """
+    Whether `error` is the (child_id, date) unique violation, as opposed to
+    another constraint (foreign key, status check).
+    """
+    orig = error.orig
+    # psycopg2 reports the constraint on .diag, asyncpg on the wrapped exception
+    name = getattr(getattr(orig, "diag", None), "constraint_name", None) or getattr(orig.__cause__, "constraint_name", None)
+    if name is not None:
+        return name == "attendance_child_id_date_key"
+    # SQLite names the columns instead
+    return "UNIQUE constraint failed: attendance.child_id, attendance.date" in str(orig)
+
+
+def upsert_attendance(db: Session, rows: list) -> list:
+    """
+    Insert attendance rows, updating check-in/out and status when a record
+    for the same (child_id, date) already exists.
+
+    Uses multi-row `INSERT ... ON CONFLICT (child_id, date) DO UPDATE ...
+    RETURNING id` statements. Does not commit. Returns the ids in the same
+    order as `rows`; `rows` must not contain the same (child_id, date) twice.
+    """
+    table = Attendance.__table__
+    stmt = conflict_insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.child_id, table.c.date],
+        set_={
+            "check_in": stmt.excluded.check_in,
+            "check_out": stmt.excluded.check_out,
+            "status": stmt.excluded.status,
+        },
+    ).returning(table.c.id, sort_by_parameter_order=True)
+
+    return [row.id for row in execute_chunked(db, stmt, rows)]
@@ -0,0 +1,163 @@
+# app/crud/attendance_summary.py
+from collections import defaultdict
+from datetime import date
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import Date, case, cast, delete, func, insert, select
+from sqlalchemy.orm import Session
+from app.models.attendance import Attendance
+from app.models.attendance_summary import AttendanceMonthlySummary, AttendanceDailySummary
+from app.crud.bulk import conflict_insert
+
+# Attendance status -> summary counter column
+STATUS_COLUMNS = {
+    "Present": "present",
+    "Late": "late",
+    "Absent": "absent",
+    "Excused": "excused",
+}
+COUNT_COLUMNS = tuple(STATUS_COLUMNS.values())
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+class SummaryDelta:
+    """
+    Counter changes collected from attendance writes, applied to both
+    summary tables with one upsert each.
+    """
+
+    def __init__(self):
+        self.monthly = defaultdict(lambda: dict.fromkeys(COUNT_COLUMNS, 0))
+        self.daily = defaultdict(lambda: dict.fromkeys(COUNT_COLUMNS, 0))
+
+    def add(self, child_id: int, day: date, status: Optional[str], sign: int = 1) -> None:
+        column = STATUS_COLUMNS.get(status)
+        if column is None or child_id is None or day is None:
+            return
+        self.monthly[(child_id, month_start(day))][column] += sign
+        self.daily[day][column] += sign
+
+    def remove(self, child_id: int, day: date, status: Optional[str]) -> None:
+        self.add(child_id, day, status, -1)
+
+    def apply(self, db: Session) -> None:
+        """
+        Upsert the changes (`count = count + delta`) in the caller's
+        transaction. Does not commit.
+        """
+        monthly = [
+            {"child_id": child_id, "month": month, **counts}
+            for (child_id, month), counts in self.monthly.items()
+            if any(counts.values())
+        ]
+        daily = [
+            {"date": day, **counts}
+            for day, counts in self.daily.items()
+            if any(counts.values())
+        ]
+        if monthly:
+            _add_counts(db, AttendanceMonthlySummary.__table__, ["child_id", "month"], monthly)
+        if daily:
+            _add_counts(db, AttendanceDailySummary.__table__, ["date"], daily)
+
+
+def _add_counts(db: Session, table, key_columns: list, rows: list) -> None:
+    stmt = conflict_insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[name] for name in key_columns],
+        set_={name: table.c[name] + stmt.excluded[name] for name in COUNT_COLUMNS},
+    )
+    db.execute(stmt, rows)
+
+
+def attendance_statuses(db: Session, keys) -> dict:
+    """
+    Current status of existing attendance rows for (child_id, date) `keys`.
+    """
+    keys = list(keys)
+    if not keys:
+        return {}
+    child_ids = {child_id for child_id, _ in keys}
+    days = {day for _, day in keys}
+    query = db.query(Attendance.child_id, Attendance.date, Attendance.status).filter(
+        Attendance.child_id.in_(child_ids), Attendance.date.in_(days)
+    )
+    wanted = set(keys)
+    return {(c, d): s for c, d, s in query if (c, d) in wanted}
+
+
+def remove_child_summaries(db: Session, child_id: int) -> None:
+    """
+    Take a child's attendance out of the summaries before the child (and
+    its attendance) is deleted. Does not commit.
+    """
+    delta = SummaryDelta()
+    query = db.query(Attendance.date, Attendance.status).filter(Attendance.child_id == child_id)
+    for day, status in query:
+        delta.remove(child_id, day, status)
+    delta.monthly.clear()
+    delta.apply(db)
+    monthly = AttendanceMonthlySummary.__table__
+    db.execute(delete(monthly).where(monthly.c.child_id == child_id))
+
+
+def _month_of(db: Session, column):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return cast(func.date_trunc("month", column), Date)
+    if dialect == "sqlite":
+        return func.date(column, "start of month")
+    raise HTTPException(status_code=501, detail=f"Summary rebuild is not supported on {dialect}")
+
+
+def _count_columns():
+    return [
+        func.sum(case((Attendance.status == status, 1), else_=0)).label(column)
+        for status, column in STATUS_COLUMNS.items()
+    ]
+
+
+def rebuild_summaries(db: Session, date_from: Optional[date] = None, date_to: Optional[date] = None) -> dict:
+    """
+    Recompute both summary tables from the attendance table with
+    INSERT ... SELECT ... GROUP BY, limited to the whole months covering
+    `date_from`..`date_to` (everything when omitted). Does not commit.
+    """
+    start = month_start(date_from) if date_from else None
+    end = None
+    if date_to:
+        # Exclusive bound: first day of the month after date_to
+        end = date(date_to.year + date_to.month // 12, date_to.month % 12 + 1, 1)
+
+    monthly = AttendanceMonthlySummary.__table__
+    daily = AttendanceDailySummary.__table__
+
+    def within(stmt, column):
+        if start:
+            stmt = stmt.where(column >= start)
+        if end:
+            stmt = stmt.where(column < end)
+        return stmt
+
+    db.execute(within(delete(monthly), monthly.c.month))
+    db.execute(within(delete(daily), daily.c.date))
+
+    month = _month_of(db, Attendance.date)
+    monthly_rows = within(
+        select(Attendance.child_id, month.label("month"), *_count_columns()).group_by(Attendance.child_id, month),
+        Attendance.date,
+    )
+    daily_rows = within(
+        select(Attendance.date, *_count_columns()).group_by(Attendance.date),
+        Attendance.date,
+    )
+    monthly_count = db.execute(
+        insert(monthly).from_select(["child_id", "month", *COUNT_COLUMNS], monthly_rows)
+    ).rowcount
+    daily_count = db.execute(
+        insert(daily).from_select(["date", *COUNT_COLUMNS], daily_rows)
+    ).rowcount
+    return {"monthly_rows": monthly_count, "daily_rows": daily_count}
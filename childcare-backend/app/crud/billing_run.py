@@ -0,0 +1,137 @@
+# app/crud/billing_run.py
+import calendar
+from datetime import date, timedelta
+from decimal import Decimal
+from fastapi import HTTPException
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+from app.models.attendance import Attendance
+from app.models.billing import Billing
+from app.crud.attendance import lock_children
+from app.crud.bulk import conflict_insert, execute_chunked
+from app.crud.receivables import refresh_receivables
+
+# Attendance statuses that count as a billable day
+BILLABLE_STATUSES = ("Present", "Late")
+
+CENT = Decimal("0.01")
+
+
+def period_bounds(period: str):
+    """
+    "YYYY-MM" -> (first day, last day) of that month.
+    """
+    year, month = (int(part) for part in period.split("-"))
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def attendance_totals(db: Session, start: date, end: date, pickup_cutoff, child_ids=None) -> dict:
+    """
+    Billable days and late pickups per child for the period, aggregated in a
+    single GROUP BY over the period's attendance rows.
+    """
+    attended = case((Attendance.status.in_(BILLABLE_STATUSES), 1), else_=0)
+    if pickup_cutoff is not None:
+        late = case((and_(Attendance.check_out.isnot(None), Attendance.check_out > pickup_cutoff), 1), else_=0)
+    else:
+        late = 0
+    query = (
+        db.query(
+            Attendance.child_id,
+            func.coalesce(func.sum(attended), 0),
+            func.coalesce(func.sum(late), 0),
+        )
+        .filter(Attendance.date >= start, Attendance.date <= end)
+        .group_by(Attendance.child_id)
+    )
+    if child_ids is not None:
+        query = query.filter(Attendance.child_id.in_(child_ids))
+    return {child_id: (int(days), int(lates)) for child_id, days, lates in query}
+
+
+def run_billing(db: Session, period: str, fees, due_in_days: int, child_ids=None, dry_run: bool = False) -> dict:
+    """
+    Compute every child's invoice for `period` from attendance and, unless
+    `dry_run`, insert them as Billing rows with batched multi-row INSERTs in
+    the caller's transaction (not committed here).
+
+    Idempotent per (child, period): children already invoiced for the
+    period are reported as "exists" and never billed twice. Explicit
+    `child_ids` must all exist (404 listing the unknown ones); they stay
+    locked until the caller's commit so none is deleted before its insert.
+    """
+    if child_ids is not None:
+        unknown = sorted(set(child_ids) - lock_children(db, child_ids))
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Children not found: {', '.join(map(str, unknown))}")
+
+    start, end = period_bounds(period)
+    totals = attendance_totals(db, start, end, fees.pickup_cutoff, child_ids)
+    # Explicitly listed children are billed the flat rate even with no attendance
+    for child_id in child_ids or ():
+        totals.setdefault(child_id, (0, 0))
+
+    already_billed = {
+        row.child_id: row.id
+        for row in db.query(Billing.child_id, Billing.id).filter(Billing.billing_period == start)
+    }
+
+    invoices = []
+    for child_id in sorted(totals):
+        days, lates = totals[child_id]
+        amount = (fees.flat_rate + fees.daily_rate * days + fees.late_pickup_fee * lates).quantize(CENT)
+        if child_id in already_billed:
+            status = "exists"
+        elif amount <= 0:
+            status = "no_charge"
+        else:
+            status = "preview"
+        invoices.append({
+            "child_id": child_id,
+            "days_attended": days,
+            "late_pickups": lates,
+            "amount": amount,
+            "billing_id": already_billed.get(child_id),
+            "status": status,
+        })
+
+    to_create = [inv for inv in invoices if inv["status"] == "preview"]
+    if not dry_run and to_create:
+        issued = date.today()
+        due = end + timedelta(days=due_in_days)
+        rows = [
+            {
+                "child_id": inv["child_id"],
+                "amount": inv["amount"],
+                "status": "Unpaid",
+                "issued_date": issued,
+                "due_date": due,
+                "billing_period": start,
+                "notes": f"Billing run {period}: {inv['days_attended']} day(s), {inv['late_pickups']} late pickup(s)",
+            }
+            for inv in to_create
+        ]
+        table = Billing.__table__
+        stmt = conflict_insert(db, table)
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[table.c.child_id, table.c.billing_period],
+        ).returning(table.c.id, table.c.child_id)
+        created_ids = {row.child_id: row.id for row in execute_chunked(db, stmt, rows)}
+        refresh_receivables(db, created_ids)
+        for inv in to_create:
+            if inv["child_id"] in created_ids:
+                inv["billing_id"] = created_ids[inv["child_id"]]
+                inv["status"] = "created"
+            else:
+                # Invoiced concurrently by another run
+                inv["status"] = "exists"
+
+    billed = [inv for inv in invoices if inv["status"] in ("created", "preview")]
+    return {
+        "period": start,
+        "dry_run": dry_run,
+        "created": sum(1 for inv in invoices if inv["status"] == "created"),
+        "skipped_existing": sum(1 for inv in invoices if inv["status"] == "exists"),
+        "total_amount": sum((inv["amount"] for inv in billed), Decimal("0")),
+        "invoices": invoices,
+    }
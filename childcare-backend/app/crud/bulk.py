@@ -0,0 +1,34 @@
+# app/crud/bulk.py
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Rows per INSERT statement; keeps bind parameters well under driver limits
+INSERT_CHUNK_SIZE = 1000
+
+_CONFLICT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def conflict_insert(db: Session, table):
+    """
+    Dialect-specific INSERT supporting ON CONFLICT (PostgreSQL and SQLite).
+    """
+    dialect = db.get_bind().dialect.name
+    insert = _CONFLICT_INSERTS.get(dialect)
+    if insert is None:
+        raise HTTPException(status_code=501, detail=f"Bulk upsert is not supported on {dialect}")
+    return insert(table)
+
+
+def execute_chunked(db: Session, stmt, rows: list, chunk_size: int = INSERT_CHUNK_SIZE) -> list:
+    """
+    Execute `stmt` (with RETURNING) for `rows` in multi-row batches and
+    collect the returned rows.
+    """
+    returned = []
+    for start in range(0, len(rows), chunk_size):
+        returned.extend(db.execute(stmt, rows[start:start + chunk_size]).all())
+    return returned
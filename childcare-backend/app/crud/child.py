@@ -0,0 +1,57 @@
+# app/crud/child.py
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session, selectinload, undefer_group
+from app.models.child import Child
+
+# ?include= names → Child relationship attributes
+CHILD_INCLUDES = {
+    "attendance": Child.attendance_records,
+    "health_records": Child.health_records,
+    "billing": Child.billings,
+}
+
+_SUMMARY_COLUMNS = [col.key for col in Child.__table__.columns] + [
+    "attendance_count",
+    "health_record_count",
+    "billing_count",
+]
+
+
+def parse_includes(include: Optional[str]) -> list:
+    """
+    Parse a comma separated ?include= value into relationship attributes.
+    """
+    if not include:
+        return []
+    names = [name.strip() for name in include.split(",") if name.strip()]
+    unknown = [name for name in names if name not in CHILD_INCLUDES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include: {', '.join(unknown)}. Allowed: {', '.join(CHILD_INCLUDES)}",
+        )
+    return [CHILD_INCLUDES[name] for name in dict.fromkeys(names)]
+
+
+def child_summary_query(db: Session, includes: list):
+    """
+    Children with counts computed in the same SELECT, and each requested
+    relationship loaded by one extra `WHERE child_id IN (...)` query instead
+    of a joined (cartesian) eager load.
+    """
+    query = db.query(Child).options(undefer_group("counts"))
+    for rel in includes:
+        query = query.options(selectinload(rel))
+    return query
+
+
+def child_summary(child: Child, includes: list) -> dict:
+    """
+    Build the ChildSummary payload without touching relationships that were
+    not requested, so no lazy loads fire during serialization.
+    """
+    data = {key: getattr(child, key) for key in _SUMMARY_COLUMNS}
+    for rel in includes:
+        data[rel.key] = getattr(child, rel.key)
+    return data
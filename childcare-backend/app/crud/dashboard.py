@@ -0,0 +1,61 @@
+# app/crud/dashboard.py
+from datetime import date
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models.attendance_summary import AttendanceDailySummary
+from app.models.child import Child
+from app.models.receivable import Receivable
+from app.models.staff import Staff
+from app.cache import make_cache
+from app.crud.schedule import expand_occurrences
+from app.config import settings
+
+# Activities listed on the dashboard for today
+MAX_DASHBOARD_ACTIVITIES = 50
+
+# date -> metrics dict; cleared by writes to children, staff, attendance, billing and activities
+dashboard_cache = make_cache(
+    "dashboard",
+    maxsize=4,
+    ttl=settings.DASHBOARD_CACHE_TTL,
+    url=settings.CACHE_REDIS_URL,
+)
+
+
+def invalidate_dashboard():
+    dashboard_cache.delete(date.today().isoformat())
+
+
+def dashboard_metrics(db: Session, today: date) -> dict:
+    """
+    Headline numbers from a handful of aggregates: counts on children and
+    staff, today's row of the attendance summary, totals over the
+    receivables ledger and today's activities (recurring ones expanded).
+    """
+    counts = db.execute(
+        select(
+            select(func.count(Child.id)).scalar_subquery(),
+            select(func.count(Staff.id)).scalar_subquery(),
+        )
+    ).one()
+    headcount = db.get(AttendanceDailySummary, today)
+    unpaid_total, unpaid_invoices = db.execute(
+        select(func.coalesce(func.sum(Receivable.balance), 0), func.coalesce(func.sum(Receivable.open_invoices), 0))
+    ).one()
+    # Today's one-off activities and occurrences of recurring ones
+    activities = expand_occurrences(db, today, today)
+
+    return {
+        "date": today,
+        "children_enrolled": counts[0],
+        "present_today": headcount.headcount if headcount else 0,
+        "absent_today": headcount.absent if headcount else 0,
+        "staff_total": counts[1],
+        "staff_on_shift": len({a.assigned_staff_id for a in activities if a.assigned_staff_id is not None}),
+        "unpaid_total": unpaid_total,
+        "unpaid_invoices": int(unpaid_invoices),
+        "activities_today": [
+            {"id": a.id, "title": a.title, "start_time": a.start_time, "end_time": a.end_time, "assigned_staff_id": a.assigned_staff_id}
+            for a in activities[:MAX_DASHBOARD_ACTIVITIES]
+        ],
+    }
@@ -0,0 +1,106 @@
+# app/crud/health_search.py
+import re
+from types import SimpleNamespace
+from typing import Optional, Sequence
+from sqlalchemy import Float, Integer, and_, cast, column, func, literal, literal_column, or_, select, table
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.health_record import HealthRecord
+from app.pagination import DEFAULT_PAGE_LIMIT, decode_cursor, encode_cursor
+
+# Must match the generated search_vector column (migration 0003)
+SEARCH_CONFIG = "english"
+
+# Search objects created by migration 0003: tsvector column (PostgreSQL),
+# FTS5 external-content table (SQLite)
+_search_vector = literal_column("health_records.search_vector", TSVECTOR)
+_fts = table("health_records_fts", column("rowid", Integer))
+
+# Cursor keys: tier 0 = ranked window, tier 1 = older matches (rank 0)
+_cursor_keys = [column("tier", Integer), column("rank", Float), column("id", Integer)]
+
+
+def search_terms(q: str) -> list:
+    return re.findall(r"\w+", q.lower())
+
+
+def _match_and_rank(dialect: str, q: str, terms: list):
+    """
+    -> (WHERE clause, relevance expression: higher is better) for `q`
+    """
+    if dialect == "postgresql":
+        # websearch syntax: "quoted phrases", or, -exclusions; never a syntax error
+        query = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), q)
+        # float8: a real-valued rank doesn't survive the cursor round trip exactly
+        return _search_vector.op("@@")(query), cast(func.ts_rank_cd(_search_vector, query), Float)
+    if dialect == "sqlite":
+        # Every term, as FTS5 string literals (user input can't be FTS5 syntax)
+        match = " ".join(f'"{term}"' for term in terms)
+        return (
+            and_(_fts.c.rowid == HealthRecord.id, literal_column("health_records_fts").op("MATCH")(match)),
+            -func.bm25(literal_column("health_records_fts"), type_=Float),
+        )
+    # Unindexed fallback: every term somewhere in the text, unranked
+    text = func.lower(HealthRecord.description + " " + func.coalesce(HealthRecord.doctor_name, ""))
+    return and_(*(text.contains(term, autoescape=True) for term in terms)), literal(0.0, Float)
+
+
+def search_page(db: Session, q: str, filters: Sequence, cursor: Optional[str], limit: Optional[int]) -> dict:
+    """
+    One page of health records matching `q` (and `filters`): the newest
+    SEARCH_RANK_WINDOW matches most relevant first, then every older match,
+    newest first and unranked (rank 0). Each record gets a `rank`
+    attribute; cursors are (tier, rank, id).
+    """
+    limit = limit or DEFAULT_PAGE_LIMIT
+    terms = search_terms(q)
+    if not terms:
+        return {"items": [], "next_cursor": None}
+
+    dialect = db.get_bind().dialect.name
+    match, rank = _match_and_rank(dialect, q, terms)
+    # SQLite: order by the FTS rowid, which the FTS index returns in order
+    record_id = _fts.c.rowid if dialect == "sqlite" else HealthRecord.id
+    last_tier, last_rank, last_id = decode_cursor(cursor, _cursor_keys) if cursor else (0, None, None)
+
+    boundary = None
+    if settings.SEARCH_RANK_WINDOW > 0:
+        # Rank only the newest SEARCH_RANK_WINDOW matches: ranking reads every
+        # candidate's text, matching alone is an index lookup
+        window = select(record_id.label("id")).where(match, *filters).order_by(record_id.desc())
+        window = window.limit(settings.SEARCH_RANK_WINDOW).subquery("window")
+        boundary = db.execute(select(func.min(window.c.id))).scalar()
+        if boundary is None:
+            return {"items": [], "next_cursor": None}
+
+    rows = []
+    if last_tier == 0:
+        ranked = select(record_id.label("id"), rank.label("rank")).where(match, *filters)
+        if boundary is not None:
+            ranked = ranked.where(record_id >= boundary)
+        ranked = ranked.subquery("ranked")
+        stmt = select(HealthRecord, ranked.c.rank).join(ranked, ranked.c.id == HealthRecord.id)
+        if cursor:
+            stmt = stmt.where(or_(ranked.c.rank < last_rank, and_(ranked.c.rank == last_rank, ranked.c.id < last_id)))
+        stmt = stmt.order_by(ranked.c.rank.desc(), ranked.c.id.desc()).limit(limit + 1)
+        rows = [(0, row.rank, row.HealthRecord) for row in db.execute(stmt)]
+    if len(rows) <= limit and boundary is not None:
+        # Then the older matches, newest first, in index order (no ranking, no sort)
+        older = select(record_id.label("id")).where(match, *filters, record_id < boundary)
+        if last_tier == 1:
+            older = older.where(record_id < last_id)
+        older = older.order_by(record_id.desc()).limit(limit + 1 - len(rows)).subquery("older")
+        stmt = select(HealthRecord).join(older, older.c.id == HealthRecord.id).order_by(HealthRecord.id.desc())
+        rows += [(1, 0.0, record) for record in db.scalars(stmt)]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        tier, rank, record = rows[-1]
+        next_cursor = encode_cursor(SimpleNamespace(tier=tier, rank=rank, id=record.id), _cursor_keys)
+    items = []
+    for _, rank, record in rows:
+        record.rank = rank
+        items.append(record)
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,295 @@
+# app/crud/importer.py
+import csv
+import io
+from datetime import datetime
+from itertools import islice
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.attendance import Attendance
+from app.models.child import Child
+from app.models.staff import Staff
+from app.models.user import User
+from app.schemas.attendance_schema import AttendanceCreate
+from app.schemas.child_schema import ChildCreate
+from app.schemas.staff_schema import StaffCreate
+from app.crud.bulk import conflict_insert, execute_chunked
+from app.crud.attendance_summary import rebuild_summaries
+from app.versions import mark_changed
+
+# Rows validated and loaded (and committed) per batch
+IMPORT_CHUNK_SIZE = 10000
+MAX_REPORTED_ERRORS = 1000
+
+IMPORT_KINDS = ("children", "staff", "attendance")
+
+
+# --- Reading -----------------------------------------------------------------
+
+def read_rows(fileobj, filename: str):
+    """
+    Stream rows as dicts from a CSV or XLSX file object (header row first).
+    """
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        return _read_xlsx(fileobj)
+    return _read_csv(fileobj)
+
+
+def _read_csv(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        text.detach()
+
+
+def _read_xlsx(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise HTTPException(status_code=400, detail="XLSX import requires the 'openpyxl' package; upload CSV instead")
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, [])]
+        for values in rows:
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def _clean(raw: dict) -> dict:
+    """
+    Drop blank cells so schema defaults apply; Excel dates arrive as midnight datetimes.
+    """
+    row = {}
+    for key, value in raw.items():
+        if key is None:
+            continue
+        key = key.strip().lower()
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ("", None):
+            continue
+        if isinstance(value, datetime) and value.time() == datetime.min.time():
+            value = value.date()
+        row[key] = value
+    return row
+
+
+def _format_error(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors())
+
+
+# --- Loading -----------------------------------------------------------------
+
+def _use_copy(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def _copy_rows(db: Session, table, columns: list, rows: list, conflict_columns=None) -> int:
+    """
+    Load rows with PostgreSQL COPY. With `conflict_columns`, rows go through a
+    temporary staging table and INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([row.get(col) for col in columns])
+    buf.seek(0)
+
+    col_list = ", ".join(columns)
+    mark_changed(db, table.name)
+    cursor = db.connection().connection.dbapi_connection.cursor()
+    try:
+        if conflict_columns is None:
+            cursor.copy_expert(f"COPY {table.name} ({col_list}) FROM STDIN WITH (FORMAT csv)", buf)
+            return len(rows)
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS _import_{table.name} "
+            f"(LIKE {table.name} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        cursor.copy_expert(f"COPY _import_{table.name} ({col_list}) FROM STDIN WITH (FORMAT csv)", buf)
+        cursor.execute(
+            f"INSERT INTO {table.name} ({col_list}) SELECT {col_list} FROM _import_{table.name} "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING"
+        )
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def _insert_rows(db: Session, table, columns: list, rows: list, conflict_columns=None) -> int:
+    """
+    Load rows with COPY on PostgreSQL/psycopg2, else batched multi-row INSERTs.
+    Returns how many rows were actually inserted.
+    """
+    if not rows:
+        return 0
+    if _use_copy(db):
+        return _copy_rows(db, table, columns, rows, conflict_columns)
+    stmt = conflict_insert(db, table)
+    if conflict_columns is not None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+    stmt = stmt.returning(table.c.id)
+    return len(execute_chunked(db, stmt, [{col: row.get(col) for col in columns} for row in rows]))
+
+
+# --- Per-kind row preparation --------------------------------------------------
+
+class _ChildRows:
+    schema = ChildCreate
+    table = Child.__table__
+    columns = list(ChildCreate.model_fields)
+    conflict_columns = None
+
+    def __init__(self, db: Session):
+        pass
+
+    def resolve(self, row: dict) -> dict:
+        return row
+
+
+class _StaffRows:
+    schema = StaffCreate
+    table = Staff.__table__
+    columns = list(StaffCreate.model_fields)
+    conflict_columns = None
+
+    def __init__(self, db: Session):
+        self.user_ids = {email.lower(): user_id for user_id, email in db.execute(select(User.id, User.email))}
+        self.known_users = set(self.user_ids.values())
+        self.staffed = {user_id for (user_id,) in db.execute(select(Staff.user_id))}
+
+    def resolve(self, row: dict) -> dict:
+        if "user_id" not in row and "user_email" in row:
+            user_id = self.user_ids.get(str(row.pop("user_email")).lower())
+            if user_id is None:
+                raise ValueError("user_email: no user with this email")
+            row["user_id"] = user_id
+        return row
+
+    def check(self, item) -> None:
+        if item.user_id not in self.known_users:
+            raise ValueError("user_id: user not found")
+        if item.user_id in self.staffed:
+            raise ValueError("user_id: staff profile already exists")
+        self.staffed.add(item.user_id)
+
+
+class _AttendanceRows:
+    schema = AttendanceCreate
+    table = Attendance.__table__
+    columns = list(AttendanceCreate.model_fields)
+    conflict_columns = ["child_id", "date"]
+
+    def __init__(self, db: Session):
+        self.first_day = self.last_day = None
+        self.child_ids = set()
+        self.by_name = {}
+        for child_id, name in db.execute(select(Child.id, Child.name)):
+            self.child_ids.add(child_id)
+            key = name.strip().lower()
+            # None marks a name shared by several children
+            self.by_name[key] = None if key in self.by_name else child_id
+
+    def resolve(self, row: dict) -> dict:
+        if "child_id" not in row and "child_name" in row:
+            key = str(row.pop("child_name")).lower()
+            if key not in self.by_name:
+                raise ValueError("child_name: no child with this name")
+            if self.by_name[key] is None:
+                raise ValueError("child_name: several children share this name; use child_id")
+            row["child_id"] = self.by_name[key]
+        return row
+
+    def check(self, item) -> None:
+        if item.child_id not in self.child_ids:
+            raise ValueError("child_id: child not found")
+
+    def loaded(self, rows: list) -> None:
+        days = [row["date"] for row in rows]
+        self.first_day = min(days + [self.first_day or days[0]])
+        self.last_day = max(days + [self.last_day or days[0]])
+
+    def finish(self, db: Session) -> None:
+        # COPY / ON CONFLICT DO NOTHING don't say which rows landed, so
+        # recount the summaries for the months the file touched
+        if self.first_day:
+            rebuild_summaries(db, self.first_day, self.last_day)
+            db.commit()
+
+
+_KINDS = {
+    "children": _ChildRows,
+    "staff": _StaffRows,
+    "attendance": _AttendanceRows,
+}
+
+
+def run_import(db: Session, kind: str, rows, dry_run: bool = False) -> dict:
+    """
+    Validate rows with the regular Create schemas in chunks, resolve foreign
+    keys from in-memory maps (emails, child names) and bulk load the valid
+    ones, committing per chunk. Invalid rows are reported, not loaded.
+    Attendance rows for an existing (child_id, date) are skipped and the
+    attendance summaries are rebuilt for the imported months.
+    """
+    if kind not in _KINDS:
+        raise HTTPException(status_code=400, detail=f"Unknown import kind: {kind}. Allowed: {', '.join(IMPORT_KINDS)}")
+    spec = _KINDS[kind](db)
+    check = getattr(spec, "check", None)
+
+    report = {
+        "kind": kind,
+        "dry_run": dry_run,
+        "rows_read": 0,
+        "rows_valid": 0,
+        "inserted": 0,
+        "skipped_duplicates": 0,
+        "errors_total": 0,
+        "errors": [],
+    }
+
+    def fail(row_number, message):
+        report["errors_total"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": row_number, "error": message})
+
+    row_number = 1  # header
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, IMPORT_CHUNK_SIZE))
+        if not chunk:
+            break
+        valid = []
+        for raw in chunk:
+            row_number += 1
+            report["rows_read"] += 1
+            try:
+                item = spec.schema.model_validate(spec.resolve(_clean(raw)))
+                if check:
+                    check(item)
+            except ValidationError as e:
+                fail(row_number, _format_error(e))
+                continue
+            except ValueError as e:
+                fail(row_number, str(e))
+                continue
+            valid.append(item.model_dump())
+
+        report["rows_valid"] += len(valid)
+        if dry_run or not valid:
+            continue
+        inserted = _insert_rows(db, spec.table, spec.columns, valid, spec.conflict_columns)
+        db.commit()
+        report["inserted"] += inserted
+        report["skipped_duplicates"] += len(valid) - inserted
+        if inserted and hasattr(spec, "loaded"):
+            spec.loaded(valid)
+
+    if hasattr(spec, "finish"):
+        spec.finish(db)
+    return report
@@ -0,0 +1,132 @@
+# app/crud/receivables.py
+from datetime import date, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import and_, case, delete, func, literal, or_, select, update
+from sqlalchemy.orm import Session
+from app.crud.bulk import conflict_insert
+from app.models.billing import Billing
+from app.models.child import Child
+from app.models.receivable import Receivable
+
+# Billing statuses that still count towards a child's balance
+OPEN_STATUSES = ("Unpaid", "Pending", "Overdue")
+
+# Lower bound (days past due, exclusive) -> ledger column
+AGING_BUCKETS = {
+    0: "aged_0_30",
+    30: "aged_31_60",
+    60: "aged_61_90",
+    90: "aged_90_plus",
+}
+
+LEDGER_COLUMNS = [
+    "child_id", "balance", "open_invoices",
+    "aged_0_30", "aged_31_60", "aged_61_90", "aged_90_plus",
+    "oldest_due_date", "as_of",
+]
+
+
+def _ledger_select(as_of: date):
+    """
+    SELECT producing one ledger row per child with open invoices. Buckets
+    compare due_date against cutoff dates, so no dialect date arithmetic.
+    """
+    due = Billing.due_date
+    d30, d60, d90 = (as_of - timedelta(days=n) for n in (30, 60, 90))
+
+    def bucket(condition):
+        return func.coalesce(func.sum(case((condition, Billing.amount), else_=0)), 0)
+
+    return (
+        select(
+            Billing.child_id,
+            func.sum(Billing.amount),
+            func.count(Billing.id),
+            bucket(or_(due.is_(None), due >= d30)),
+            bucket(and_(due < d30, due >= d60)),
+            bucket(and_(due < d60, due >= d90)),
+            bucket(due < d90),
+            func.min(due),
+            literal(as_of, Receivable.as_of.type),
+        )
+        .where(Billing.status.in_(OPEN_STATUSES))
+        .group_by(Billing.child_id)
+    )
+
+
+def _upsert_ledger(db: Session, rows) -> int:
+    # Ledger rows from a _ledger_select, updated in place when the child already has one
+    ledger = Receivable.__table__
+    stmt = conflict_insert(db, ledger).from_select(LEDGER_COLUMNS, rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ledger.c.child_id],
+        set_={name: stmt.excluded[name] for name in LEDGER_COLUMNS if name != "child_id"},
+    )
+    return db.execute(stmt).rowcount
+
+
+def refresh_receivables(db: Session, child_ids: Iterable[int], as_of: Optional[date] = None) -> None:
+    """
+    Recompute the ledger rows of `child_ids` from their billing rows (an
+    index lookup per child). Called after every billing write; does not commit.
+
+    Safe under concurrent billing writes: the children rows are locked first
+    (FOR NO KEY UPDATE, which doesn't conflict with the billing FK checks),
+    so a second refresh of the same child waits and then sees both writes;
+    rows are upserted, never deleted and re-inserted.
+    """
+    ids = sorted({child_id for child_id in child_ids if child_id is not None})
+    if not ids:
+        return
+    db.execute(select(Child.id).where(Child.id.in_(ids)).order_by(Child.id).with_for_update(key_share=True))
+
+    _upsert_ledger(db, _ledger_select(as_of or date.today()).where(Billing.child_id.in_(ids)))
+
+    # Children no longer owing anything drop out of the ledger
+    ledger = Receivable.__table__
+    owing = select(Billing.child_id).where(Billing.child_id.in_(ids), Billing.status.in_(OPEN_STATUSES))
+    db.execute(delete(ledger).where(ledger.c.child_id.in_(ids), ledger.c.child_id.not_in(owing)))
+
+
+def rebuild_receivables(db: Session, as_of: Optional[date] = None) -> int:
+    """
+    Re-age the whole ledger: refresh_receivables for every child, as one
+    upsert from INSERT ... SELECT ... GROUP BY. Does not commit. Returns the
+    number of children owing money.
+
+    Takes the same children locks (all of them, in id order), so a billing
+    write's refresh either commits first or waits and re-ages on top; the
+    ledger is never empty in between.
+    """
+    db.execute(select(Child.id).order_by(Child.id).with_for_update(key_share=True))
+
+    owing_children = _upsert_ledger(db, _ledger_select(as_of or date.today()))
+
+    ledger = Receivable.__table__
+    owing = select(Billing.child_id).where(Billing.status.in_(OPEN_STATUSES))
+    db.execute(delete(ledger).where(ledger.c.child_id.not_in(owing)))
+    return owing_children
+
+
+def mark_overdue(db: Session, as_of: Optional[date] = None) -> int:
+    """
+    Set-based `Unpaid` -> `Overdue` for invoices past due_date (uses the
+    (status, due_date) index). Does not commit. Returns rows changed.
+    """
+    stmt = (
+        update(Billing)
+        .where(Billing.status == "Unpaid", Billing.due_date < (as_of or date.today()))
+        .values(status="Overdue")
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).rowcount
+
+
+def age_receivables(db: Session, as_of: Optional[date] = None) -> dict:
+    """
+    The daily job: flag overdue invoices, then re-age every ledger row.
+    """
+    as_of = as_of or date.today()
+    marked = mark_overdue(db, as_of)
+    children = rebuild_receivables(db, as_of)
+    return {"as_of": as_of, "marked_overdue": marked, "children_owing": children}
@@ -0,0 +1,325 @@
+# app/crud/schedule.py
+import heapq
+from datetime import date, timedelta
+from itertools import groupby
+from typing import Iterable, Optional
+from fastapi import HTTPException
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from app.cache import make_cache
+from app.config import settings
+from app.models.activity import Activity
+from app.models.activity_exception import ActivityException
+from app.models.staff import Staff
+from app.recurrence import FAR_FUTURE, RecurrenceRule, parse_rule
+from app.versions import table_versions
+
+# Widest range GET /activities/calendar and /activities/conflicts accept
+MAX_CALENDAR_DAYS = 366
+
+# Override columns of an activity exception
+EXCEPTION_FIELDS = ("title", "description", "start_time", "end_time", "assigned_staff_id")
+
+# Expanded calendar windows (JSON-ready), keyed by window and the activity
+# table versions, so any write makes the old entries unreachable
+calendar_cache = make_cache(
+    "calendar",
+    maxsize=64,
+    ttl=settings.CALENDAR_CACHE_TTL,
+    url=settings.CACHE_REDIS_URL,
+)
+
+
+class Occurrence:
+    """
+    One dated entry of a calendar: a one-off activity, or a day of a
+    recurring one with that day's exception applied.
+    """
+
+    __slots__ = (
+        "id", "title", "description", "scheduled_date", "start_time", "end_time", "assigned_staff_id",
+        "recurrence_rule", "recurrence_until", "created_at", "is_exception",
+    )
+
+    def __init__(self, activity, day: date, exception: Optional[ActivityException] = None):
+        self.id = activity.id or 0  # 0: an activity not saved yet
+        self.scheduled_date = day
+        self.recurrence_rule = activity.recurrence_rule
+        self.recurrence_until = activity.recurrence_until
+        self.created_at = activity.created_at
+        self.is_exception = exception is not None
+        for field in EXCEPTION_FIELDS:
+            override = getattr(exception, field) if exception is not None else None
+            setattr(self, field, override if override is not None else getattr(activity, field))
+
+
+def _timed(activity) -> bool:
+    # Only activities with a staff member, a day and both times can clash
+    return None not in (activity.assigned_staff_id, activity.scheduled_date, activity.start_time, activity.end_time)
+
+
+def find_overlaps(activities: Iterable) -> list:
+    """
+    Every pair of activities that books the same staff member on the same
+    day in overlapping time windows (back-to-back is fine). A sweep line:
+    sort by (staff, day, start), keep the windows still open in a min-heap
+    on end time, and each new start clashes with whatever is still open.
+    O(n log n + pairs).
+    """
+    timed = sorted(
+        (a for a in activities if _timed(a)),
+        key=lambda a: (a.assigned_staff_id, a.scheduled_date, a.start_time, a.id),
+    )
+    overlaps = []
+    for (staff_id, day), group in groupby(timed, key=lambda a: (a.assigned_staff_id, a.scheduled_date)):
+        open_ = []  # (end_time, id, activity)
+        for activity in group:
+            while open_ and open_[0][0] <= activity.start_time:
+                heapq.heappop(open_)
+            for end, _, other in sorted(open_, key=lambda item: item[1]):
+                overlaps.append({
+                    "staff_id": staff_id,
+                    "scheduled_date": day,
+                    "activity_ids": [other.id, activity.id],
+                    "overlap_start": activity.start_time,
+                    "overlap_end": min(end, activity.end_time),
+                })
+            heapq.heappush(open_, (activity.end_time, activity.id, activity))
+    return overlaps
+
+
+def calendar_query(db: Session, date_from: date, date_to: date, staff_id: Optional[int] = None):
+    """
+    One-off activities scheduled in [date_from, date_to], by day and start
+    time. Served by the (scheduled_date, id) index, or with `staff_id` by
+    (assigned_staff_id, scheduled_date).
+    """
+    query = db.query(Activity).filter(
+        Activity.scheduled_date >= date_from,
+        Activity.scheduled_date <= date_to,
+        Activity.recurrence_rule.is_(None),
+    )
+    if staff_id is not None:
+        query = query.filter(Activity.assigned_staff_id == staff_id)
+    return query.order_by(Activity.scheduled_date, Activity.start_time, Activity.id)
+
+
+def expand_occurrences(db: Session, date_from: date, date_to: date, staff_id: Optional[int] = None,
+                       exclude_id: Optional[int] = None) -> list:
+    """
+    Every occurrence in [date_from, date_to]: the one-off activities plus
+    the recurring series running in the window, expanded for the window
+    only. Cancelled occurrences are left out and exceptions applied, so a
+    `staff_id` filter also sees cover assigned for a single day.
+
+    `exclude_id` leaves out an activity being edited: the identity map would
+    return its unsaved in-memory state (say, a rule just cleared) for the
+    row the query matched on its saved state.
+    """
+    one_offs = calendar_query(db, date_from, date_to, staff_id)
+    series = db.query(Activity).filter(
+        Activity.recurrence_rule.isnot(None),
+        Activity.scheduled_date <= date_to,
+        or_(Activity.recurrence_until.is_(None), Activity.recurrence_until >= date_from),
+    )
+    if exclude_id is not None:
+        one_offs = one_offs.filter(Activity.id != exclude_id)
+        series = series.filter(Activity.id != exclude_id)
+    occurrences = [Occurrence(a, a.scheduled_date) for a in one_offs]
+    series = series.all()
+    if series:
+        exceptions = {
+            (e.activity_id, e.occurrence_date): e
+            for e in db.query(ActivityException).filter(
+                ActivityException.activity_id.in_([s.id for s in series]),
+                ActivityException.occurrence_date >= date_from,
+                ActivityException.occurrence_date <= date_to,
+            )
+        }
+        for activity in series:
+            for day in parse_rule(activity.recurrence_rule).occurrences(activity.scheduled_date, date_from, date_to):
+                exception = exceptions.get((activity.id, day))
+                if exception is not None and exception.cancelled:
+                    continue
+                occurrence = Occurrence(activity, day, exception)
+                if staff_id is None or occurrence.assigned_staff_id == staff_id:
+                    occurrences.append(occurrence)
+
+    occurrences.sort(key=lambda o: (o.scheduled_date, o.start_time is None, o.start_time or 0, o.id))
+    return occurrences
+
+
+def cached_calendar(db: Session, date_from: date, date_to: date, staff_id: Optional[int], serialize) -> list:
+    """
+    expand_occurrences through calendar_cache; `serialize` turns the
+    occurrences into the JSON-ready list that is cached and returned.
+    """
+    versions, _ = table_versions.get(db, ("activities", "activity_exceptions"))
+    key = f"{date_from}:{date_to}:{staff_id or ''}:{'.'.join(map(str, versions))}"
+    items = calendar_cache.get(key)
+    if items is None:
+        items = serialize(expand_occurrences(db, date_from, date_to, staff_id))
+        calendar_cache.set(key, items)
+    return items
+
+
+def apply_recurrence(activity: Activity):
+    """
+    Normalize the recurrence rule of a new or edited activity (COUNT becomes
+    UNTIL) and derive recurrence_until; 400 for a rule we can't expand.
+    """
+    if not activity.recurrence_rule:
+        activity.recurrence_rule = None
+        activity.recurrence_until = None
+        return
+    if activity.scheduled_date is None:
+        raise HTTPException(status_code=400, detail="A recurring activity needs a scheduled_date (its first day)")
+    try:
+        rule = RecurrenceRule.parse(activity.recurrence_rule).resolved(activity.scheduled_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid recurrence_rule: {e}")
+    activity.recurrence_rule = str(rule)
+    activity.recurrence_until = rule.until
+
+
+def _check_clashes(db: Session, candidates: list, activity_id: int):
+    """
+    409 if any of `candidates` (occurrences of activity `activity_id`, 0 if
+    new) overlaps another activity of the same staff member.
+    """
+    candidates = [o for o in candidates if _timed(o)]
+    if not candidates:
+        return
+    clashes = []
+    for staff_id in sorted({o.assigned_staff_id for o in candidates}):
+        # Lock the staff row (PostgreSQL) so two concurrent writes for the same person can't both pass
+        db.execute(select(Staff.id).where(Staff.id == staff_id).with_for_update())
+        mine = [o for o in candidates if o.assigned_staff_id == staff_id]
+        others = expand_occurrences(db, mine[0].scheduled_date, mine[-1].scheduled_date, staff_id, exclude_id=activity_id)
+        for overlap in find_overlaps(others + mine):
+            if activity_id in overlap["activity_ids"]:
+                other = next(i for i in overlap["activity_ids"] if i != activity_id)
+                clashes.append((overlap["scheduled_date"], other))
+    if clashes:
+        listed = ", ".join(f"activity {other} on {day}" for day, other in sorted(set(clashes))[:5])
+        more = f" and {len(set(clashes)) - 5} more" if len(set(clashes)) > 5 else ""
+        raise HTTPException(status_code=409, detail=f"Staff member is already booked at that time ({listed}{more})")
+
+
+def _check_times(start_time, end_time):
+    if start_time is not None and end_time is not None and end_time <= start_time:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+
+
+def validate_booking(db: Session, activity: Activity):
+    """
+    Reject a new or edited activity whose times are reversed or that
+    double-books its staff member. A recurring activity is checked over its
+    occurrences from today (or its start) for up to MAX_CALENDAR_DAYS.
+    """
+    _check_times(activity.start_time, activity.end_time)
+    if not _timed(activity):
+        return
+    if activity.recurrence_rule is None:
+        candidates = [Occurrence(activity, activity.scheduled_date)]
+    else:
+        first = max(activity.scheduled_date, date.today())
+        days = parse_rule(activity.recurrence_rule).occurrences(
+            activity.scheduled_date, first, first + timedelta(days=MAX_CALENDAR_DAYS - 1)
+        )
+        exceptions = {}
+        if activity.id is not None:
+            exceptions = {
+                e.occurrence_date: e
+                for e in db.query(ActivityException).filter(
+                    ActivityException.activity_id == activity.id, ActivityException.occurrence_date >= first
+                )
+            }
+        candidates = [
+            Occurrence(activity, day, exceptions.get(day))
+            for day in days
+            if day not in exceptions or not exceptions[day].cancelled
+        ]
+    _check_clashes(db, candidates, activity.id or 0)
+
+
+def occurrence_exception(db: Session, activity: Activity, day: date) -> Optional[ActivityException]:
+    """
+    The exception stored for `day` of a recurring activity, if any; 404 if
+    `day` is not one of its occurrences.
+    """
+    if activity.recurrence_rule is None:
+        raise HTTPException(status_code=400, detail="Activity is not recurring")
+    if not parse_rule(activity.recurrence_rule).occurs_on(activity.scheduled_date, day):
+        raise HTTPException(status_code=404, detail="Activity does not occur on that date")
+    return (
+        db.query(ActivityException)
+        .filter(ActivityException.activity_id == activity.id, ActivityException.occurrence_date == day)
+        .first()
+    )
+
+
+def save_exception(db: Session, activity: Activity, day: date, changes: dict, cancelled: bool) -> Optional[ActivityException]:
+    """
+    Change or cancel one occurrence of a recurring activity. Overrides equal
+    to the series' values are not stored; an occurrence left with nothing to
+    override goes back to following the series (its exception is deleted).
+    """
+    exception = occurrence_exception(db, activity, day)
+    if exception is None:
+        exception = ActivityException(activity_id=activity.id, occurrence_date=day, cancelled=False)
+    for field, value in changes.items():
+        setattr(exception, field, None if value == getattr(activity, field) else value)
+    exception.cancelled = cancelled
+
+    if not cancelled:
+        occurrence = Occurrence(activity, day, exception)
+        _check_times(occurrence.start_time, occurrence.end_time)
+        _check_clashes(db, [occurrence], activity.id)
+
+    if not cancelled and all(getattr(exception, field) is None for field in EXCEPTION_FIELDS):
+        if exception.id is not None:
+            db.delete(exception)
+        return None
+    if exception.id is None:
+        db.add(exception)
+    return exception
+
+
+def split_series(db: Session, activity: Activity, day: date, changes: dict) -> Activity:
+    """
+    Apply `changes` to a recurring activity from `day` on ("move nap time to
+    13:30 from now on"): the series ends the day before and a copy with the
+    changes takes over from the first occurrence on or after `day`, with the
+    exceptions from then on. Constant work however long the series runs.
+    Returns the series that now holds the occurrences from `day`.
+    """
+    rule = parse_rule(activity.recurrence_rule)
+    first = next(rule.occurrences(activity.scheduled_date, day, activity.recurrence_until or FAR_FUTURE), None)
+    if first is None:
+        raise HTTPException(status_code=400, detail=f"Activity has no occurrences from {day}")
+    if first == activity.scheduled_date:
+        # Nothing before `day`: change the whole series
+        for field, value in changes.items():
+            setattr(activity, field, value)
+        apply_recurrence(activity)
+        validate_booking(db, activity)
+        return activity
+
+    columns = ("title", "description", "start_time", "end_time", "assigned_staff_id", "recurrence_rule")
+    successor = Activity(**{column: getattr(activity, column) for column in columns}, scheduled_date=first)
+    for field, value in changes.items():
+        setattr(successor, field, value)
+    apply_recurrence(successor)
+
+    ended = parse_rule(activity.recurrence_rule)
+    ended = RecurrenceRule(ended.freq, ended.interval, ended.byday, ended.bymonthday, until=first - timedelta(days=1))
+    activity.recurrence_rule = str(ended)
+    activity.recurrence_until = ended.until
+    db.add(successor)
+    db.flush()
+    db.query(ActivityException).filter(
+        ActivityException.activity_id == activity.id, ActivityException.occurrence_date >= first
+    ).update({ActivityException.activity_id: successor.id}, synchronize_session=False)
+    validate_booking(db, successor)
+    return successor
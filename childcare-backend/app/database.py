@@ -1,10 +1,21 @@
 # app/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import functools
+from contextlib import contextmanager
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.util import await_only, greenlet_spawn
+from app.cache import make_cache
 from app.config import settings
+from app.db_pool import engine_options, sync_pool_stats, async_pool_stats, replica_pool_stats, async_replica_pool_stats
+from app.utils import decode_token
 
-# Create SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL, future=True)
+ASYNC_DB = settings.DB_MODE == "async"
+
+# Create SQLAlchemy engine (pool settings and stats: app/db_pool.py)
+engine = create_engine(settings.DATABASE_URL, future=True, **engine_options(settings.DATABASE_URL))
+sync_pool_stats.attach(engine.pool)
 
 # Session maker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -12,10 +23,176 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base class for models
 Base = declarative_base()
 
-# Dependency for FastAPI routes
-def get_db():
-    db = SessionLocal()
+
+def _async_url(url: str) -> str:
+    if url.startswith("postgresql://") or url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url.split("://", 1)[1]
+    return url
+
+
+# Async engine (asyncpg), only created when DB_MODE=async
+async_engine = None
+AsyncSessionLocal = None
+if ASYNC_DB:
+    _async_database_url = settings.ASYNC_DATABASE_URL or _async_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(_async_database_url, **engine_options(_async_database_url, is_async=True))
+    async_pool_stats.attach(async_engine.sync_engine.pool)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=True)
+
+
+# Read replica (DATABASE_REPLICA_URL) for safe GET traffic; see get_db
+replica_engine = None
+ReplicaSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(settings.DATABASE_REPLICA_URL, future=True, **engine_options(settings.DATABASE_REPLICA_URL))
+    replica_pool_stats.attach(replica_engine.pool)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine, info={"replica": True})
+    if ASYNC_DB:
+        _async_replica_url = settings.ASYNC_DATABASE_REPLICA_URL or _async_url(settings.DATABASE_REPLICA_URL)
+        async_replica_engine = create_async_engine(_async_replica_url, **engine_options(_async_replica_url, is_async=True))
+        async_replica_pool_stats.attach(async_replica_engine.sync_engine.pool)
+        AsyncReplicaSessionLocal = async_sessionmaker(
+            async_replica_engine, autoflush=False, expire_on_commit=True, info={"replica": True}
+        )
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# user id -> True for REPLICA_READ_YOUR_WRITES_SECONDS after the user's last
+# commit; shared across workers with CACHE_REDIS_URL
+recent_writers = make_cache(
+    "recent-writers",
+    maxsize=4096,
+    ttl=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+    url=settings.CACHE_REDIS_URL,
+)
+
+
+def mark_recent_writer(user_id):
+    """
+    Send `user_id`'s reads to the primary for the read-your-writes window.
+    """
+    if user_id is not None and replica_engine is not None:
+        recent_writers.set(int(user_id), True)
+
+
+def _request_user_id(request: Request):
+    authorization = request.headers.get("authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return None
+    payload = decode_token(authorization[7:]) or {}
+    try:
+        return int(payload.get("sub"))
+    except (TypeError, ValueError):
+        return None
+
+
+def reads_from_replica(request: Request, user_id=None) -> bool:
+    """
+    True when a replica is configured, the request is a GET/HEAD and its user
+    hasn't committed a write within the read-your-writes window.
+    """
+    if replica_engine is None or request.method not in SAFE_METHODS:
+        return False
+    if user_id is None:
+        user_id = _request_user_id(request)
+    return user_id is None or recent_writers.get(user_id) is None
+
+
+def read_engine(request: Request, user_id=None):
+    """
+    Sync engine for reads outside the request's session (streamed exports).
+    """
+    return replica_engine if reads_from_replica(request, user_id) else engine
+
+
+@contextmanager
+def primary_session():
+    """
+    A short-lived session on the primary, e.g. to re-check a row that a
+    replica session didn't find yet (replication lag). Must be used from the
+    handler's greenlet in DB_MODE=async.
+    """
+    if ASYNC_DB:
+        session = AsyncSessionLocal()
+        try:
+            yield session.sync_session
+        finally:
+            await_only(session.close())
+    else:
+        with SessionLocal() as session:
+            yield session
+
+
+# Writes through a replica session are bugs (a GET handler that writes)
+@event.listens_for(Session, "before_flush")
+def _refuse_replica_flush(session, flush_context, instances):
+    if session.info.get("replica") and (session.new or session.dirty or session.deleted):
+        raise RuntimeError("Attempted to write through a read-replica session; use the primary")
+
+
+# Start the read-your-writes window when a request's session commits changes.
+# insert=True: runs before app.versions consumes `changed_tables`.
+@event.listens_for(Session, "after_commit", insert=True)
+def _mark_writer(session):
+    if session.info.get("changed_tables") and not session.info.get("replica"):
+        mark_recent_writer(session.info.get("user_id"))
+
+
+# Dependency for FastAPI routes: GET/HEAD go to the replica when one is
+# configured (see reads_from_replica), everything else to the primary
+def get_sync_db(request: Request):
+    user_id = _request_user_id(request) if replica_engine is not None else None
+    if reads_from_replica(request, user_id):
+        db = ReplicaSessionLocal()
+    else:
+        db = SessionLocal()
+        db.info["user_id"] = user_id
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request):
+    """
+    Yield the Session behind an AsyncSession. Its I/O goes through the async
+    driver, so it must only be used from code wrapped by run_in_greenlet.
+    """
+    user_id = _request_user_id(request) if replica_engine is not None else None
+    if reads_from_replica(request, user_id):
+        async with AsyncReplicaSessionLocal() as session:
+            yield session.sync_session
+        return
+    async with AsyncSessionLocal() as session:
+        session.sync_session.info["user_id"] = user_id
+        yield session.sync_session
+
+
+get_db = get_async_db if ASYNC_DB else get_sync_db
+
+
+def run_in_greenlet(fn, after=None):
+    """
+    Turn a plain `def` handler/dependency into an `async def` that runs on the
+    event loop. Database calls inside it are awaited on the async driver via
+    SQLAlchemy's greenlet bridge instead of blocking a threadpool worker.
+
+    `after` post-processes the result inside the same greenlet (e.g. response
+    validation that may still touch lazy-loaded attributes).
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        def call():
+            result = fn(*args, **kwargs)
+            return after(result) if after else result
+        return await greenlet_spawn(call)
+
+    return wrapper
+
+
+# Track tables written by every session for the read-your-writes window (app/versions.py)
+import app.versions  # noqa: E402,F401
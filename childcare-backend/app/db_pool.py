@@ -0,0 +1,168 @@
+# app/db_pool.py
+import threading
+import time
+from uuid import uuid4
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from app.config import settings
+
+
+class PoolStats:
+    """
+    Connection pool counters for one engine: checkouts, how long they waited
+    for a connection (including connecting), timeouts and connections opened.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pool = None
+        self._checked_out = 0
+        self._peak_checked_out = 0
+        self._acquired = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._connects = 0
+        self._invalidated = 0
+
+    def attach(self, pool):
+        """
+        Count `pool`'s events (the listeners carry over to pools it is
+        recreated as) and, for the Timed* pools, its checkout waits.
+        """
+        self.pool = pool
+        pool._stats = self
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        event.listen(pool, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, record):
+        with self._lock:
+            self._connects += 1
+
+    def _on_checkout(self, dbapi_connection, record, proxy):
+        with self._lock:
+            self._checked_out += 1
+            self._peak_checked_out = max(self._peak_checked_out, self._checked_out)
+
+    def _on_checkin(self, dbapi_connection, record):
+        with self._lock:
+            self._checked_out = max(0, self._checked_out - 1)
+
+    def _on_invalidate(self, dbapi_connection, record, exception):
+        with self._lock:
+            self._invalidated += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._acquired += 1
+                self._wait_total += seconds
+                self._wait_max = max(self._wait_max, seconds)
+
+    def stats(self) -> dict:
+        pool = self.pool
+        queued = isinstance(pool, QueuePool)
+        with self._lock:
+            return {
+                "pool": type(pool).__name__ if pool is not None else None,
+                "size": pool.size() if queued else 0,
+                "max_overflow": pool._max_overflow if queued else 0,
+                "timeout_seconds": pool.timeout() if queued else None,
+                "checked_out": self._checked_out,
+                "peak_checked_out": self._peak_checked_out,
+                # Connections opened beyond `size` (negative: not yet all opened)
+                "overflow": pool.overflow() if queued else 0,
+                "idle": pool.checkedin() if queued else 0,
+                "acquired": self._acquired,
+                "avg_wait_ms": round(self._wait_total / self._acquired * 1000, 2) if self._acquired else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 2),
+                "timeouts": self._timeouts,
+                "connects": self._connects,
+                "invalidated": self._invalidated,
+            }
+
+
+class _TimedCheckout:
+    """
+    Pool mixin timing every checkout (waiting for a free slot plus connecting)
+    into the PoolStats attached to it.
+    """
+
+    _stats = None
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep reporting into the same stats
+        pool = super().recreate()
+        if self._stats is not None:
+            self._stats.pool = pool
+            pool._stats = self._stats
+        return pool
+
+    def connect(self):
+        if self._stats is None:
+            return super().connect()
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self._stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self._stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+sync_pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+replica_pool_stats = PoolStats()
+async_replica_pool_stats = PoolStats()
+
+
+def _sqlite_memory(url: str) -> bool:
+    # In-memory SQLite keeps its data in one connection (SingletonThreadPool / StaticPool)
+    return url.startswith("sqlite") and (":memory:" in url or url.split("://", 1)[1] in ("", "/"))
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """
+    create_engine / create_async_engine keyword arguments for the pool
+    settings. With DB_PGBOUNCER the pool is a NullPool (PgBouncer does the
+    pooling; a connection is only held for one transaction) and asyncpg's
+    prepared statement caches are disabled, as transaction mode requires.
+    """
+    if _sqlite_memory(url):
+        return {}
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if settings.DB_PGBOUNCER:
+        options["poolclass"] = TimedNullPool
+        if is_async:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                # Unique names: another client's statement may sit on the same server connection
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+    else:
+        options.update(
+            poolclass=TimedAsyncQueuePool if is_async else TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
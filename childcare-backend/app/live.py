@@ -0,0 +1,245 @@
+# app/live.py
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+from app.config import settings
+
+# PostgreSQL NOTIFY channel of the multi-worker bridge; payloads must stay under 8000 bytes
+NOTIFY_CHANNEL = "childcare_live"
+MAX_NOTIFY_BYTES = 7900
+
+EVENT_TYPES = ("attendance", "activity", "health_record")
+# Events published with a `room` (the assigned staff member's); the others only have a child_id
+ROOM_EVENT_TYPES = ("activity",)
+
+
+class Subscription:
+    """
+    One WebSocket / SSE client: its filters and a bounded queue of
+    serialized events. When the client can't keep up the oldest events are
+    dropped, and the next thing it receives is a `lagged` notice with the
+    count, so it knows to refetch instead of trusting the stream.
+    """
+
+    def __init__(self, principal, types=None, child_ids=None, rooms=None, queue_size: int = 256):
+        self.principal = principal
+        self.types = set(types) if types else set(EVENT_TYPES)
+        self.child_ids = set(child_ids or ())
+        self.rooms = set(rooms or ())
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def matches(self, event: dict) -> bool:
+        if event["type"] not in self.types:
+            return False
+        # Health records: admin, or the staff member who wrote them (as in GET /health-records/)
+        if event["type"] == "health_record" and self.principal.role != "admin":
+            if self.principal.role != "staff" or event.get("staff_name") != self.principal.name:
+                return False
+        if not self.child_ids and not self.rooms:
+            return True
+        return event.get("child_id") in self.child_ids or event.get("room") in self.rooms
+
+    def offer(self, message: str) -> bool:
+        """
+        Enqueue without ever waiting; False if the oldest event was dropped.
+        """
+        dropped = self.queue.full()
+        if dropped:
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+        return not dropped
+
+    async def next(self, timeout: float) -> Optional[str]:
+        """
+        The next serialized event, or None after `timeout` seconds of quiet
+        (time for a heartbeat).
+        """
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            return json.dumps({"type": "lagged", "dropped": dropped})
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LiveHub:
+    """
+    In-process fan-out of change events to the subscriptions of this
+    worker. Handlers publish after their commit, from any thread; delivery
+    happens on the event loop and never touches the database.
+
+    With LIVE_PG_NOTIFY, published events go out through PostgreSQL
+    NOTIFY instead and every worker (this one included) delivers what it
+    receives on LISTEN, so subscribers see writes made on any worker.
+    """
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._loop = None
+        self._bridge = None
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        if settings.LIVE_PG_NOTIFY:
+            self._bridge = NotifyBridge(self, settings.DATABASE_URL)
+            self._bridge.start()
+
+    async def stop(self):
+        if self._bridge is not None:
+            await self._bridge.stop()
+            self._bridge = None
+        self._loop = None
+
+    def subscribe(self, subscription: Subscription) -> Subscription:
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+
+    def publish(self, type: str, action: str, data: dict, child_id: Optional[int] = None, room: Optional[str] = None, **meta):
+        """
+        Queue one change event for delivery. Safe from worker threads and
+        greenlets; a no-op until the hub is started (scripts, tests).
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        with self._lock:
+            self._seq += 1
+            self.published += 1
+            seq = self._seq
+        event = {
+            "type": type,
+            "action": action,
+            "child_id": child_id,
+            "room": room,
+            "at": datetime.now(timezone.utc).isoformat(),
+            "seq": seq,
+            "data": data,
+            **meta,
+        }
+        target = self._bridge.notify if self._bridge is not None else self.deliver
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            target(event)
+            return
+        try:
+            loop.call_soon_threadsafe(target, event)
+        except RuntimeError:
+            pass  # loop closed: shutting down
+
+    def deliver(self, event: dict):
+        # Event loop thread: serialize once, enqueue for every matching subscription
+        message = None
+        for subscription in list(self._subscriptions):
+            if subscription.matches(event):
+                if message is None:
+                    message = json.dumps({k: v for k, v in event.items() if k != "staff_name"}, default=str)
+                self.delivered += 1
+                if not subscription.offer(message):
+                    self.dropped += 1
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscriptions),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "bridge": self._bridge.stats() if self._bridge is not None else None,
+        }
+
+
+class NotifyBridge:
+    """
+    Cross-worker transport over PostgreSQL LISTEN/NOTIFY on one dedicated
+    asyncpg connection (not a pool connection), reconnecting with backoff.
+    Events published while it is down are lost; clients refetch on the
+    `lagged` / reconnect path anyway.
+    """
+
+    def __init__(self, hub: LiveHub, database_url: str):
+        self.hub = hub
+        self.dsn = "postgresql://" + database_url.split("://", 1)[1]
+        self._conn = None
+        self._task = None
+        self._outbox = asyncio.Queue(maxsize=10000)
+        self.sent = 0
+        self.received = 0
+        self.lost = 0
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._conn is not None:
+            await self._conn.close()
+
+    def notify(self, event: dict):
+        # Event loop thread: the sender task writes them out in order
+        payload = json.dumps(event, default=str)
+        if len(payload.encode()) > MAX_NOTIFY_BYTES:
+            payload = json.dumps({**event, "data": None, "truncated": True}, default=str)
+        try:
+            self._outbox.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.lost += 1
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.received += 1
+        self.hub.deliver(json.loads(payload))
+
+    async def _run(self):
+        import asyncpg
+
+        backoff = 1
+        while True:
+            try:
+                self._conn = await asyncpg.connect(self.dsn)
+                await self._conn.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                print(f"✅ Live events bridged over NOTIFY {NOTIFY_CHANNEL}")
+                backoff = 1
+                while True:
+                    payload = await self._outbox.get()
+                    await self._conn.execute("SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, payload)
+                    self.sent += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Live NOTIFY bridge down ({type(e).__name__}: {e}); retrying in {backoff}s")
+                if self._conn is not None:
+                    self._conn.terminate()
+                    self._conn = None
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def stats(self) -> dict:
+        return {
+            "connected": self._conn is not None and not self._conn.is_closed(),
+            "sent": self.sent,
+            "received": self.received,
+            "lost": self.lost,
+            "pending": self._outbox.qsize(),
+        }
+
+
+live_hub = LiveHub()
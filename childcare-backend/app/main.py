@@ -1,8 +1,16 @@
 # app/main.py
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
+from app.database import async_engine
 from app.config import settings
+from app.password_pool import password_pool
+from app.serialization import DefaultJSONResponse
+from app.compression import CompressionMiddleware
+from app.metrics import MetricsMiddleware
+from app.warmup import run_warmup
+from app.live import live_hub
+from app.versions import version_feed
 
 # Import routers explicitly
 from app.routers.auth import router as auth_router
@@ -12,6 +20,13 @@ from app.routers.attendance import router as attendance_router
 from app.routers.health_records import router as health_record_router
 from app.routers.activities import router as activities_router
 from app.routers.billing import router as billing_router
+from app.routers.imports import router as imports_router
+from app.routers.reports import router as reports_router
+from app.routers.dashboard import router as dashboard_router
+from app.routers.health import router as health_router
+from app.routers.metrics import router as metrics_router
+from app.routers.search import router as search_router
+from app.routers.live import router as live_router
 
 # Import models so SQLAlchemy metadata is registered
 from app.models import (
@@ -21,11 +36,15 @@ from app.models import (
     attendance,
     health_record,
     activity as activities_model,
-    billing as billing_model
+    activity_exception,
+    billing as billing_model,
+    attendance_summary,
+    receivable,
+    table_version,
 )  # noqa: F401
 
 # ✅ Initialize FastAPI app
-app = FastAPI(title="Child Care Center Management System - API")
+app = FastAPI(title="Child Care Center Management System - API", default_response_class=DefaultJSONResponse)
 
 # ✅ Enable CORS for frontend (MUST come right after app creation)
 # Include both Render env var and explicit allowed URLs
@@ -42,15 +61,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ✅ Create tables on startup
+# ✅ Negotiated gzip / brotli for responses above COMPRESSION_MIN_SIZE bytes
+if settings.COMPRESSION_MIN_SIZE > 0:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# ✅ Per-route latency / status / size / SQL statement metrics for GET /metrics.
+# Added last so it is outermost: times the whole stack, counts compressed bytes.
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, query_warn=settings.METRICS_QUERY_WARN)
+
+# ✅ Warm up on startup: schema revision check (no DDL; run `alembic upgrade head`
+# to migrate), pool pre-warming, validator pre-compilation (see app/warmup.py)
 @app.on_event("startup")
-def on_startup():
-    print("🧱 Creating tables if not exist...")
-    try:
-        Base.metadata.create_all(bind=engine)
-        print("✅ Tables verified/created successfully.")
-    except Exception as e:
-        print("❌ Table creation failed:", e)
+async def on_startup():
+    password_pool.start()
+    # Live feed delivery runs on this loop; handlers in worker threads hand events over to it
+    live_hub.start(asyncio.get_running_loop())
+    # Table versions pushed over LISTEN: 304s without a version query (PostgreSQL)
+    if settings.TABLE_VERSIONS_LISTEN:
+        version_feed.start(settings.DATABASE_URL)
+    if settings.STARTUP_MODE == "background":
+        # Serve immediately; GET /health/ready reports when warm-up is done
+        app.state.warmup = asyncio.create_task(run_warmup(app, reraise=False))
+    else:
+        await run_warmup(app)
+
+# ✅ Stop the bcrypt pool, the live feed and the version feed, release async pool connections on shutdown
+@app.on_event("shutdown")
+async def on_shutdown():
+    warmup = getattr(app.state, "warmup", None)
+    if warmup is not None:
+        warmup.cancel()
+    password_pool.shutdown()
+    await live_hub.stop()
+    await version_feed.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # ✅ Include routers
 app.include_router(auth_router)
@@ -60,6 +106,13 @@ app.include_router(attendance_router)
 app.include_router(health_record_router)
 app.include_router(activities_router)
 app.include_router(billing_router)
+app.include_router(imports_router)
+app.include_router(reports_router)
+app.include_router(dashboard_router)
+app.include_router(health_router)
+app.include_router(metrics_router)
+app.include_router(search_router)
+app.include_router(live_router)
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,182 @@
+# app/metrics.py
+import contextvars
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Label for requests that matched no route (keeps 404 scans from adding series)
+UNMATCHED = "<unmatched>"
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class RequestMetrics:
+    """
+    In-process per-route counters and histograms. Each worker process keeps
+    its own; scrape every worker (or run one) for complete numbers.
+    """
+
+    HISTOGRAMS = (
+        ("http_request_duration_seconds", "Request latency", LATENCY_BUCKETS),
+        ("http_response_size_bytes", "Response body size (after compression)", SIZE_BUCKETS),
+        ("db_queries_per_request", "SQL statements executed per request", QUERY_BUCKETS),
+        ("db_time_per_request_seconds", "Time spent in SQL statements per request", LATENCY_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}  # (method, route, status) -> count
+        self._flagged = {}  # (method, route) -> count
+        self._histograms = {name: {} for name, _, _ in self.HISTOGRAMS}
+
+    def observe(self, method, route, status, duration, size, queries, db_seconds, flagged=False):
+        key = (method, route)
+        with self._lock:
+            self._requests[(method, route, status)] = self._requests.get((method, route, status), 0) + 1
+            if flagged:
+                self._flagged[key] = self._flagged.get(key, 0) + 1
+            for (name, _, buckets), value in zip(self.HISTOGRAMS, (duration, size, queries, db_seconds)):
+                series = self._histograms[name]
+                if key not in series:
+                    series[key] = Histogram(buckets)
+                series[key].observe(value)
+
+    def render(self) -> list:
+        lines = [
+            "# HELP http_requests_total Requests by route template and status code",
+            "# TYPE http_requests_total counter",
+        ]
+        with self._lock:
+            for (method, route, status), count in sorted(self._requests.items()):
+                lines.append(f'http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}')
+            lines += [
+                f"# HELP http_requests_query_flagged_total Requests over METRICS_QUERY_WARN ({settings.METRICS_QUERY_WARN}) SQL statements",
+                "# TYPE http_requests_query_flagged_total counter",
+            ]
+            for (method, route), count in sorted(self._flagged.items()):
+                lines.append(f'http_requests_query_flagged_total{{{_labels(method=method, route=route)}}} {count}')
+            for name, help_text, _ in self.HISTOGRAMS:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), hist in sorted(self._histograms[name].items()):
+                    labels = _labels(method=method, route=route)
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        lines.append(f'{name}_bucket{{{labels},le="{_number(bound)}"}} {count}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+                    lines.append(f"{name}_sum{{{labels}}} {_number(hist.sum)}")
+                    lines.append(f"{name}_count{{{labels}}} {hist.count}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+request_metrics = RequestMetrics()
+
+
+class QueryCounter:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# The current request's counter. Handlers in the threadpool and in greenlets
+# (DB_MODE=async) run in a copy of the request's context and share the object.
+current_queries = contextvars.ContextVar("current_queries", default=None)
+
+
+# Every engine (sync, async, replica): count statements and time them
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_queries.get() is not None and context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = current_queries.get()
+    if counter is None:
+        return
+    counter.count += 1
+    started = getattr(context, "_metrics_started", None)
+    if started is not None:
+        counter.seconds += time.perf_counter() - started
+
+
+class MetricsMiddleware:
+    """
+    Records, per route template (`/children/{child_id}`, not the raw path):
+    latency, status codes, response size and the SQL statements run by the
+    request. Requests over `query_warn` statements are logged and counted so
+    N+1 lazy loads stand out.
+    """
+
+    def __init__(self, app, query_warn: int = 0, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.query_warn = query_warn
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = QueryCounter()
+        token = current_queries.set(counter)
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def counting_send(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, counting_send)
+        finally:
+            current_queries.reset(token)
+            route = scope.get("route")
+            route = getattr(route, "path", None) or UNMATCHED
+            flagged = 0 < self.query_warn < counter.count
+            if flagged:
+                print(
+                    f"⚠️ {scope['method']} {route} ran {counter.count} SQL statements "
+                    f"({counter.seconds * 1000:.1f} ms; METRICS_QUERY_WARN={self.query_warn})"
+                )
+            self.metrics.observe(
+                scope["method"], route, status, time.perf_counter() - started,
+                size, counter.count, counter.seconds, flagged,
+            )
@@ -0,0 +1,53 @@
+# app/migrations.py
+from app.config import settings
+
+# alembic is imported inside the functions: it adds ~0.1 s to the API's import
+# time and is only needed once per process (or in background warm-up).
+
+
+def alembic_config():
+    """
+    The migration environment in childcare-db-schema (its env.py targets
+    DATABASE_URL and app.models).
+    """
+    from alembic.config import Config
+    return Config(settings.ALEMBIC_CONFIG)
+
+
+def schema_revisions(engine) -> tuple:
+    """
+    -> (revisions the database is stamped with, head revisions of the scripts)
+    """
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory.from_config(alembic_config()).get_heads())
+    with engine.connect() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+    return current, heads
+
+
+def check_schema(engine, mode: str = "strict") -> bool:
+    """
+    Compare the database revision with the migration head without running
+    any DDL. "strict" raises when they differ, "warn" only reports it.
+    """
+    if mode == "off":
+        return True
+    current, heads = schema_revisions(engine)
+    if current == heads:
+        print(f"✅ Database schema at revision {', '.join(sorted(heads))}.")
+        return True
+    message = (
+        f"Database schema is at revision {', '.join(sorted(current)) or '<none>'} but the migrations head is "
+        f"{', '.join(sorted(heads))}; run `alembic upgrade head` in childcare-db-schema."
+    )
+    if mode == "strict":
+        raise RuntimeError(message)
+    print("⚠️ " + message)
+    return False
+
+
+def upgrade_to_head() -> None:
+    from alembic import command
+    command.upgrade(alembic_config(), "head")
@@ -4,4 +4,8 @@ from .child import Child
 from .attendance import Attendance
 from .health_record import HealthRecord
 from .activity import Activity
+from .activity_exception import ActivityException
 from .billing import Billing
+from .attendance_summary import AttendanceMonthlySummary, AttendanceDailySummary
+from .receivable import Receivable
+from .table_version import TableVersion
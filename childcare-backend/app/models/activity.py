@@ -1,18 +1,38 @@
 # app/models/activity.py
-from sqlalchemy import Column, Integer, String, Text, Date, Time, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, Text, Date, Time, ForeignKey, DateTime, Index, func, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Activity(Base):
     __tablename__ = "activities"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
     description = Column(Text)
     scheduled_date = Column(Date)
     start_time = Column(Time)
     end_time = Column(Time)
     assigned_staff_id = Column(Integer, ForeignKey("staff.id", ondelete="SET NULL"))
+    # RRULE subset (app/recurrence.py) starting on scheduled_date; NULL for one-off activities
+    recurrence_rule = Column(String(255))
+    # Last possible occurrence (UNTIL, or COUNT resolved); NULL = runs indefinitely
+    recurrence_until = Column(Date)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     assigned_staff = relationship("Staff", back_populates="activities")
+    # Changed or cancelled occurrences of a recurring activity
+    exceptions = relationship("ActivityException", back_populates="activity", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Keyset pagination order for GET /activities/
+        Index("idx_activities_scheduled_date_id", "scheduled_date", "id"),
+        # A staff member's schedule; also serves the ON DELETE SET NULL from staff
+        Index("idx_activities_assigned_staff_id_scheduled_date", "assigned_staff_id", "scheduled_date"),
+        # Recurring series that have started by a calendar window's end
+        Index(
+            "idx_activities_recurring",
+            "scheduled_date",
+            postgresql_where=text("recurrence_rule IS NOT NULL"),
+            sqlite_where=text("recurrence_rule IS NOT NULL"),
+        ),
+    )
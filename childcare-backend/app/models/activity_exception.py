@@ -0,0 +1,30 @@
+# app/models/activity_exception.py
+from sqlalchemy import Column, Integer, String, Text, Date, Time, Boolean, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class ActivityException(Base):
+    """
+    One changed or cancelled occurrence of a recurring activity. Override
+    columns left NULL keep the series' value.
+    """
+    __tablename__ = "activity_exceptions"
+
+    id = Column(Integer, primary_key=True)
+    activity_id = Column(Integer, ForeignKey("activities.id", ondelete="CASCADE"), nullable=False)
+    occurrence_date = Column(Date, nullable=False)
+    cancelled = Column(Boolean, nullable=False, default=False)
+    title = Column(String(255))
+    description = Column(Text)
+    start_time = Column(Time)
+    end_time = Column(Time)
+    assigned_staff_id = Column(Integer, ForeignKey("staff.id", ondelete="SET NULL"))
+
+    activity = relationship("Activity", back_populates="exceptions")
+
+    __table_args__ = (
+        # One exception per occurrence; also serves a series' exceptions in a window
+        UniqueConstraint("activity_id", "occurrence_date", name="activity_exceptions_activity_id_occurrence_date_key"),
+        # The staff -> exceptions SET NULL
+        Index("ix_activity_exceptions_assigned_staff_id", "assigned_staff_id"),
+    )
@@ -1,5 +1,5 @@
 # app/models/attendance.py
-from sqlalchemy import Column, Integer, ForeignKey, Date, Time, String, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Date, Time, String, DateTime, Index, UniqueConstraint, CheckConstraint, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -7,12 +7,21 @@ from app.database import Base
 class Attendance(Base):
     __tablename__ = "attendance"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     child_id = Column(Integer, ForeignKey("children.id", ondelete="CASCADE"), nullable=False)
     date = Column(Date, nullable=False)
     check_in = Column(Time)
     check_out = Column(Time)
-    status = Column(String(32), default="Present")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    status = Column(String(32), nullable=False, default="Present", server_default="Present")
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
 
     child = relationship("Child", back_populates="attendance_records")
+
+    __table_args__ = (
+        # One record per child per day (matches schema.sql); also serves
+        # per-child lookups and the ON CONFLICT target of POST /attendance/bulk
+        UniqueConstraint("child_id", "date", name="attendance_child_id_date_key"),
+        CheckConstraint("status IN ('Present','Absent','Late','Excused')", name="attendance_status_check"),
+        # Keyset pagination order for GET /attendance/
+        Index("idx_attendance_date_id", "date", "id"),
+    )
@@ -0,0 +1,39 @@
+# app/models/attendance_summary.py
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index
+from app.database import Base
+
+class AttendanceMonthlySummary(Base):
+    """Per child per month status counts, maintained incrementally from attendance writes."""
+    __tablename__ = "attendance_monthly_summary"
+
+    child_id = Column(Integer, ForeignKey("children.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # first day of the month
+    present = Column(Integer, nullable=False, default=0)
+    late = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    excused = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Month-first keyset pages for center-wide reports
+        Index("idx_attendance_monthly_summary_month", "month", "child_id"),
+    )
+
+    @property
+    def days_recorded(self) -> int:
+        return self.present + self.late + self.absent + self.excused
+
+
+class AttendanceDailySummary(Base):
+    """Center-wide status counts per day (daily headcount)."""
+    __tablename__ = "attendance_daily_summary"
+
+    date = Column(Date, primary_key=True)
+    present = Column(Integer, nullable=False, default=0)
+    late = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    excused = Column(Integer, nullable=False, default=0)
+
+    @property
+    def headcount(self) -> int:
+        # Children on site: arrived on time or late
+        return self.present + self.late
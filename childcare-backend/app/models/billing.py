@@ -1,17 +1,31 @@
-from sqlalchemy import Column, Integer, ForeignKey, Numeric, String, Date, Text, DateTime, func
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, String, Date, Text, DateTime, Index, UniqueConstraint, CheckConstraint, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Billing(Base):
     __tablename__ = "billing"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     child_id = Column(Integer, ForeignKey("children.id", ondelete="CASCADE"), nullable=False)
     amount = Column(Numeric(10, 2), nullable=False)
     status = Column(String(32), nullable=False, default="Unpaid")
     issued_date = Column(Date, default=func.current_date())
     due_date = Column(Date)
     notes = Column(Text)
+    # First day of the month for invoices produced by a billing run; NULL for manual entries
+    billing_period = Column(Date, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     child = relationship("Child", back_populates="billings")
+
+    __table_args__ = (
+        # At most one generated invoice per child per month (billing runs are idempotent)
+        UniqueConstraint("child_id", "billing_period", name="billing_child_id_billing_period_key"),
+        CheckConstraint("status IN ('Paid','Unpaid','Pending','Overdue')", name="billing_status_check"),
+        # Per-child invoices (filters, cascades, receivables refresh) in list order
+        Index("idx_billing_child_id_due_date", "child_id", "due_date", "id"),
+        # Keyset pagination order for GET /billing/
+        Index("idx_billing_due_date_id", "due_date", "id"),
+        # Set-based Unpaid -> Overdue sweep of the aging job
+        Index("idx_billing_status_due_date", "status", "due_date"),
+    )
@@ -1,12 +1,15 @@
 # app/models/child.py
-from sqlalchemy import Column, Integer, String, Date, Text, DateTime, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Date, Text, DateTime, Index, func, select
+from sqlalchemy.orm import relationship, column_property
 from app.database import Base
+from app.models.attendance import Attendance
+from app.models.health_record import HealthRecord
+from app.models.billing import Billing
 
 class Child(Base):
     __tablename__ = "children"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
     dob = Column(Date)
     gender = Column(String(20))
@@ -15,26 +18,51 @@ class Child(Base):
     address = Column(Text)
     allergies = Column(Text)
     medical_info = Column(Text)
+    photo_url = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    # Relationships
+    # Relationships (loaded on demand; list endpoints batch them with selectinload)
     attendance_records = relationship(
         "Attendance",
         back_populates="child",
         cascade="all, delete-orphan",
-        lazy="joined"
+        lazy="select"
     )
 
     health_records = relationship(
         "HealthRecord",
         back_populates="child",
         cascade="all, delete-orphan",
-        lazy="joined"
+        lazy="select"
     )
 
     billings = relationship(
         "Billing",
         back_populates="child",
         cascade="all, delete-orphan",
-        lazy="joined"
+        lazy="select"
+    )
+
+    # Related-row counts, computed in SQL; only loaded with undefer_group("counts")
+    attendance_count = column_property(
+        select(func.count(Attendance.id)).where(Attendance.child_id == id).correlate_except(Attendance).scalar_subquery(),
+        deferred=True,
+        group="counts",
+    )
+
+    health_record_count = column_property(
+        select(func.count(HealthRecord.id)).where(HealthRecord.child_id == id).correlate_except(HealthRecord).scalar_subquery(),
+        deferred=True,
+        group="counts",
+    )
+
+    billing_count = column_property(
+        select(func.count(Billing.id)).where(Billing.child_id == id).correlate_except(Billing).scalar_subquery(),
+        deferred=True,
+        group="counts",
+    )
+
+    __table_args__ = (
+        # Keyset pagination order for GET /children/
+        Index("idx_children_name_id", "name", "id"),
     )
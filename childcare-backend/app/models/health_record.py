@@ -1,12 +1,12 @@
 # app/models/health_record.py
-from sqlalchemy import Column, Integer, Text, String, Date, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, Text, String, Date, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class HealthRecord(Base):
     __tablename__ = "health_records"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     child_id = Column(Integer, ForeignKey("children.id", ondelete="CASCADE"), nullable=False)
     description = Column(Text, nullable=False)
     doctor_name = Column(String(255))
@@ -14,3 +14,10 @@ class HealthRecord(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     child = relationship("Child", back_populates="health_records")
+
+    __table_args__ = (
+        # Keyset pagination order for GET /health-records/
+        Index("idx_health_records_record_date_id", "record_date", "id"),
+        # Per-child records (filters, cascades) in list order
+        Index("idx_health_records_child_id_record_date", "child_id", "record_date", "id"),
+    )
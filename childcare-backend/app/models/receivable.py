@@ -0,0 +1,21 @@
+# app/models/receivable.py
+from sqlalchemy import Column, Integer, Numeric, Date, ForeignKey
+from app.database import Base
+
+class Receivable(Base):
+    """
+    Outstanding balance per child with aging buckets (days past due_date as
+    of `as_of`; invoices not yet due count as 0-30). Only children owing
+    money have a row. Maintained by the billing writes and the daily aging job.
+    """
+    __tablename__ = "receivables"
+
+    child_id = Column(Integer, ForeignKey("children.id", ondelete="CASCADE"), primary_key=True)
+    balance = Column(Numeric(12, 2), nullable=False, default=0)
+    open_invoices = Column(Integer, nullable=False, default=0)
+    aged_0_30 = Column(Numeric(12, 2), nullable=False, default=0)
+    aged_31_60 = Column(Numeric(12, 2), nullable=False, default=0)
+    aged_61_90 = Column(Numeric(12, 2), nullable=False, default=0)
+    aged_90_plus = Column(Numeric(12, 2), nullable=False, default=0)
+    oldest_due_date = Column(Date)
+    as_of = Column(Date, nullable=False)
@@ -7,8 +7,8 @@ from datetime import date
 class Staff(Base):
     __tablename__ = "staff"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     contact = Column(String(50), nullable=True)
     position = Column(String(100), nullable=True)
     assigned_room = Column(String(100), nullable=True)
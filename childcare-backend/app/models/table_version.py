@@ -0,0 +1,16 @@
+# app/models/table_version.py
+from sqlalchemy import Column, String, BigInteger, Float
+from app.database import Base
+
+class TableVersion(Base):
+    """
+    Write counter and last-write time (epoch seconds) per table, bumped by
+    database triggers when the writing transaction commits (migrations
+    0005/0006): writes from any worker, script or psql session count. Read
+    by app/versions.py.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(63), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    modified = Column(Float, nullable=False, default=0)
@@ -1,15 +1,19 @@
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import Column, Integer, String, DateTime, CheckConstraint, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
-    email = Column(String(255), unique=True, index=True, nullable=False)
+    email = Column(String(255), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     role = Column(String(32), nullable=False, default="staff")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     staff_profile = relationship("Staff", back_populates="user", uselist=False)
+
+    __table_args__ = (
+        CheckConstraint("role IN ('admin','staff','parent')", name="users_role_check"),
+    )
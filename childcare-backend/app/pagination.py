@@ -0,0 +1,103 @@
+# app/pagination.py
+import base64
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import and_, tuple_
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+
+
+def _dump_value(value):
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _load_value(column, raw):
+    if raw is None:
+        return None
+    python_type = column.type.python_type
+    if python_type in (date, datetime, time):
+        return python_type.fromisoformat(raw)
+    return python_type(raw)
+
+
+def encode_cursor(row, columns: Sequence) -> str:
+    """
+    Build an opaque cursor from the key columns of the last row of a page.
+    """
+    values = [_dump_value(getattr(row, col.key)) for col in columns]
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> list:
+    """
+    Decode a cursor produced by encode_cursor back into typed key values.
+    Raises a 400 if the cursor is malformed or was built for other keys.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort keys")
+        return [_load_value(col, raw) for col, raw in zip(columns, values)]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(columns: Sequence, values: Sequence) -> list:
+    """
+    Disjoint WHERE clauses selecting the rows strictly after `values` in
+    (col1 ASC NULLS LAST, ..., id ASC) order, listed in that order. Each is
+    a single index range: a row-value comparison over the keys, or a
+    NULLS LAST group. ORing them would leave the planner a filtered scan
+    from the start of the index instead.
+    """
+    col, value = columns[0], values[0]
+    rest, rest_values = columns[1:], values[1:]
+    if value is None:
+        # Nothing sorts after NULL in this column except within the NULL group
+        return [and_(col.is_(None), clause) for clause in _after(rest, rest_values)]
+    if not any(key.nullable for key in rest):
+        ranges = [tuple_(*columns) > tuple_(*values) if rest else col > value]
+    else:
+        ranges = [and_(col == value, clause) for clause in _after(rest, rest_values)] + [col > value]
+    if col.nullable:
+        ranges.append(col.is_(None))
+    return ranges
+
+
+def keyset_page(query, columns: Sequence, cursor: Optional[str], limit: Optional[int]) -> dict:
+    """
+    Return one page of `query` ordered by `columns` (the last one must be
+    unique and non-null, usually the primary key).
+
+    The page is fetched with a seek predicate instead of OFFSET, so every
+    page costs the same index range scan however deep into the data it is.
+    A page spanning into a NULLS LAST group reads the next range with a
+    second query.
+    """
+    limit = limit or DEFAULT_PAGE_LIMIT
+    order_by = [col.asc().nulls_last() if col.nullable else col.asc() for col in columns]
+    if not cursor:
+        rows = query.order_by(*order_by).limit(limit + 1).all()
+    else:
+        rows = []
+        for clause in _after(columns, decode_cursor(cursor, columns)):
+            rows += query.filter(clause).order_by(*order_by).limit(limit + 1 - len(rows)).all()
+            if len(rows) > limit:
+                break
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1], columns)
+    return {"items": rows, "next_cursor": next_cursor}
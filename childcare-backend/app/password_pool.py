@@ -0,0 +1,156 @@
+# app/password_pool.py
+import asyncio
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import anyio.to_thread
+import bcrypt
+from fastapi import HTTPException
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+
+# DB_MODE=sync: share of the threadpool that may wait on hashes
+THREADPOOL_SHARE = 4
+
+
+# Worker functions (module level so the spawned processes can import them)
+def hash_password_bytes(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+def check_password_bytes(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def _worker_ready() -> bool:
+    return True
+
+
+def _offload(fn, *args):
+    """
+    Run CPU-heavy work off the event loop when called from an async-mode
+    (greenlet) handler; call it directly otherwise.
+    """
+    if in_greenlet():
+        return await_only(run_in_threadpool(fn, *args))
+    return fn(*args)
+
+
+class PasswordHashPool:
+    """
+    Dedicated process pool for bcrypt so hashing never competes with CRUD
+    handlers for threadpool workers or the GIL.
+
+    At most `workers + queue_size` hashes may be in flight; beyond that the
+    request fails fast with 503 + Retry-After instead of queueing unbounded.
+    With DB_MODE=sync each waiting request holds a threadpool thread, so
+    in-flight hashes are further capped at a quarter of the threadpool
+    (40 threads by default: 10): a login burst can't starve the other
+    handlers. In async mode waits hold no thread.
+    Until start() is called (scripts, tests) hashing runs inline.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = None
+        self._slots = None
+        self.capacity = workers + queue_size
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def start(self):
+        if self.workers <= 0 or self._executor is not None:
+            return
+        self.capacity = self.workers + self.queue_size
+        if settings.DB_MODE != "async":
+            # Called on the event loop at start-up, where the default limiter is readable
+            threads = anyio.to_thread.current_default_thread_limiter().total_tokens
+            self.capacity = min(self.capacity, max(self.workers, int(threads) // THREADPOOL_SHARE))
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def warm(self):
+        """
+        Spawn every worker process now (and import this module in it) so the
+        first login doesn't pay for process start-up.
+        """
+        if self._executor is None:
+            return 0
+        for future in [self._executor.submit(_worker_ready) for _ in range(self.workers)]:
+            future.result()
+        return self.workers
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+    def _retry_after(self) -> int:
+        with self._lock:
+            avg = self._latency_total / self._completed if self._completed else 0.25
+            backlog = self._in_flight
+        return max(1, math.ceil(backlog * avg / max(self.workers, 1)))
+
+    def run(self, fn, *args):
+        if self._executor is None:
+            return _offload(fn, *args)
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Authentication service is busy, please retry shortly",
+                headers={"Retry-After": str(self._retry_after())},
+            )
+
+        with self._lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            future = self._executor.submit(fn, *args)
+            if in_greenlet():
+                return await_only(asyncio.wrap_future(future))
+            return future.result()
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._latency_total += elapsed
+                self._latency_max = max(self._latency_max, elapsed)
+            self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self._executor is not None,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_latency_ms": round(self._latency_total / self._completed * 1000, 2) if self._completed else 0.0,
+                "max_latency_ms": round(self._latency_max * 1000, 2),
+            }
+
+
+password_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE)
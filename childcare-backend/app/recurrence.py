@@ -0,0 +1,178 @@
+# app/recurrence.py
+import calendar
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterator, Optional
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+
+# COUNT is resolved to an UNTIL date when a rule is saved
+MAX_COUNT = 5000
+
+# Upper bound for open-ended searches (date.max leaves no room to step past)
+FAR_FUTURE = date(9998, 12, 31)
+
+
+class RecurrenceRule:
+    """
+    The subset of RFC 5545 RRULE a centre's routines need:
+    FREQ=DAILY|WEEKLY|MONTHLY, INTERVAL, BYDAY (DAILY/WEEKLY), BYMONTHDAY
+    (MONTHLY, negative counts from the month's end), UNTIL and COUNT.
+    The series starts on the activity's scheduled_date (DTSTART).
+
+    Occurrences are computed for a window directly, never by walking from
+    the start: the cost depends on the window, not on the series' age.
+    """
+
+    def __init__(self, freq: str, interval: int = 1, byday=None, bymonthday=None, until: Optional[date] = None, count: Optional[int] = None):
+        self.freq = freq
+        self.interval = interval
+        self.byday = byday  # sorted weekday numbers (Monday = 0) or None
+        self.bymonthday = bymonthday  # tuple of days or None
+        self.until = until
+        self.count = count
+
+    @classmethod
+    def parse(cls, text: str) -> "RecurrenceRule":
+        """
+        "FREQ=WEEKLY;BYDAY=MO,WE,FR;UNTIL=20270630" -> RecurrenceRule; raises
+        ValueError with a readable message.
+        """
+        text = text.strip()
+        if text.upper().startswith("RRULE:"):
+            text = text[6:]
+        parts = {}
+        for part in filter(None, text.split(";")):
+            key, sep, value = part.partition("=")
+            if not sep or not value:
+                raise ValueError(f"Malformed rule part: {part!r}")
+            parts[key.strip().upper()] = value.strip().upper()
+
+        freq = parts.pop("FREQ", None)
+        if freq not in FREQUENCIES:
+            raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+        try:
+            interval = int(parts.pop("INTERVAL", 1))
+            count = int(parts.pop("COUNT")) if "COUNT" in parts else None
+            bymonthday = tuple(sorted({int(d) for d in parts.pop("BYMONTHDAY").split(",")})) if "BYMONTHDAY" in parts else None
+            # UNTIL=YYYYMMDD, or a date-time (YYYYMMDDTHHMMSSZ) of which the date counts
+            until = parts.pop("UNTIL")[:8] if "UNTIL" in parts else None
+            until = date(int(until[:4]), int(until[4:6]), int(until[6:8])) if until else None
+        except ValueError:
+            raise ValueError("INTERVAL, COUNT and BYMONTHDAY take integers, UNTIL a YYYYMMDD date")
+
+        byday = None
+        if "BYDAY" in parts:
+            days = parts.pop("BYDAY").split(",")
+            if any(day not in WEEKDAYS for day in days):
+                raise ValueError(f"BYDAY takes {','.join(WEEKDAYS)} (no ordinals)")
+            byday = tuple(sorted({WEEKDAYS.index(day) for day in days}))
+
+        if parts:
+            raise ValueError(f"Unsupported rule parts: {', '.join(sorted(parts))}")
+        if interval < 1:
+            raise ValueError("INTERVAL must be at least 1")
+        if count is not None and until is not None:
+            raise ValueError("Use either COUNT or UNTIL, not both")
+        if count is not None and not 1 <= count <= MAX_COUNT:
+            raise ValueError(f"COUNT must be between 1 and {MAX_COUNT}")
+        if byday is not None and freq == "MONTHLY":
+            raise ValueError("BYDAY is supported with DAILY and WEEKLY only")
+        if bymonthday is not None and (freq != "MONTHLY" or any(d == 0 or not -31 <= d <= 31 for d in bymonthday)):
+            raise ValueError("BYMONTHDAY takes days 1..31 or -31..-1, with MONTHLY only")
+        return cls(freq, interval, byday, bymonthday, until, count)
+
+    def __str__(self) -> str:
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.byday is not None:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.byday))
+        if self.bymonthday is not None:
+            parts.append("BYMONTHDAY=" + ",".join(map(str, self.bymonthday)))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until:%Y%m%d}")
+        return ";".join(parts)
+
+    def resolved(self, start: date) -> "RecurrenceRule":
+        """
+        The same rule with COUNT replaced by the UNTIL date of its last
+        occurrence, so the end of the series is a stored column.
+        """
+        if self.count is None:
+            return self
+        rule = RecurrenceRule(self.freq, self.interval, self.byday, self.bymonthday)
+        n = 0
+        try:
+            for n, day in enumerate(rule._between(start, start, date.max), start=1):
+                if n == self.count:
+                    rule.until = day
+                    return rule
+        except (OverflowError, ValueError):
+            # Ran past year 9999
+            pass
+        raise ValueError(f"The rule has only {n} occurrences, fewer than COUNT")
+
+    def occurrences(self, start: date, date_from: date, date_to: date) -> Iterator[date]:
+        """
+        Occurrence dates of a series starting on `start`, within
+        [date_from, date_to].
+        """
+        until = min(date_to, self.until) if self.until else date_to
+        if self.count is not None:
+            until = min(until, self.resolved(start).until)
+        yield from self._between(start, max(start, date_from), until)
+
+    def _between(self, start: date, lo: date, hi: date) -> Iterator[date]:
+        if lo > hi:
+            return
+        if self.freq == "DAILY":
+            # First day on or after lo that is a whole number of intervals from start
+            day = lo + timedelta(days=-(lo - start).days % self.interval)
+            while day <= hi:
+                if self.byday is None or day.weekday() in self.byday:
+                    yield day
+                day += timedelta(days=self.interval)
+        elif self.freq == "WEEKLY":
+            days = self.byday if self.byday is not None else (start.weekday(),)
+            first_week = start - timedelta(days=start.weekday())
+            week = lo - timedelta(days=lo.weekday())
+            week += timedelta(weeks=-((week - first_week).days // 7) % self.interval)
+            while week <= hi:
+                for weekday in days:
+                    day = week + timedelta(days=weekday)
+                    if lo <= day <= hi:
+                        yield day
+                week += timedelta(weeks=self.interval)
+        else:
+            monthdays = self.bymonthday if self.bymonthday is not None else (start.day,)
+            months = (lo.year - start.year) * 12 + lo.month - start.month
+            months += -months % self.interval
+            while True:
+                year, month = divmod(start.year * 12 + start.month - 1 + months, 12)
+                month += 1
+                if date(year, month, 1) > hi:
+                    return
+                length = calendar.monthrange(year, month)[1]
+                # Days the month doesn't have (31 in June) are skipped, as in RFC 5545
+                days = sorted({d if d > 0 else length + 1 + d for d in monthdays if abs(d) <= length})
+                for d in days:
+                    day = date(year, month, d)
+                    if lo <= day <= hi:
+                        yield day
+                months += self.interval
+
+    def occurs_on(self, start: date, day: date) -> bool:
+        return any(True for _ in self.occurrences(start, day, day))
+
+
+@lru_cache(maxsize=1024)
+def parse_rule(text: str) -> RecurrenceRule:
+    """
+    RecurrenceRule.parse for stored (already validated) rules, cached; the
+    result is shared, don't modify it.
+    """
+    return RecurrenceRule.parse(text)
@@ -1,13 +1,38 @@
 # app/routers/activities.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
+from datetime import date, timedelta
 from app.database import get_db
 from app.models.activity import Activity
-from app.schemas.activity_schema import ActivityCreate, ActivityUpdate, ActivityResponse
-from app.routers.deps import get_current_user
+from app.models.staff import Staff
+from app.schemas.activity_schema import (
+    ActivityCreate, ActivityUpdate, ActivityResponse, ActivityOccurrence, OccurrenceUpdate, ScheduleValidation,
+)
+from app.schemas.page_schema import Page
+from app.pagination import keyset_page, MAX_PAGE_LIMIT
+from app.crud.dashboard import invalidate_dashboard
+from app.crud.schedule import (
+    MAX_CALENDAR_DAYS, Occurrence, apply_recurrence, cached_calendar, expand_occurrences, find_overlaps,
+    save_exception, split_series, validate_booking,
+)
+from app.typeahead import typeahead_index, activity_entry
+from app.live import live_hub
+from app.routers.deps import get_current_user, DBRoute, conditional_get
 
-router = APIRouter(prefix="/activities", tags=["activities"])
+router = APIRouter(prefix="/activities", tags=["activities"], route_class=DBRoute)
+
+# Conditional GET: ETag / Last-Modified from the version counters of these tables
+activity_versions = Depends(conditional_get("activities", "activity_exceptions"))
+
+
+def _event(db: Session, activity, schema=ActivityResponse) -> dict:
+    """
+    Live feed (/live) payload of an activity or occurrence; `room` is the
+    assigned staff member's room, which room subscriptions follow.
+    """
+    staff = db.get(Staff, activity.assigned_staff_id) if activity.assigned_staff_id is not None else None
+    return {"data": schema.model_validate(activity).model_dump(mode="json"), "room": staff.assigned_room if staff else None}
 
 # ✅ Create Activity
 @router.post("/", response_model=ActivityResponse, status_code=status.HTTP_201_CREATED)
@@ -16,18 +41,80 @@ def create_activity(activity_in: ActivityCreate, db: Session = Depends(get_db),
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
     activity = Activity(**activity_in.model_dump())
+    apply_recurrence(activity)
+    validate_booking(db, activity)
     db.add(activity)
     db.commit()
+    invalidate_dashboard()
     db.refresh(activity)
+    typeahead_index.upsert(activity_entry(activity.id, activity.title, activity.scheduled_date, activity.start_time))
+    live_hub.publish("activity", "created", **_event(db, activity))
     return activity
 
-# ✅ List all Activities
-@router.get("/", response_model=List[ActivityResponse])
-def list_activities(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    return db.query(Activity).all()
+# ✅ List all Activities (pass cursor/limit for keyset pages ordered by (scheduled_date, id))
+@router.get("/", response_model=Union[List[ActivityResponse], Page[ActivityResponse]], dependencies=[activity_versions])
+def list_activities(
+    staff_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    query = db.query(Activity)
+    if staff_id is not None:
+        query = query.filter(Activity.assigned_staff_id == staff_id)
+    if date_from:
+        query = query.filter(Activity.scheduled_date >= date_from)
+    if date_to:
+        query = query.filter(Activity.scheduled_date <= date_to)
+
+    if cursor is None and limit is None:
+        return query.all()
+    return keyset_page(query, [Activity.scheduled_date, Activity.id], cursor, limit)
+
+def _check_range(date_from: date, date_to: date):
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (date_to - date_from).days >= MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {MAX_CALENDAR_DAYS} days")
+
+def _serialize_occurrences(occurrences):
+    return [ActivityOccurrence.model_validate(o).model_dump(mode="json") for o in occurrences]
+
+# ✅ Calendar: activities in a date range by day and start time, recurring ones expanded (cached per window)
+@router.get("/calendar", response_model=List[ActivityOccurrence], dependencies=[activity_versions])
+def activity_calendar(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    staff_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    _check_range(date_from, date_to)
+    return cached_calendar(db, date_from, date_to, staff_id, _serialize_occurrences)
+
+# ✅ Validate a schedule: every staff double-booking in a date range (default: this week)
+@router.get("/conflicts", response_model=ScheduleValidation, dependencies=[activity_versions])
+def schedule_conflicts(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    staff_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    if date_from is None:
+        date_from = date.today() - timedelta(days=date.today().weekday())
+    if date_to is None:
+        date_to = date_from + timedelta(days=6)
+    _check_range(date_from, date_to)
+
+    occurrences = expand_occurrences(db, date_from, date_to, staff_id)
+    return {"date_from": date_from, "date_to": date_to, "checked": len(occurrences), "conflicts": find_overlaps(occurrences)}
 
 # ✅ Get single Activity
-@router.get("/{activity_id}", response_model=ActivityResponse)
+@router.get("/{activity_id}", response_model=ActivityResponse, dependencies=[activity_versions])
 def get_activity(activity_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
     activity = db.query(Activity).filter(Activity.id == activity_id).first()
     if not activity:
@@ -47,11 +134,85 @@ def update_activity(activity_id: int, activity_in: ActivityUpdate, db: Session =
     update_data = activity_in.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(activity, key, value)
+    apply_recurrence(activity)
+    validate_booking(db, activity)
 
     db.commit()
+    invalidate_dashboard()
     db.refresh(activity)
+    typeahead_index.upsert(activity_entry(activity.id, activity.title, activity.scheduled_date, activity.start_time))
+    live_hub.publish("activity", "updated", **_event(db, activity))
     return activity
 
+# ✅ Change a recurring Activity from a date on ("from now on"); earlier occurrences keep the old values
+@router.put("/{activity_id}/series", response_model=ActivityResponse)
+def update_series_from(
+    activity_id: int,
+    activity_in: ActivityUpdate,
+    day: date = Query(..., alias="from"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    if current_user.role not in ("admin", "staff"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    activity = db.query(Activity).filter(Activity.id == activity_id).first()
+    if not activity:
+        raise HTTPException(status_code=404, detail="Activity not found")
+    if activity.recurrence_rule is None:
+        raise HTTPException(status_code=400, detail="Activity is not recurring")
+
+    series = split_series(db, activity, day, activity_in.model_dump(exclude_unset=True))
+    db.commit()
+    invalidate_dashboard()
+    db.refresh(series)
+    typeahead_index.upsert(activity_entry(series.id, series.title, series.scheduled_date, series.start_time))
+    live_hub.publish("activity", "series_split", **_event(db, series), split_from=activity_id)
+    return series
+
+# ✅ Change one occurrence of a recurring Activity (restores it if cancelled)
+@router.put("/{activity_id}/occurrences/{day}", response_model=ActivityOccurrence)
+def update_occurrence(
+    activity_id: int,
+    day: date,
+    occurrence_in: OccurrenceUpdate,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    if current_user.role not in ("admin", "staff"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    activity = db.query(Activity).filter(Activity.id == activity_id).first()
+    if not activity:
+        raise HTTPException(status_code=404, detail="Activity not found")
+
+    exception = save_exception(db, activity, day, occurrence_in.model_dump(exclude_unset=True), cancelled=False)
+    db.commit()
+    invalidate_dashboard()
+    occurrence = Occurrence(activity, day, exception)
+    live_hub.publish("activity", "occurrence_updated", **_event(db, occurrence, ActivityOccurrence))
+    return occurrence
+
+# ✅ Cancel one occurrence of a recurring Activity
+@router.delete("/{activity_id}/occurrences/{day}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_occurrence(
+    activity_id: int,
+    day: date,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    if current_user.role not in ("admin", "staff"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    activity = db.query(Activity).filter(Activity.id == activity_id).first()
+    if not activity:
+        raise HTTPException(status_code=404, detail="Activity not found")
+
+    save_exception(db, activity, day, {}, cancelled=True)
+    db.commit()
+    invalidate_dashboard()
+    live_hub.publish("activity", "occurrence_cancelled", **_event(db, Occurrence(activity, day), ActivityOccurrence))
+
 # ✅ Delete Activity
 @router.delete("/{activity_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_activity(activity_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
@@ -62,6 +223,10 @@ def delete_activity(activity_id: int, db: Session = Depends(get_db), current_use
     if not activity:
         raise HTTPException(status_code=404, detail="Activity not found")
 
+    event = _event(db, activity)
     db.delete(activity)
     db.commit()
+    invalidate_dashboard()
+    typeahead_index.delete("activity", activity_id)
+    live_hub.publish("activity", "deleted", **event)
     return {"detail": "Activity deleted successfully"}
@@ -1,13 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Union
+from datetime import date
+from app.database import get_db, read_engine
 from app.models.attendance import Attendance
-from app.models.child import Child
-from app.schemas.attendance_schema import AttendanceCreate, AttendanceUpdate, AttendanceResponse
-from app.routers.deps import get_current_user
+from app.schemas.attendance_schema import (
+    AttendanceCreate,
+    AttendanceUpdate,
+    AttendanceResponse,
+    AttendanceBulkResponse,
+)
+from app.crud.attendance import is_duplicate_attendance, lock_children, upsert_attendance
+from app.crud.attendance_summary import SummaryDelta, attendance_statuses
+from app.crud.export import export_response
+from app.schemas.page_schema import Page
+from app.pagination import keyset_page, MAX_PAGE_LIMIT
+from app.crud.dashboard import invalidate_dashboard
+from app.live import live_hub
+from app.routers.deps import get_current_user, DBRoute, conditional_get
 
-router = APIRouter(prefix="/attendance", tags=["attendance"])
+router = APIRouter(prefix="/attendance", tags=["attendance"], route_class=DBRoute)
+
+# Conditional GET: ETag / Last-Modified from the version counters of these tables
+attendance_versions = Depends(conditional_get("attendance",))
+
+MAX_BULK_ENTRIES = 5000
+
+
+def _publish(action: str, data: dict):
+    # Live feed (/live): after the commit, so subscribers never see a rolled back write
+    live_hub.publish("attendance", action, data, child_id=data["child_id"])
+
+
+def _action(before: dict, att: Attendance, default: str) -> str:
+    # check_in / check_out when that time was just recorded
+    if att.check_out is not None and before.get("check_out") is None:
+        return "check_out"
+    if att.check_in is not None and before.get("check_in") is None:
+        return "check_in"
+    return default
+
+
+def _lock_attendance(db: Session, attendance_id: int) -> Attendance:
+    # Latest version of the row, locked until the commit (404 if deleted meanwhile)
+    att = db.query(Attendance).filter(Attendance.id == attendance_id).populate_existing().with_for_update().first()
+    if not att:
+        raise HTTPException(status_code=404, detail="Attendance not found")
+    return att
+
+
+def _dump(att: Attendance) -> dict:
+    return AttendanceResponse.model_validate(att).model_dump(mode="json")
 
 # ✅ Create
 @router.post("/", response_model=AttendanceResponse)
@@ -15,25 +60,136 @@ def create_attendance(att_in: AttendanceCreate, db: Session = Depends(get_db), c
     if current_user.role not in ("admin", "staff"):
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    child = db.query(Child).filter(Child.id == att_in.child_id).first()
-    if not child:
+    if not lock_children(db, [att_in.child_id]):
         raise HTTPException(status_code=404, detail="Child not found")
 
     att = Attendance(**att_in.model_dump())
     db.add(att)
-    db.commit()
+    delta = SummaryDelta()
+    delta.add(att.child_id, att.date, att.status)
+    delta.apply(db)
+    try:
+        db.commit()
+        invalidate_dashboard()
+    except IntegrityError as e:
+        db.rollback()
+        if not is_duplicate_attendance(e):
+            raise
+        raise HTTPException(status_code=400, detail="Attendance already recorded for this child and date")
     db.refresh(att)
+    _publish(_action({}, att, "created"), _dump(att))
     return att
 
 
-# ✅ List all
-@router.get("/", response_model=List[AttendanceResponse])
-def list_attendance(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    return db.query(Attendance).all()
+# ✅ Bulk roll-call: upsert a whole room in one request
+@router.post("/bulk", response_model=AttendanceBulkResponse)
+def bulk_upsert_attendance(
+    entries: List[AttendanceCreate],
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    if current_user.role not in ("admin", "staff"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    if len(entries) > MAX_BULK_ENTRIES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ENTRIES} entries per request")
+
+    # Locked until the commit: the previous statuses read below can't change under us
+    known_children = lock_children(db, (e.child_id for e in entries))
+
+    results = [
+        {"index": i, "child_id": e.child_id, "date": e.date, "ok": False}
+        for i, e in enumerate(entries)
+    ]
+
+    # Last entry wins when the same child/date appears more than once
+    latest = {}
+    for i, e in enumerate(entries):
+        if e.child_id not in known_children:
+            results[i]["error"] = "Child not found"
+            continue
+        key = (e.child_id, e.date)
+        if key in latest:
+            results[latest[key]]["error"] = "Superseded by a later entry for the same child and date"
+        latest[key] = i
+
+    indexes = list(latest.values())
+    if indexes:
+        rows = [entries[i].model_dump() for i in indexes]
+        # Upserts may overwrite an existing row's status: move its count over
+        previous = attendance_statuses(db, latest)
+        delta = SummaryDelta()
+        for row in rows:
+            key = (row["child_id"], row["date"])
+            if key in previous:
+                delta.remove(*key, previous[key])
+            delta.add(*key, row["status"])
+        ids = upsert_attendance(db, rows)
+        delta.apply(db)
+        db.commit()
+        invalidate_dashboard()
+        for i, att_id in zip(indexes, ids):
+            results[i]["ok"] = True
+            results[i]["id"] = att_id
+            _publish("saved", AttendanceResponse(id=att_id, **entries[i].model_dump()).model_dump(mode="json"))
+
+    saved = len(indexes)
+    return {"saved": saved, "failed": len(entries) - saved, "results": results}
+
+
+# ✅ List all (pass cursor/limit for keyset pages ordered by (date, id))
+@router.get("/", response_model=Union[List[AttendanceResponse], Page[AttendanceResponse]], dependencies=[attendance_versions])
+def list_attendance(
+    child_id: Optional[int] = None,
+    status: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    query = db.query(Attendance)
+    if child_id is not None:
+        query = query.filter(Attendance.child_id == child_id)
+    if status:
+        query = query.filter(Attendance.status == status)
+    if date_from:
+        query = query.filter(Attendance.date >= date_from)
+    if date_to:
+        query = query.filter(Attendance.date <= date_to)
+
+    if cursor is None and limit is None:
+        return query.all()
+    return keyset_page(query, [Attendance.date, Attendance.id], cursor, limit)
+
+
+# ✅ Export (streamed CSV/NDJSON for audits; optional gzip)
+@router.get("/export")
+def export_attendance(
+    request: Request,
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    child_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user=Depends(get_current_user),
+):
+    if current_user.role not in ("admin", "staff"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    table = Attendance.__table__
+    stmt = select(table).order_by(table.c.date, table.c.id)
+    if child_id is not None:
+        stmt = stmt.where(table.c.child_id == child_id)
+    if date_from:
+        stmt = stmt.where(table.c.date >= date_from)
+    if date_to:
+        stmt = stmt.where(table.c.date <= date_to)
+    return export_response(stmt, "attendance", fmt, gzip, bind=read_engine(request, current_user.id))
 
 
 # ✅ Get one
-@router.get("/{attendance_id}", response_model=AttendanceResponse)
+@router.get("/{attendance_id}", response_model=AttendanceResponse, dependencies=[attendance_versions])
 def get_attendance(attendance_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
     att = db.query(Attendance).filter(Attendance.id == attendance_id).first()
     if not att:
@@ -51,16 +207,30 @@ def update_attendance(attendance_id: int, att_update: AttendanceUpdate, db: Sess
     if not att:
         raise HTTPException(status_code=404, detail="Attendance not found")
 
-    if att_update.child_id:
-        child = db.query(Child).filter(Child.id == att_update.child_id).first()
-        if not child:
-            raise HTTPException(status_code=404, detail="Child not found")
+    locked = lock_children(db, [att.child_id, att_update.child_id])
+    if att_update.child_id and att_update.child_id not in locked:
+        raise HTTPException(status_code=404, detail="Child not found")
+    # Re-read under the lock: the status removed from the summaries is the one overwritten
+    att = _lock_attendance(db, attendance_id)
 
+    before = {"check_in": att.check_in, "check_out": att.check_out}
+    delta = SummaryDelta()
+    delta.remove(att.child_id, att.date, att.status)
     for key, value in att_update.model_dump(exclude_unset=True).items():
         setattr(att, key, value)
+    delta.add(att.child_id, att.date, att.status)
+    delta.apply(db)
 
-    db.commit()
+    try:
+        db.commit()
+        invalidate_dashboard()
+    except IntegrityError as e:
+        db.rollback()
+        if not is_duplicate_attendance(e):
+            raise
+        raise HTTPException(status_code=400, detail="Attendance already recorded for this child and date")
     db.refresh(att)
+    _publish(_action(before, att, "updated"), _dump(att))
     return att
 
 
@@ -74,6 +244,14 @@ def delete_attendance(attendance_id: int, db: Session = Depends(get_db), current
     if not att:
         raise HTTPException(status_code=404, detail="Attendance not found")
 
+    lock_children(db, [att.child_id])
+    att = _lock_attendance(db, attendance_id)
+    data = _dump(att)
+    delta = SummaryDelta()
+    delta.remove(att.child_id, att.date, att.status)
+    delta.apply(db)
     db.delete(att)
     db.commit()
+    invalidate_dashboard()
+    _publish("deleted", data)
     return {"message": "Attendance deleted successfully"}
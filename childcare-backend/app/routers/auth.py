@@ -1,17 +1,23 @@
 # app/routers/auth.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from datetime import timedelta
+from typing import Optional, Union
 from app.database import get_db
 from app.schemas.user_schema import UserCreate, UserResponse, UserLogin, UserUpdate
 from app.models.user import User
 from app.models.staff import Staff
 from app.utils import get_password_hash, verify_password, create_access_token
-from app.routers.deps import get_current_user
+from app.password_pool import password_pool
+from app.schemas.page_schema import Page
+from app.pagination import keyset_page, MAX_PAGE_LIMIT
+from app.crud.dashboard import invalidate_dashboard
+from app.typeahead import typeahead_index, user_entry
+from app.routers.deps import get_current_user, DBRoute, invalidate_principal, principal_cache
 from pydantic import BaseModel
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=DBRoute)
 
 # --- Token response schema ---
 class TokenResponse(BaseModel):
@@ -34,6 +40,7 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
     db.add(user)
     db.commit()
     db.refresh(user)
+    typeahead_index.upsert(user_entry(user.id, user.name, user.email, user.role, None))
     
     # Auto-create staff entry if role is "staff"
     if user.role == "staff":
@@ -49,6 +56,8 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
             )
             db.add(staff)
             db.commit()
+            invalidate_dashboard()
+            typeahead_index.set_staff(user.id, staff.id)
     
     return user
 
@@ -93,6 +102,9 @@ def update_user(user_id: int, user_in: UserUpdate, db: Session = Depends(get_db)
 
     db.commit()
     db.refresh(user)
+    invalidate_principal(user.id)
+    staff_id = db.query(Staff.id).filter(Staff.user_id == user.id).scalar()
+    typeahead_index.upsert(user_entry(user.id, user.name, user.email, user.role, staff_id))
     
     # Auto-create staff entry if role was changed to "staff"
     if role_changed_to_staff:
@@ -107,6 +119,8 @@ def update_user(user_id: int, user_in: UserUpdate, db: Session = Depends(get_db)
             )
             db.add(staff)
             db.commit()
+            invalidate_dashboard()
+            typeahead_index.set_staff(user.id, staff.id)
     
     return user
 
@@ -128,6 +142,9 @@ def delete_user(user_id: int, db: Session = Depends(get_db), current_user: User
     try:
         db.delete(user)
         db.commit()
+        invalidate_dashboard()
+        invalidate_principal(user_id)
+        typeahead_index.delete("user", user_id)
         return {"detail": "User deleted successfully"}
     except IntegrityError as e:
         db.rollback()
@@ -151,17 +168,40 @@ def delete_user(user_id: int, db: Session = Depends(get_db), current_user: User
             detail=f"Failed to delete user: {error_msg}"
         )
 
-# --- List all users (admin only) ---
-@router.get("/", response_model=list[UserResponse])
+# --- List all users (admin only; pass cursor/limit for keyset pages ordered by id) ---
+@router.get("/", response_model=Union[list[UserResponse], Page[UserResponse]])
 def list_users(
+    role: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admin can view all users")
 
-    users = db.query(User).all()
-    return users
+    query = db.query(User)
+    if role:
+        query = query.filter(User.role == role)
+
+    if cursor is None and limit is None:
+        users = query.all()
+        return users
+    return keyset_page(query, [User.id], cursor, limit)
+
+# --- Password hashing pool metrics (admin only) ---
+@router.get("/password-pool")
+def get_password_pool_stats(current_user: User = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can view pool metrics")
+    return password_pool.stats()
+
+# --- Principal cache metrics (admin only) ---
+@router.get("/principal-cache")
+def get_principal_cache_stats(current_user: User = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can view cache metrics")
+    return principal_cache.stats()
 
 # --- List users eligible to become staff ---
 @router.get("/available-staff-users", response_model=list[UserResponse])
@@ -204,6 +244,7 @@ def change_password(
     # Update new password
     user.password_hash = get_password_hash(data.new_password)
     db.commit()
+    invalidate_principal(user.id)
     return {"detail": "Password updated successfully"}
 
 
@@ -229,4 +270,5 @@ def admin_change_password(
 
     user.password_hash = get_password_hash(data.new_password)
     db.commit()
+    invalidate_principal(user.id)
     return {"detail": f"Password reset for {user.email}"}
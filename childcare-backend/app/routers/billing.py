@@ -1,13 +1,33 @@
 # app/routers/billing.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select, or_
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional, Union
+from datetime import date
+from decimal import Decimal
+from app.database import get_db, read_engine
 from app.models.billing import Billing
-from app.schemas.billing_schema import BillingCreate, BillingResponse
-from app.routers.deps import get_current_user
+from app.models.receivable import Receivable
+from app.schemas.billing_schema import (
+    BillingCreate,
+    BillingResponse,
+    BillingRunRequest,
+    BillingRunResponse,
+    ReceivableResponse,
+    ReceivablesAgingResponse,
+)
+from app.crud.billing_run import run_billing
+from app.crud.receivables import refresh_receivables, age_receivables, AGING_BUCKETS
+from app.crud.export import export_response
+from app.schemas.page_schema import Page
+from app.pagination import keyset_page, MAX_PAGE_LIMIT
+from app.crud.dashboard import invalidate_dashboard
+from app.routers.deps import get_current_user, DBRoute, conditional_get
 
-router = APIRouter(prefix="/billing", tags=["billing"])
+router = APIRouter(prefix="/billing", tags=["billing"], route_class=DBRoute)
+
+# Conditional GET: ETag / Last-Modified from the version counters of these tables
+billing_versions = Depends(conditional_get("billing",))
 
 # ✅ Create a billing record
 @router.post("/", response_model=BillingResponse)
@@ -20,20 +40,131 @@ def create_billing(
         raise HTTPException(status_code=403, detail="Not enough permissions")
     billing = Billing(**billing_in.model_dump())
     db.add(billing)
+    db.flush()
+    refresh_receivables(db, [billing.child_id])
     db.commit()
+    invalidate_dashboard()
     db.refresh(billing)
     return billing
 
-# ✅ List all billing records
-@router.get("/", response_model=List[BillingResponse])
+# ✅ Generate a month of invoices from attendance (admin only)
+@router.post("/runs", response_model=BillingRunResponse)
+def create_billing_run(
+    run_in: BillingRunRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can run billing")
+
+    result = run_billing(
+        db,
+        run_in.period,
+        run_in.fees,
+        run_in.due_in_days,
+        child_ids=run_in.child_ids,
+        dry_run=run_in.dry_run,
+    )
+    if not run_in.dry_run:
+        db.commit()
+        invalidate_dashboard()
+    return result
+
+# ✅ List all billing records (pass cursor/limit for keyset pages ordered by (due_date, id))
+@router.get("/", response_model=Union[List[BillingResponse], Page[BillingResponse]], dependencies=[billing_versions])
 def list_billing(
+    child_id: Optional[int] = None,
+    status: Optional[str] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    return db.query(Billing).all()
+    query = db.query(Billing)
+    if child_id is not None:
+        query = query.filter(Billing.child_id == child_id)
+    if status:
+        query = query.filter(Billing.status == status)
+    if due_from:
+        query = query.filter(Billing.due_date >= due_from)
+    if due_to:
+        query = query.filter(Billing.due_date <= due_to)
+
+    if cursor is None and limit is None:
+        return query.all()
+    return keyset_page(query, [Billing.due_date, Billing.id], cursor, limit)
+
+# ✅ Export billing records (streamed CSV/NDJSON for accounting; filtered by issued date)
+@router.get("/export")
+def export_billing(
+    request: Request,
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    child_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user=Depends(get_current_user)
+):
+    if current_user.role not in ("admin", "staff"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    table = Billing.__table__
+    stmt = select(table).order_by(table.c.id)
+    if child_id is not None:
+        stmt = stmt.where(table.c.child_id == child_id)
+    if date_from:
+        stmt = stmt.where(table.c.issued_date >= date_from)
+    if date_to:
+        stmt = stmt.where(table.c.issued_date <= date_to)
+    return export_response(stmt, "billing", fmt, gzip, bind=read_engine(request, current_user.id))
+
+# ✅ Receivables: who owes what and how overdue (precomputed ledger, keyset pages by child_id)
+@router.get("/receivables", response_model=Union[List[ReceivableResponse], Page[ReceivableResponse]])
+def list_receivables(
+    child_id: Optional[int] = None,
+    min_balance: Optional[Decimal] = None,
+    past_due_over: Optional[int] = Query(None, description="30, 60 or 90: only children with money more than this many days past due"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    if current_user.role not in ("admin", "staff"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    query = db.query(Receivable)
+    if child_id is not None:
+        query = query.filter(Receivable.child_id == child_id)
+    if min_balance is not None:
+        query = query.filter(Receivable.balance >= min_balance)
+    if past_due_over is not None:
+        if past_due_over not in AGING_BUCKETS or past_due_over == 0:
+            raise HTTPException(status_code=400, detail="past_due_over must be 30, 60 or 90")
+        columns = [getattr(Receivable, name) for days, name in AGING_BUCKETS.items() if days >= past_due_over]
+        query = query.filter(or_(*(col > 0 for col in columns)))
+
+    if cursor is None and limit is None:
+        return query.order_by(Receivable.child_id).all()
+    return keyset_page(query, [Receivable.child_id], cursor, limit)
+
+# ✅ Daily aging job: Unpaid -> Overdue past due_date, then re-age the ledger (admin only)
+@router.post("/receivables/age", response_model=ReceivablesAgingResponse)
+def run_receivables_aging(
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can run receivables aging")
+
+    result = age_receivables(db)
+    db.commit()
+    invalidate_dashboard()
+    return result
 
 # ✅ Get a single billing record by ID
-@router.get("/{billing_id}", response_model=BillingResponse)
+@router.get("/{billing_id}", response_model=BillingResponse, dependencies=[billing_versions])
 def get_billing(
     billing_id: int,
     db: Session = Depends(get_db),
@@ -59,10 +190,14 @@ def update_billing(
     if not billing:
         raise HTTPException(status_code=404, detail="Billing record not found")
 
+    old_child_id = billing.child_id
     for key, value in billing_in.model_dump().items():
         setattr(billing, key, value)
+    db.flush()
+    refresh_receivables(db, [old_child_id, billing.child_id])
 
     db.commit()
+    invalidate_dashboard()
     db.refresh(billing)
     return billing
 
@@ -81,5 +216,8 @@ def delete_billing(
         raise HTTPException(status_code=404, detail="Billing record not found")
 
     db.delete(billing)
+    db.flush()
+    refresh_receivables(db, [billing.child_id])
     db.commit()
+    invalidate_dashboard()
     return {"detail": "Billing record deleted successfully"}
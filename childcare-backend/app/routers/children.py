@@ -1,13 +1,23 @@
 # app/routers/children.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional, Union
 from app.database import get_db
 from app.models.child import Child
-from app.schemas.child_schema import ChildCreate, ChildUpdate, ChildResponse
-from app.routers.deps import get_current_user
+from app.schemas.child_schema import ChildCreate, ChildUpdate, ChildResponse, ChildSummary
+from app.crud.child import parse_includes, child_summary_query, child_summary
+from app.crud.attendance_summary import remove_child_summaries
+from app.crud.receivables import refresh_receivables
+from app.schemas.page_schema import Page
+from app.pagination import keyset_page, MAX_PAGE_LIMIT
+from app.crud.dashboard import invalidate_dashboard
+from app.typeahead import typeahead_index, child_entry
+from app.routers.deps import get_current_user, DBRoute, conditional_get
 
-router = APIRouter(prefix="/children", tags=["children"])
+router = APIRouter(prefix="/children", tags=["children"], route_class=DBRoute)
+
+# Conditional GET: ETag / Last-Modified from the version counters of these tables
+child_versions = Depends(conditional_get("children", "attendance", "health_records", "billing"))
 
 # ✅ Create
 @router.post("/", response_model=ChildResponse)
@@ -22,29 +32,59 @@ def create_child(
     child = Child(**child_in.model_dump())
     db.add(child)
     db.commit()
+    invalidate_dashboard()
     db.refresh(child)
+    typeahead_index.upsert(child_entry(child.id, child.name, child.parent_name))
     return child
 
 
 # ✅ Read all
-@router.get("/", response_model=List[ChildResponse])
+# Returns ChildSummary rows (counts instead of full history); use
+# ?include=attendance,health_records,billing to expand related lists.
+# Pass cursor/limit for keyset pages ordered by (name, id); `skip` keeps the
+# legacy offset listing for older clients.
+@router.get(
+    "/",
+    response_model=Union[List[ChildSummary], Page[ChildSummary]],
+    response_model_exclude_unset=True,
+    dependencies=[child_versions],
+)
 def list_children(
-    skip: int = 0,
-    limit: int = 100,
+    include: Optional[str] = None,
+    skip: Optional[int] = Query(None, ge=0),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    return db.query(Child).offset(skip).limit(limit).all()
+    includes = parse_includes(include)
+    query = child_summary_query(db, includes)
+    if skip is not None or (cursor is None and limit is None):
+        children = query.order_by(Child.id).offset(skip or 0).limit(limit or 100).all()
+        return [child_summary(child, includes) for child in children]
+
+    page = keyset_page(query, [Child.name, Child.id], cursor, limit)
+    page["items"] = [child_summary(child, includes) for child in page["items"]]
+    return page
 
 
 # ✅ Read one
-@router.get("/{child_id}", response_model=ChildResponse)
+@router.get("/{child_id}", response_model=ChildResponse, dependencies=[child_versions])
 def get_child(
     child_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    child = db.query(Child).filter(Child.id == child_id).first()
+    child = (
+        db.query(Child)
+        .options(
+            selectinload(Child.attendance_records),
+            selectinload(Child.health_records),
+            selectinload(Child.billings),
+        )
+        .filter(Child.id == child_id)
+        .first()
+    )
     if not child:
         raise HTTPException(status_code=404, detail="Child not found")
     return child
@@ -70,6 +110,7 @@ def update_child(
 
     db.commit()
     db.refresh(child)
+    typeahead_index.upsert(child_entry(child.id, child.name, child.parent_name))
     return child
 
 
@@ -87,6 +128,11 @@ def delete_child(
     if not child:
         raise HTTPException(status_code=404, detail="Child not found")
 
+    remove_child_summaries(db, child_id)
     db.delete(child)
+    db.flush()
+    refresh_receivables(db, [child_id])
     db.commit()
+    invalidate_dashboard()
+    typeahead_index.delete("child", child_id)
     return {"detail": "Child deleted successfully"}
@@ -0,0 +1,31 @@
+# app/routers/dashboard.py
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import date
+from app.database import get_db
+from app.schemas.dashboard_schema import DashboardResponse
+from app.crud.dashboard import dashboard_cache, dashboard_metrics
+from app.routers.deps import get_current_user, DBRoute
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"], route_class=DBRoute)
+
+# ✅ All headline metrics in one request (cached for DASHBOARD_CACHE_TTL seconds)
+@router.get("", response_model=DashboardResponse)
+def get_dashboard(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    if current_user.role not in ("admin", "staff"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    today = date.today()
+    metrics = dashboard_cache.get(today.isoformat())
+    if metrics is None:
+        metrics = DashboardResponse.model_validate(dashboard_metrics(db, today)).model_dump(mode="json")
+        dashboard_cache.set(today.isoformat(), metrics)
+    return metrics
+
+
+# ✅ Cache metrics (admin only)
+@router.get("/cache")
+def get_dashboard_cache_stats(current_user=Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can view cache metrics")
+    return dashboard_cache.stats()
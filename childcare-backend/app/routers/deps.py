@@ -1,14 +1,34 @@
+import hashlib
+import inspect
+from email.utils import formatdate
 from jose import jwt, JWTError
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import SessionLocal, get_db, run_in_greenlet, primary_session, ASYNC_DB
 from app.models.user import User
+from app.schemas.user_schema import UserResponse
+from app.cache import make_cache
 from app.config import settings
+from app.versions import table_versions, version_feed
+from app.serialization import get_adapter, json_renderer, json_endpoint
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+# user id -> {id, name, email, role}; invalidated by the auth router on user changes
+principal_cache = make_cache(
+    "principal",
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    url=settings.CACHE_REDIS_URL,
+)
+
+def invalidate_principal(user_id: int):
+    principal_cache.delete(int(user_id))
+
+def authenticate(token: str, db: Session) -> UserResponse:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -21,7 +41,141 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
-        raise credentials_exception
-    return user
\ No newline at end of file
+
+    # Cached principal avoids a users lookup on every authenticated request
+    principal = principal_cache.get(int(user_id))
+    if principal is None:
+        user = db.query(User).filter(User.id == int(user_id)).first()
+        if not user and db.info.get("replica"):
+            # Just registered: the replica may not have the row yet
+            with primary_session() as primary:
+                user = primary.query(User).filter(User.id == int(user_id)).first()
+        if not user:
+            raise credentials_exception
+        principal = {"id": user.id, "name": user.name, "email": user.email, "role": user.role}
+        principal_cache.set(user.id, principal)
+    return UserResponse.model_construct(**principal)
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> UserResponse:
+    return authenticate(token, db)
+
+if ASYNC_DB:
+    get_current_user = run_in_greenlet(get_current_user)
+
+def principal_from_token(token: str) -> UserResponse:
+    """
+    Authenticate a long-lived connection (WebSocket / SSE) that holds no
+    request session: the principal cache, else one lookup on the primary.
+    Blocking; run it in a thread.
+    """
+    with SessionLocal() as db:
+        return authenticate(token, db)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2), as allowed for GET
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def conditional_get(*tables: str):
+    """
+    Dependency for GET handlers whose response only changes when `tables`
+    are written. Sets a strong ETag and Last-Modified from the table version
+    counters (one primary-key lookup, on the same database the handler
+    reads) and answers If-None-Match with a 304 before the handler runs
+    its query.
+
+    While the version feed follows the primary (app/versions.py), an
+    If-None-Match naming the primary's current versions gets the 304
+    without any query; the database is only read on a miss. This worker's
+    own writes are never missed; another worker's count once their
+    notification arrives, milliseconds after the commit.
+
+    The ETag also covers the caller (id, role, name): several routes show
+    each user a different subset, and a shared device must not revalidate
+    one user's cached body for another. If-Modified-Since can't say whose
+    copy it is, so it is not answered with a 304.
+
+    On a replica the versions come from the replica's own table_versions,
+    replicated in the same transactions as the rows: a lagging replica
+    serves an older body under that older version's ETag, never a stale
+    body under a newer one (a client already holding the primary's current
+    versions gets its 304 from the feed). Lag needs no special case here
+    (read-your-writes is REPLICA_READ_YOUR_WRITES_SECONDS in app/config.py).
+    """
+
+    def dependency(request: Request, response: Response, current_user=Depends(get_current_user),
+                   db: Session = Depends(get_db)):
+        principal = f"{current_user.id}:{current_user.role}:{current_user.name}".encode()
+        scope = hashlib.blake2b(principal, digest_size=6).hexdigest()
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # The primary's latest versions: a client holding them has the newest body there is
+            versions = version_feed.current(tables)
+            if versions is not None:
+                etag = '"' + "-".join([scope, *(str(v) for v in versions)]) + '"'
+                if _etag_matches(if_none_match, etag):
+                    raise HTTPException(
+                        status_code=status.HTTP_304_NOT_MODIFIED,
+                        headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+                    )
+
+        versions, modified = table_versions.get(db, tables)
+        etag = '"' + "-".join([scope, *(str(v) for v in versions)]) + '"'
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(modified, usegmt=True),
+            "Cache-Control": "private, no-cache",
+        }
+
+        if if_none_match is not None and _etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    if ASYNC_DB:
+        # The version lookup runs on the async driver, like the handler's queries
+        dependency = run_in_greenlet(dependency)
+    return dependency
+
+
+class DBRoute(APIRoute):
+    """
+    Route class for routers that use get_db.
+
+    With DB_MODE=async every plain `def` handler becomes an `async def` run on
+    the event loop through the greenlet bridge (see run_in_greenlet), and the
+    response model is validated inside that greenlet so lazy loads still work.
+    With DB_MODE=sync routes behave exactly like APIRoute.
+
+    With FAST_JSON, routes with a response model return JSON bytes dumped by
+    a cached TypeAdapter (see app/serialization.py) instead of going through
+    FastAPI's serialization.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        response_model = kwargs.get("response_model")
+        if isinstance(response_model, DefaultPlaceholder):
+            response_model = None
+        render = None
+        # include_router() rebuilds routes from already wrapped endpoints
+        if settings.FAST_JSON and response_model is not None and not getattr(endpoint, "renders_json", False):
+            render = json_renderer(response_model, kwargs)
+
+        if ASYNC_DB and not inspect.iscoroutinefunction(endpoint):
+            after = render
+            if after is None and response_model is not None:
+                adapter = get_adapter(response_model)
+
+                def after(result):
+                    if isinstance(result, Response):
+                        return result
+                    return adapter.validate_python(result, from_attributes=True)
+            endpoint = run_in_greenlet(endpoint, after)
+            if render is not None:
+                # Rendered inside the greenlet already
+                endpoint = json_endpoint(endpoint, status_code=kwargs.get("status_code"))
+        elif render is not None:
+            endpoint = json_endpoint(endpoint, render, status_code=kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
@@ -0,0 +1,37 @@
+# app/routers/health.py
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+from app.database import ASYNC_DB, replica_engine
+from app.db_pool import sync_pool_stats, async_pool_stats, replica_pool_stats, async_replica_pool_stats
+from app.routers.deps import get_current_user, DBRoute
+from app.warmup import warmup_state
+
+router = APIRouter(prefix="/health", tags=["health"], route_class=DBRoute)
+
+# ✅ Liveness: the process is up and serving (no database access)
+@router.get("/live")
+async def live():
+    return {"status": "alive"}
+
+
+# ✅ Readiness: 200 only once the start-up warm-up has finished, else 503
+@router.get("/ready")
+async def ready():
+    report = warmup_state.report()
+    return JSONResponse(report, status_code=200 if report["status"] == "ready" else 503)
+
+
+# ✅ Database connection pool metrics (admin only): checked out, overflow,
+# checkout wait times and timeouts, per engine
+@router.get("/pool")
+def get_pool_stats(current_user=Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can view pool metrics")
+    pools = {"sync": sync_pool_stats.stats()}
+    if ASYNC_DB:
+        pools["async"] = async_pool_stats.stats()
+    if replica_engine is not None:
+        pools["replica"] = replica_pool_stats.stats()
+        if ASYNC_DB:
+            pools["async_replica"] = async_replica_pool_stats.stats()
+    return pools
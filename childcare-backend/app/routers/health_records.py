@@ -1,18 +1,49 @@
 # app/routers/health_records.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional, Union
+from datetime import date
+from app.database import get_db, read_engine
 from app.models.health_record import HealthRecord
 from app.models.child import Child
 from app.schemas.health_record_schema import (
     HealthRecordCreate,
     HealthRecordUpdate,
     HealthRecordResponse,
+    HealthRecordSearchResult,
 )
-from app.routers.deps import get_current_user
+from app.schemas.page_schema import Page
+from app.pagination import keyset_page, MAX_PAGE_LIMIT
+from app.crud.export import export_response
+from app.crud.health_search import search_page
+from app.live import live_hub
+from app.routers.deps import get_current_user, DBRoute, conditional_get
 
-router = APIRouter(prefix="/health-records", tags=["health-records"])
+router = APIRouter(prefix="/health-records", tags=["health-records"], route_class=DBRoute)
+
+# Conditional GET: ETag / Last-Modified from the version counters of these tables
+record_versions = Depends(conditional_get("health_records",))
+
+
+def visibility_filters(current_user) -> list:
+    """
+    Admin → all records, staff → only their own, others → forbidden.
+    """
+    if current_user.role == "staff":
+        return [HealthRecord.doctor_name == current_user.name]
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    return []
+
+
+def _publish(action: str, data: dict):
+    # Live feed (/live): delivered under the same visibility rule, via staff_name
+    live_hub.publish("health_record", action, data, child_id=data["child_id"], staff_name=data["doctor_name"])
+
+
+def _dump(record: HealthRecord) -> dict:
+    return HealthRecordResponse.model_validate(record).model_dump(mode="json")
 
 # ✅ Create
 @router.post("/", response_model=HealthRecordResponse)
@@ -38,31 +69,77 @@ def create_record(
     db.add(record)
     db.commit()
     db.refresh(record)
+    _publish("created", _dump(record))
     return record
 
 
-# ✅ Read all
-@router.get("/", response_model=List[HealthRecordResponse])
+# ✅ Read all (pass cursor/limit for keyset pages ordered by (record_date, id))
+@router.get("/", response_model=Union[List[HealthRecordResponse], Page[HealthRecordResponse]], dependencies=[record_versions])
 def list_records(
+    child_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    query = db.query(HealthRecord)
+    query = db.query(HealthRecord).filter(*visibility_filters(current_user))
 
-    # Admin → sees all records
-    if current_user.role == "admin":
-        return query.all()
+    if child_id is not None:
+        query = query.filter(HealthRecord.child_id == child_id)
+    if date_from:
+        query = query.filter(HealthRecord.record_date >= date_from)
+    if date_to:
+        query = query.filter(HealthRecord.record_date <= date_to)
 
-    # Staff → sees only their own records
-    if current_user.role == "staff":
-        return query.filter(HealthRecord.doctor_name == current_user.name).all()
-
-    # Others → forbidden
-    raise HTTPException(status_code=403, detail="Not enough permissions")
+    if cursor is None and limit is None:
+        return query.all()
+    return keyset_page(query, [HealthRecord.record_date, HealthRecord.id], cursor, limit)
+
+
+# ✅ Export (streamed CSV/NDJSON; same visibility rules as the list)
+@router.get("/export")
+def export_records(
+    request: Request,
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    child_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user=Depends(get_current_user),
+):
+    table = HealthRecord.__table__
+    stmt = select(table).where(*visibility_filters(current_user)).order_by(table.c.record_date, table.c.id)
+
+    if child_id is not None:
+        stmt = stmt.where(table.c.child_id == child_id)
+    if date_from:
+        stmt = stmt.where(table.c.record_date >= date_from)
+    if date_to:
+        stmt = stmt.where(table.c.record_date <= date_to)
+    return export_response(stmt, "health_records", fmt, gzip, bind=read_engine(request, current_user.id))
+
+
+# ✅ Full-text search over description / doctor name, most relevant first
+# (PostgreSQL tsvector + GIN, SQLite FTS5; same visibility rules as the list)
+@router.get("/search", response_model=Page[HealthRecordSearchResult], dependencies=[record_versions])
+def search_records(
+    q: str = Query(..., min_length=1, max_length=200),
+    child_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    filters = visibility_filters(current_user)
+    if child_id is not None:
+        filters.append(HealthRecord.child_id == child_id)
+    return search_page(db, q, filters, cursor, limit)
 
 
 # ✅ Read one
-@router.get("/{record_id}", response_model=HealthRecordResponse)
+@router.get("/{record_id}", response_model=HealthRecordResponse, dependencies=[record_versions])
 def get_record(
     record_id: int,
     db: Session = Depends(get_db),
@@ -107,6 +184,7 @@ def update_record(
 
     db.commit()
     db.refresh(record)
+    _publish("updated", _dump(record))
     return record
 
 
@@ -121,16 +199,20 @@ def delete_record(
     if not record:
         raise HTTPException(status_code=404, detail="Health record not found")
 
+    data = _dump(record)
+
     # Admin can delete any record
     if current_user.role == "admin":
         db.delete(record)
         db.commit()
+        _publish("deleted", data)
         return {"detail": "Health record deleted successfully"}
 
     # Staff can delete only their own records
     if current_user.role == "staff" and record.doctor_name == current_user.name:
         db.delete(record)
         db.commit()
+        _publish("deleted", data)
         return {"detail": "Health record deleted successfully"}
 
     raise HTTPException(status_code=403, detail="Not enough permissions")
@@ -0,0 +1,43 @@
+# app/routers/imports.py
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from app.database import SessionLocal, mark_recent_writer
+from app.crud.importer import run_import, read_rows, IMPORT_KINDS
+from app.crud.dashboard import invalidate_dashboard
+from app.typeahead import typeahead_index
+from app.schemas.import_schema import ImportReport
+from app.routers.deps import get_current_user
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+
+def _import_file(kind: str, fileobj, filename: str, dry_run: bool) -> dict:
+    # Own session on the sync engine: long CPU-bound loads stay in the
+    # threadpool in both DB modes instead of blocking the event loop.
+    db = SessionLocal()
+    try:
+        return run_import(db, kind, read_rows(fileobj, filename), dry_run=dry_run)
+    finally:
+        db.close()
+
+
+# ✅ Import children / staff / attendance from CSV or XLSX (admin only)
+@router.post("/{kind}", response_model=ImportReport)
+async def import_data(
+    kind: str,
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    current_user=Depends(get_current_user),
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can import data")
+    if kind not in IMPORT_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown import kind: {kind}. Allowed: {', '.join(IMPORT_KINDS)}")
+
+    report = await run_in_threadpool(_import_file, kind, file.file, file.filename or "", dry_run)
+    if report["inserted"]:
+        invalidate_dashboard()
+        mark_recent_writer(current_user.id)
+        # Bulk loaded rows aren't applied entry by entry: reload the kind
+        typeahead_index.invalidate(kind)
+    return report
@@ -0,0 +1,126 @@
+# app/routers/live.py
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from app.config import settings
+from app.live import EVENT_TYPES, ROOM_EVENT_TYPES, Subscription, live_hub
+from app.routers.deps import get_current_user, principal_from_token, DBRoute
+
+router = APIRouter(prefix="/live", tags=["live"], route_class=DBRoute)
+
+PING = '{"type":"ping"}'
+
+
+def _event_types(types: Optional[str]):
+    if not types:
+        return None
+    selected = [t.strip() for t in types.split(",") if t.strip()]
+    unknown = [t for t in selected if t not in EVENT_TYPES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown event types: {', '.join(unknown)}")
+    return selected
+
+
+def _check_rooms(types: Optional[list], child_id, room):
+    # A room-only filter on attendance / health records would never match: they carry no room
+    if not room or child_id or types is None:
+        return
+    roomless = [t for t in types if t not in ROOM_EVENT_TYPES]
+    if roomless:
+        raise HTTPException(
+            status_code=400,
+            detail=f"room= only filters {', '.join(ROOM_EVENT_TYPES)} events, not {', '.join(roomless)}; use child_id=",
+        )
+
+
+async def _subscribe(token: Optional[str], types, child_id, room) -> Subscription:
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    principal = await asyncio.to_thread(principal_from_token, token)
+    if principal.role not in ("admin", "staff"):
+        raise HTTPException(status_code=403, detail="Only admin or staff can follow the live feed")
+    selected = _event_types(types)
+    _check_rooms(selected, child_id, room)
+    return live_hub.subscribe(Subscription(principal, selected, child_id, room, settings.LIVE_QUEUE_SIZE))
+
+
+async def _wait_disconnect(websocket: WebSocket):
+    # Clients only listen; anything they send is ignored
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+# ✅ Live attendance / activity / health record events over a WebSocket
+# (browsers can't set headers on WebSockets: the token goes in the query string)
+@router.websocket("/ws")
+async def live_ws(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    types: Optional[str] = Query(None, description="Comma-separated: attendance,activity,health_record (default all)"),
+    child_id: List[int] = Query([]),
+    room: List[str] = Query([], description="Activity events of these rooms (attendance and health records have no room)"),
+):
+    try:
+        subscription = await _subscribe(token, types, child_id, room)
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+    disconnected = None
+    try:
+        await websocket.accept()
+        disconnected = asyncio.ensure_future(_wait_disconnect(websocket))
+        while True:
+            message = asyncio.ensure_future(subscription.next(settings.LIVE_HEARTBEAT))
+            await asyncio.wait({message, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                message.cancel()
+                break
+            await websocket.send_text(message.result() or PING)
+    except (WebSocketDisconnect, ConnectionError):
+        pass  # client gone mid-send
+    finally:
+        live_hub.unsubscribe(subscription)
+        if disconnected is not None:
+            disconnected.cancel()
+
+
+# ✅ The same feed as Server-Sent Events, for EventSource clients.
+# Token from the Authorization header, or ?token= (EventSource can't set headers).
+@router.get("/events")
+async def live_events(
+    request: Request,
+    token: Optional[str] = Query(None),
+    types: Optional[str] = Query(None, description="Comma-separated: attendance,activity,health_record (default all)"),
+    child_id: List[int] = Query([]),
+    room: List[str] = Query([], description="Activity events of these rooms (attendance and health records have no room)"),
+):
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    subscription = await _subscribe(token, types, child_id, room)
+
+    async def stream():
+        try:
+            # Reconnect after 3s; the client should refetch what it shows then
+            yield "retry: 3000\n\n"
+            while True:
+                message = await subscription.next(settings.LIVE_HEARTBEAT)
+                yield f"data: {message}\n\n" if message is not None else ": ping\n\n"
+        finally:
+            live_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        # No proxy buffering (nginx) or caching of the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ✅ Live feed subscribers and event counters (admin only)
+@router.get("/stats")
+def live_stats(current_user=Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can view live metrics")
+    return live_hub.stats()
@@ -0,0 +1,46 @@
+# app/routers/metrics.py
+import secrets
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from app.config import settings
+from app.database import ASYNC_DB, replica_engine
+from app.db_pool import sync_pool_stats, async_pool_stats, replica_pool_stats, async_replica_pool_stats
+from app.metrics import request_metrics
+
+router = APIRouter(tags=["metrics"])
+
+POOL_GAUGES = (
+    ("db_pool_checked_out", "gauge", "checked_out", "Connections currently checked out"),
+    ("db_pool_idle", "gauge", "idle", "Idle connections in the pool"),
+    ("db_pool_overflow", "gauge", "overflow", "Connections opened beyond pool_size"),
+    ("db_pool_timeouts_total", "counter", "timeouts", "Checkouts that timed out waiting for a connection"),
+    ("db_pool_connects_total", "counter", "connects", "Connections opened"),
+)
+
+
+def _pool_lines() -> list:
+    pools = {"sync": sync_pool_stats}
+    if ASYNC_DB:
+        pools["async"] = async_pool_stats
+    if replica_engine is not None:
+        pools["replica"] = replica_pool_stats
+        if ASYNC_DB:
+            pools["async_replica"] = async_replica_pool_stats
+    stats = {name: pool.stats() for name, pool in pools.items()}
+    lines = []
+    for metric, kind, key, help_text in POOL_GAUGES:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{pool="{name}"}} {values[key]}' for name, values in stats.items()]
+    return lines
+
+
+# ✅ Prometheus scrape endpoint: per-route requests, latency, response size and
+# SQL statements per request, plus connection pool gauges
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(request: Request):
+    if settings.METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        if not secrets.compare_digest(supplied, settings.METRICS_TOKEN):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    lines = request_metrics.render() + _pool_lines()
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
@@ -0,0 +1,84 @@
+# app/routers/reports.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional, Union
+from datetime import date
+from app.database import get_db
+from app.models.attendance_summary import AttendanceMonthlySummary, AttendanceDailySummary
+from app.schemas.attendance_schema import AttendanceMonthlyReport, AttendanceDailyReport, AttendanceSummaryRebuild
+from app.crud.attendance_summary import rebuild_summaries
+from app.crud.billing_run import period_bounds
+from app.schemas.page_schema import Page
+from app.pagination import keyset_page, MAX_PAGE_LIMIT
+from app.crud.dashboard import invalidate_dashboard
+from app.routers.deps import get_current_user, DBRoute
+
+router = APIRouter(prefix="/reports", tags=["reports"], route_class=DBRoute)
+
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"  # "YYYY-MM"
+
+# ✅ Monthly attendance per child (read from the summary table, never the raw rows)
+@router.get(
+    "/attendance/monthly",
+    response_model=Union[List[AttendanceMonthlyReport], Page[AttendanceMonthlyReport]],
+)
+def monthly_attendance_report(
+    month_from: Optional[str] = Query(None, pattern=MONTH_PATTERN),
+    month_to: Optional[str] = Query(None, pattern=MONTH_PATTERN),
+    child_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    if current_user.role not in ("admin", "staff"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    query = db.query(AttendanceMonthlySummary)
+    if month_from:
+        query = query.filter(AttendanceMonthlySummary.month >= period_bounds(month_from)[0])
+    if month_to:
+        query = query.filter(AttendanceMonthlySummary.month <= period_bounds(month_to)[0])
+    if child_id is not None:
+        query = query.filter(AttendanceMonthlySummary.child_id == child_id)
+
+    keys = [AttendanceMonthlySummary.month, AttendanceMonthlySummary.child_id]
+    if cursor is None and limit is None:
+        return query.order_by(*keys).all()
+    return keyset_page(query, keys, cursor, limit)
+
+
+# ✅ Daily headcount for the whole center
+@router.get("/attendance/daily", response_model=List[AttendanceDailyReport])
+def daily_headcount_report(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    if current_user.role not in ("admin", "staff"):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    query = db.query(AttendanceDailySummary)
+    if date_from:
+        query = query.filter(AttendanceDailySummary.date >= date_from)
+    if date_to:
+        query = query.filter(AttendanceDailySummary.date <= date_to)
+    return query.order_by(AttendanceDailySummary.date).all()
+
+
+# ✅ Rebuild the summaries from raw attendance (admin only; whole months)
+@router.post("/attendance/rebuild", response_model=AttendanceSummaryRebuild)
+def rebuild_attendance_summaries(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can rebuild reports")
+
+    counts = rebuild_summaries(db, date_from, date_to)
+    db.commit()
+    invalidate_dashboard()
+    return counts
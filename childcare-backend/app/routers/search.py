@@ -0,0 +1,44 @@
+# app/routers/search.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from app.schemas.search_schema import TypeaheadResult
+from app.typeahead import KIND_TABLES, typeahead_index
+from app.routers.deps import get_current_user, DBRoute
+
+router = APIRouter(prefix="/search", tags=["search"], route_class=DBRoute)
+
+
+def _visible_to(current_user):
+    if current_user.role == "admin":
+        return None
+    # Like GET /staff/: other users are visible through their staff profile only
+    return lambda entry: entry.kind != "user" or entry.extra.get("staff_id") is not None
+
+
+# ✅ Typeahead across children, users and activities (in-memory index, no DB query)
+@router.get("/typeahead", response_model=List[TypeaheadResult])
+def typeahead(
+    q: str = Query(..., min_length=1, max_length=100),
+    kinds: Optional[str] = Query(None, description="Comma-separated: child,user,activity (default all)"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user=Depends(get_current_user),
+):
+    selected = tuple(KIND_TABLES)
+    if kinds:
+        selected = tuple(kind.strip() for kind in kinds.split(",") if kind.strip())
+        unknown = [kind for kind in selected if kind not in KIND_TABLES]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown kinds: {', '.join(unknown)}")
+    results = typeahead_index.search(q, limit, selected, _visible_to(current_user))
+    return [
+        {"kind": entry.kind, "id": entry.id, "label": entry.label, "detail": entry.detail, "score": score, **entry.extra}
+        for score, entry in results
+    ]
+
+
+# ✅ Typeahead index size (admin only)
+@router.get("/typeahead/stats")
+def typeahead_stats(current_user=Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can view typeahead metrics")
+    return typeahead_index.stats()
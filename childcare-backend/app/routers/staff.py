@@ -1,14 +1,21 @@
 # app/routers/staff.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 from app.database import get_db
 from app.models.staff import Staff
 from app.models.user import User
 from app.schemas.staff_schema import StaffCreate, StaffResponse, StaffUpdate
-from app.routers.deps import get_current_user
+from app.schemas.page_schema import Page
+from app.pagination import keyset_page, MAX_PAGE_LIMIT
+from app.crud.dashboard import invalidate_dashboard
+from app.typeahead import typeahead_index
+from app.routers.deps import get_current_user, DBRoute, conditional_get
 
-router = APIRouter(prefix="/staff", tags=["staff"])
+router = APIRouter(prefix="/staff", tags=["staff"], route_class=DBRoute)
+
+# Conditional GET: ETag / Last-Modified from the version counters of these tables
+staff_versions = Depends(conditional_get("staff", "users"))
 
 
 # ✅ Create staff profile
@@ -28,22 +35,33 @@ def create_staff(
     staff = Staff(**staff_in.model_dump())
     db.add(staff)
     db.commit()
+    invalidate_dashboard()
     db.refresh(staff)
+    typeahead_index.set_staff(staff.user_id, staff.id)
     return staff
 
 
-# ✅ List all staff (includes related user info)
-@router.get("/", response_model=List[StaffResponse])
+# ✅ List all staff (includes related user info; pass cursor/limit for keyset pages ordered by id)
+@router.get("/", response_model=Union[List[StaffResponse], Page[StaffResponse]], dependencies=[staff_versions])
 def list_staff(
+    assigned_room: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    staffs = db.query(Staff).all()
-    return staffs
+    query = db.query(Staff)
+    if assigned_room:
+        query = query.filter(Staff.assigned_room == assigned_room)
+
+    if cursor is None and limit is None:
+        staffs = query.all()
+        return staffs
+    return keyset_page(query, [Staff.id], cursor, limit)
 
 
 # ✅ Get staff by ID
-@router.get("/{staff_id}", response_model=StaffResponse)
+@router.get("/{staff_id}", response_model=StaffResponse, dependencies=[staff_versions])
 def get_staff(
     staff_id: int,
     db: Session = Depends(get_db),
@@ -74,7 +92,9 @@ def update_staff(
         setattr(staff, key, value)
 
     db.commit()
+    invalidate_dashboard()
     db.refresh(staff)
+    typeahead_index.set_staff(staff.user_id, staff.id)
     return staff
 
 
@@ -92,6 +112,9 @@ def delete_staff(
     if not staff:
         raise HTTPException(status_code=404, detail="Staff not found")
 
+    user_id = staff.user_id
     db.delete(staff)
     db.commit()
+    invalidate_dashboard()
+    typeahead_index.set_staff(user_id, None)
     return {"detail": "Staff deleted successfully"}
@@ -1,7 +1,7 @@
 # app/schemas/activity_schema.py
 from pydantic import BaseModel
 from datetime import date, time, datetime
-from typing import Optional
+from typing import List, Optional
 
 class ActivityBase(BaseModel):
     title: str
@@ -10,6 +10,8 @@ class ActivityBase(BaseModel):
     start_time: Optional[time] = None
     end_time: Optional[time] = None
     assigned_staff_id: Optional[int] = None
+    # RRULE subset, e.g. "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR"; the series starts on scheduled_date
+    recurrence_rule: Optional[str] = None
 
 class ActivityCreate(ActivityBase):
     pass
@@ -21,10 +23,38 @@ class ActivityUpdate(BaseModel):
     start_time: Optional[time] = None
     end_time: Optional[time] = None
     assigned_staff_id: Optional[int] = None
+    recurrence_rule: Optional[str] = None
 
 class ActivityResponse(ActivityBase):
     id: int
+    recurrence_until: Optional[date] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+class ActivityOccurrence(ActivityResponse):
+    # scheduled_date is the occurrence's day; id the activity (series) it belongs to
+    is_exception: bool = False
+
+class OccurrenceUpdate(BaseModel):
+    # Changes to a single occurrence of a recurring activity; omitted fields follow the series
+    title: Optional[str] = None
+    description: Optional[str] = None
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    assigned_staff_id: Optional[int] = None
+
+
+class ActivityConflict(BaseModel):
+    staff_id: int
+    scheduled_date: date
+    activity_ids: List[int]  # the two activities that overlap
+    overlap_start: time
+    overlap_end: time
+
+class ScheduleValidation(BaseModel):
+    date_from: date
+    date_to: date
+    checked: int  # activities in the range
+    conflicts: List[ActivityConflict]
@@ -1,6 +1,9 @@
 from pydantic import BaseModel, field_validator
 from datetime import date, time, datetime
-from typing import Optional, Union
+from typing import List, Literal, Optional, Union
+
+# As allowed by attendance_status_check
+AttendanceStatus = Literal["Present", "Absent", "Late", "Excused"]
 
 
 class AttendanceBase(BaseModel):
@@ -8,7 +11,7 @@ class AttendanceBase(BaseModel):
     date: date
     check_in: Optional[time] = None
     check_out: Optional[time] = None
-    status: str = "Present"
+    status: AttendanceStatus = "Present"
 
 
 class AttendanceCreate(AttendanceBase):
@@ -21,7 +24,7 @@ class AttendanceUpdate(BaseModel):
     date: Optional[Union[str]] = None
     check_in: Optional[Union[str, time]] = None
     check_out: Optional[Union[str, time]] = None
-    status: Optional[str] = None
+    status: Optional[AttendanceStatus] = None
 
     @field_validator("date", mode="plain")
     def parse_date(cls, v):
@@ -57,3 +60,48 @@ class AttendanceResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class AttendanceBulkResult(BaseModel):
+    index: int  # position in the request body
+    child_id: int
+    date: date
+    ok: bool
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class AttendanceBulkResponse(BaseModel):
+    saved: int
+    failed: int
+    results: List[AttendanceBulkResult]
+
+
+class AttendanceMonthlyReport(BaseModel):
+    child_id: int
+    month: date  # first day of the month
+    present: int
+    late: int
+    absent: int
+    excused: int
+    days_recorded: int
+
+    class Config:
+        from_attributes = True
+
+
+class AttendanceDailyReport(BaseModel):
+    date: date
+    present: int
+    late: int
+    absent: int
+    excused: int
+    headcount: int  # present + late
+
+    class Config:
+        from_attributes = True
+
+
+class AttendanceSummaryRebuild(BaseModel):
+    monthly_rows: int
+    daily_rows: int
@@ -1,13 +1,16 @@
 # app/schemas/billing_schema.py
-from pydantic import BaseModel
-from datetime import date, datetime
-from typing import Optional
+from pydantic import BaseModel, Field
+from datetime import date, datetime, time
+from typing import List, Literal, Optional
 from decimal import Decimal
 
+# As allowed by billing_status_check
+BillingStatus = Literal["Paid", "Unpaid", "Pending", "Overdue"]
+
 class BillingBase(BaseModel):
     child_id: int
     amount: Decimal
-    status: Optional[str] = "Unpaid"
+    status: Optional[BillingStatus] = "Unpaid"
     issued_date: Optional[date] = None
     due_date: Optional[date] = None
     notes: Optional[str] = None
@@ -17,14 +20,65 @@ class BillingCreate(BillingBase):
 
 class BillingUpdate(BaseModel):
     amount: Optional[Decimal] = None
-    status: Optional[str] = None
+    status: Optional[BillingStatus] = None
     issued_date: Optional[date] = None
     due_date: Optional[date] = None
     notes: Optional[str] = None
 
 class BillingResponse(BillingBase):
     id: int
+    billing_period: Optional[date] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+# --- Billing runs (monthly invoice generation) ---
+class FeeSchedule(BaseModel):
+    flat_rate: Decimal = Field(default=Decimal("0"), ge=0)        # per child per month
+    daily_rate: Decimal = Field(default=Decimal("0"), ge=0)       # per day marked Present or Late
+    late_pickup_fee: Decimal = Field(default=Decimal("0"), ge=0)  # per day checked out after pickup_cutoff
+    pickup_cutoff: Optional[time] = None
+
+class BillingRunRequest(BaseModel):
+    period: str = Field(pattern=r"^\d{4}-(0[1-9]|1[0-2])$")  # "YYYY-MM"
+    fees: FeeSchedule
+    due_in_days: int = Field(default=15, ge=0)  # due date counted from the end of the period
+    child_ids: Optional[List[int]] = None       # default: every child with attendance in the period
+    dry_run: bool = False
+
+class BillingRunInvoice(BaseModel):
+    child_id: int
+    days_attended: int
+    late_pickups: int
+    amount: Decimal
+    billing_id: Optional[int] = None
+    status: str  # "created", "exists", "no_charge" or "preview" (dry run)
+
+class BillingRunResponse(BaseModel):
+    period: date
+    dry_run: bool
+    created: int
+    skipped_existing: int
+    total_amount: Decimal
+    invoices: List[BillingRunInvoice]
+
+# --- Receivables ledger ---
+class ReceivableResponse(BaseModel):
+    child_id: int
+    balance: Decimal
+    open_invoices: int
+    aged_0_30: Decimal  # by days past due_date; not yet due counts here
+    aged_31_60: Decimal
+    aged_61_90: Decimal
+    aged_90_plus: Decimal
+    oldest_due_date: Optional[date] = None
+    as_of: date
+
+    class Config:
+        from_attributes = True
+
+class ReceivablesAgingResponse(BaseModel):
+    as_of: date
+    marked_overdue: int
+    children_owing: int
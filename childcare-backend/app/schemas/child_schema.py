@@ -29,6 +29,20 @@ class ChildUpdate(BaseModel):
     allergies: Optional[str] = None
     medical_info: Optional[str] = None
 
+class ChildSummary(ChildBase):
+    """
+    Lightweight list projection: scalar columns plus related-row counts.
+    Related lists are only present when requested with ?include=.
+    """
+    id: int
+    created_at: datetime
+    attendance_count: int = 0
+    health_record_count: int = 0
+    billing_count: int = 0
+    health_records: Optional[List[HealthRecordResponse]] = None
+    attendance_records: Optional[List[AttendanceResponse]] = None
+    billings: Optional[List[BillingResponse]] = None
+
 class ChildResponse(ChildBase):
     id: int
     created_at: datetime
@@ -0,0 +1,23 @@
+# app/schemas/dashboard_schema.py
+from pydantic import BaseModel
+from datetime import date, time
+from decimal import Decimal
+from typing import List, Optional
+
+class DashboardActivity(BaseModel):
+    id: int
+    title: str
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    assigned_staff_id: Optional[int] = None
+
+class DashboardResponse(BaseModel):
+    date: date
+    children_enrolled: int
+    present_today: int    # Present + Late
+    absent_today: int
+    staff_total: int
+    staff_on_shift: int   # staff assigned to an activity today
+    unpaid_total: Decimal
+    unpaid_invoices: int
+    activities_today: List[DashboardActivity]
@@ -23,3 +23,7 @@ class HealthRecordResponse(HealthRecordBase):
 
     class Config:
         from_attributes = True
+
+class HealthRecordSearchResult(HealthRecordResponse):
+    # Relevance for the query, higher first (comparable within one search only)
+    rank: float
@@ -0,0 +1,17 @@
+# app/schemas/import_schema.py
+from pydantic import BaseModel
+from typing import List
+
+class ImportRowError(BaseModel):
+    row: int  # spreadsheet row number (header is row 1)
+    error: str
+
+class ImportReport(BaseModel):
+    kind: str
+    dry_run: bool
+    rows_read: int
+    rows_valid: int
+    inserted: int
+    skipped_duplicates: int
+    errors_total: int
+    errors: List[ImportRowError]  # first MAX_REPORTED_ERRORS only
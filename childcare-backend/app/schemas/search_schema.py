@@ -0,0 +1,13 @@
+# app/schemas/search_schema.py
+from pydantic import BaseModel
+from typing import Optional
+
+
+class TypeaheadResult(BaseModel):
+    kind: str  # child | user | activity
+    id: int
+    label: str
+    detail: Optional[str] = None  # parent name, email, or activity date/time
+    role: Optional[str] = None  # users only
+    staff_id: Optional[int] = None  # users with a staff profile
+    score: float
@@ -1,11 +1,14 @@
 # app/schemas/user_schema.py
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Literal, Optional
+
+# As allowed by users_role_check
+UserRole = Literal["admin", "staff", "parent"]
 
 class UserBase(BaseModel):
     name: str
     email: EmailStr
-    role: str = "staff"
+    role: UserRole = "staff"
 
 class UserCreate(UserBase):
     password: str
@@ -17,7 +20,7 @@ class UserLogin(BaseModel):
 class UserUpdate(BaseModel):
     name: Optional[str] = None
     email: Optional[EmailStr] = None
-    role: Optional[str] = None
+    role: Optional[UserRole] = None
     password: Optional[str] = None
 
 class UserResponse(BaseModel):
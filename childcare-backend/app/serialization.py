@@ -0,0 +1,224 @@
+# app/serialization.py
+import inspect
+import types
+import typing
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache, wraps
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined
+from app.config import settings
+
+# Response class for handlers without a response model
+DefaultJSONResponse = ORJSONResponse if settings.FAST_JSON else JSONResponse
+
+# Keyword injected into wrapped endpoints to receive FastAPI's sub-response
+# (headers and status set by dependencies, e.g. ETags)
+_SUB_RESPONSE = "_fast_json_response"
+
+
+@lru_cache(maxsize=None)
+def get_adapter(schema) -> TypeAdapter:
+    """
+    One TypeAdapter per response schema, built once and reused.
+    """
+    return TypeAdapter(schema)
+
+
+class _NotDirect(Exception):
+    """A value that the direct path can't dump exactly like pydantic would."""
+
+
+# Scalar annotations whose values orjson writes exactly as pydantic does
+# (Decimal via str). Exact types: a datetime in a date field must be validated.
+_EXACT_SCALARS = {int: (int,), bool: (bool,), date: (date,)}
+_SUBCLASS_SCALARS = (str, datetime, time, Decimal)
+
+
+def _direct_safe_model(model) -> bool:
+    decorators = model.__pydantic_decorators__
+    if (decorators.validators or decorators.field_validators or decorators.root_validators
+            or decorators.model_validators or decorators.field_serializers
+            or decorators.model_serializers or decorators.computed_fields):
+        return False
+    if model.model_config.get("json_encoders") or getattr(model, "__pydantic_root_model__", False):
+        return False
+    return all(
+        field.alias is None and field.serialization_alias is None
+        for field in model.model_fields.values()
+    )
+
+
+def _direct_plan(annotation, exclude_unset: bool):
+    """
+    Compile `annotation` into fn(value) -> JSON-ready Python (dicts, lists,
+    scalars) read straight off ORM objects or dicts, or None when the type
+    needs pydantic (validators, aliases, other types). At run time fn raises
+    _NotDirect for values of an unexpected type.
+    """
+    if annotation in _EXACT_SCALARS:
+        exact = _EXACT_SCALARS[annotation]
+
+        def scalar(value):
+            if type(value) not in exact:
+                raise _NotDirect
+            return value
+        return scalar
+    if annotation in _SUBCLASS_SCALARS:
+        def scalar(value):
+            if not isinstance(value, annotation):
+                raise _NotDirect
+            return value
+        return scalar
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin in (typing.Union, types.UnionType):
+        if len(args) == 2 and type(None) in args:
+            inner = _direct_plan(args[0] if args[1] is type(None) else args[1], exclude_unset)
+            if inner is None:
+                return None
+            return lambda value: None if value is None else inner(value)
+        # Union[List[X], Page[X]]: plain lists vs. keyset pages
+        lists = [arg for arg in args if typing.get_origin(arg) is list]
+        models = [arg for arg in args if isinstance(arg, type) and issubclass(arg, BaseModel)]
+        if len(lists) == 1 and len(models) == 1 and len(args) == 2:
+            as_list = _direct_plan(lists[0], exclude_unset)
+            as_model = _direct_plan(models[0], exclude_unset)
+            if as_list is None or as_model is None:
+                return None
+            return lambda value: as_list(value) if isinstance(value, list) else as_model(value)
+        return None
+    if origin is list:
+        item = _direct_plan(args[0], exclude_unset) if args else None
+        if item is None:
+            return None
+
+        def items(value):
+            if isinstance(value, (str, bytes, dict)):
+                raise _NotDirect
+            return [item(v) for v in value]
+        return items
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        if not _direct_safe_model(annotation):
+            return None
+        fields = []
+        for name, field in annotation.model_fields.items():
+            plan = _direct_plan(field.annotation, exclude_unset)
+            if plan is None:
+                return None
+            fields.append((name, plan, field.default))
+
+        def model(value):
+            if isinstance(value, dict):
+                found = value
+            else:
+                # Loaded columns sit in __dict__; fall back to getattr for
+                # properties and relationships not loaded yet
+                found = value.__dict__
+            out = {}
+            for name, plan, default in fields:
+                if name in found:
+                    raw = found[name]
+                elif not isinstance(value, dict) and hasattr(value, name):
+                    raw = getattr(value, name)
+                elif exclude_unset:
+                    continue
+                elif default is PydanticUndefined:
+                    raise _NotDirect
+                else:
+                    raw = default
+                out[name] = plan(raw)
+            return out
+        return model
+    return None
+
+
+def _orjson_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def json_renderer(response_model, route_kwargs: dict):
+    """
+    Build `render(result) -> bytes` for a route.
+
+    Schemas made only of plain scalars, lists and nested models (no
+    validators, aliases or custom serializers) are dumped straight from the
+    ORM objects with orjson, without re-validation; any value of an
+    unexpected type falls back to the pydantic path. Otherwise the result is
+    validated by a cached TypeAdapter and dumped in pydantic-core, skipping
+    FastAPI's dump-to-Python + json.dumps pass. Results that already are
+    instances of `response_model` are never re-validated.
+    """
+    adapter = get_adapter(response_model)
+    options = {
+        "include": route_kwargs.get("response_model_include"),
+        "exclude": route_kwargs.get("response_model_exclude"),
+        "by_alias": route_kwargs.get("response_model_by_alias", True),
+        "exclude_unset": route_kwargs.get("response_model_exclude_unset", False),
+        "exclude_defaults": route_kwargs.get("response_model_exclude_defaults", False),
+        "exclude_none": route_kwargs.get("response_model_exclude_none", False),
+    }
+
+    direct = None
+    if not any(options[key] for key in ("include", "exclude", "exclude_defaults", "exclude_none")) and options["by_alias"]:
+        direct = _direct_plan(response_model, options["exclude_unset"])
+
+    def render(result):
+        if isinstance(result, Response):
+            return result
+        if direct is not None and not isinstance(result, BaseModel):
+            try:
+                return orjson.dumps(direct(result), default=_orjson_default, option=orjson.OPT_UTC_Z)
+            except _NotDirect:
+                pass
+        if not (isinstance(result, BaseModel) and type(result) is response_model):
+            result = adapter.validate_python(result, from_attributes=True)
+        return adapter.dump_json(result, **options)
+
+    return render
+
+
+def _respond(body, sub_response: Response, status_code) -> Response:
+    if isinstance(body, Response):
+        return body
+    response = Response(
+        content=body,
+        status_code=sub_response.status_code or status_code or 200,
+        media_type="application/json",
+    )
+    response.headers.raw.extend(sub_response.headers.raw)
+    return response
+
+
+def json_endpoint(endpoint, render=None, status_code=None):
+    """
+    Wrap `endpoint` so it returns a ready JSON Response (FastAPI then skips
+    its own serialization). `render` turns the result into bytes; pass None
+    when `endpoint` already returns rendered bytes (see DBRoute).
+    """
+    signature = inspect.signature(endpoint)
+    parameters = list(signature.parameters.values())
+    parameters.append(inspect.Parameter(_SUB_RESPONSE, inspect.Parameter.KEYWORD_ONLY, annotation=Response))
+
+    if inspect.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            sub_response = kwargs.pop(_SUB_RESPONSE)
+            result = await endpoint(*args, **kwargs)
+            return _respond(render(result) if render else result, sub_response, status_code)
+    else:
+        @wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            sub_response = kwargs.pop(_SUB_RESPONSE)
+            result = endpoint(*args, **kwargs)
+            return _respond(render(result) if render else result, sub_response, status_code)
+
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    wrapper.renders_json = True
+    return wrapper
@@ -0,0 +1,294 @@
+# app/typeahead.py
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from sqlalchemy import select
+from app.database import SessionLocal
+from app.models.activity import Activity
+from app.models.child import Child
+from app.models.staff import Staff
+from app.models.user import User
+from app.versions import table_versions, version_feed
+
+# Tables each kind of entry is built from; when their versions change the
+# kind is reloaded in the background (writes by another worker, an import, a
+# script; this worker's own writes are already applied entry by entry)
+KIND_TABLES = {
+    "child": ("children",),
+    "user": ("users", "staff"),
+    "activity": ("activities",),
+}
+TABLE_KINDS = {table: kind for kind, tables in KIND_TABLES.items() for table in tables}
+
+# Seconds between version checks / reloads; searches never wait for one
+VERSION_CHECK_INTERVAL = 1.0
+
+# Matches ranked per query before the top `limit` are picked
+MIN_CANDIDATES = 200
+
+
+def normalize(text) -> list:
+    """
+    Case- and accent-insensitive words: "José O'Neil" -> ["jose", "o", "neil"].
+    """
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return re.findall(r"[^\W_]+", text)
+
+
+class Entry:
+    __slots__ = ("kind", "id", "label", "detail", "extra", "words")
+
+    def __init__(self, kind, id, label, detail, extra, primary, secondary=()):
+        self.kind = kind
+        self.id = id
+        self.label = label or ""
+        self.detail = detail
+        self.extra = extra
+        # word -> 1.0 in the label field(s), 0.5 in secondary ones (parent, email)
+        self.words = {}
+        for text in secondary:
+            for word in normalize(text):
+                self.words[word] = 0.5
+        for text in primary:
+            for word in normalize(text):
+                self.words[word] = 1.0
+
+    def score(self, query_words) -> float:
+        """
+        Sum over query words of the best matching entry word: exact 2, prefix
+        1, times the field weight; 0 if any query word matches nothing.
+        """
+        total = 0.0
+        for query_word in query_words:
+            best = 0.0
+            for word, weight in self.words.items():
+                if word == query_word:
+                    best = max(best, 2 * weight)
+                elif word.startswith(query_word):
+                    best = max(best, weight)
+            if not best:
+                return 0.0
+            total += best
+        return total
+
+
+def child_entry(child_id, name, parent_name) -> Entry:
+    return Entry("child", child_id, name, parent_name, {}, [name], [parent_name])
+
+
+def user_entry(user_id, name, email, role, staff_id) -> Entry:
+    return Entry("user", user_id, name, email, {"role": role, "staff_id": staff_id}, [name], [email])
+
+
+def activity_entry(activity_id, title, scheduled_date, start_time) -> Entry:
+    detail = " ".join(v.isoformat(timespec="minutes") if hasattr(v, "hour") else v.isoformat()
+                      for v in (scheduled_date, start_time) if v is not None) or None
+    return Entry("activity", activity_id, title, detail, {}, [title])
+
+
+class TypeaheadIndex:
+    """
+    In-process prefix index over children (name, parent name), users (name,
+    email) and activities (title): a sorted list of (word, kind, id), so a
+    keystroke is two bisects and a short scan, never a database query.
+
+    Loaded at start-up (app/warmup.py); the write handlers keep it current
+    entry by entry. Each worker process has its own copy, reloaded per kind
+    in the background (at most every VERSION_CHECK_INTERVAL seconds) when
+    someone else changed its tables. With the version feed (PostgreSQL,
+    app/versions.py) every bump says whether this worker made it: a bump
+    right after the synced version from one of this worker's commits only
+    advances the synced version. Without the feed the versions are polled,
+    and any change reloads the kind.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}  # (kind, id) -> Entry
+        self._words = []  # sorted (word, kind, id)
+        self._synced = {}  # table -> version the entries reflect
+        self._stale = set()  # kinds changed by someone else
+        self._loading = set()  # kinds being reloaded
+        self._checking = False
+        self._checked = 0.0
+
+    # --- Maintenance -------------------------------------------------------------
+
+    def _add(self, entry: Entry):
+        self._entries[(entry.kind, entry.id)] = entry
+        for word in entry.words:
+            insort(self._words, (word, entry.kind, entry.id))
+
+    def _remove(self, kind, id):
+        entry = self._entries.pop((kind, id), None)
+        if entry is None:
+            return None
+        for word in entry.words:
+            i = bisect_left(self._words, (word, kind, id))
+            if i < len(self._words) and self._words[i] == (word, kind, id):
+                del self._words[i]
+        return entry
+
+    def _applied(self, kind):
+        # A reload in progress may replace this change with older rows
+        if kind in self._loading:
+            self._stale.add(kind)
+
+    def upsert(self, entry: Entry):
+        with self._lock:
+            self._remove(entry.kind, entry.id)
+            self._add(entry)
+            self._applied(entry.kind)
+
+    def delete(self, kind, id):
+        with self._lock:
+            self._remove(kind, id)
+            self._applied(kind)
+
+    def set_staff(self, user_id, staff_id):
+        """
+        A staff profile was created (staff_id) or deleted (None) for `user_id`.
+        """
+        with self._lock:
+            entry = self._entries.get(("user", user_id))
+            if entry is not None:
+                entry.extra = {**entry.extra, "staff_id": staff_id}
+            self._applied("user")
+
+    def invalidate(self, *tables):
+        """
+        This worker wrote `tables` without applying the entries (imports):
+        reload their kinds.
+        """
+        with self._lock:
+            self._stale.update(TABLE_KINDS[table] for table in tables if table in TABLE_KINDS)
+
+    def _on_version(self, table, version, own):
+        # Version feed, on the event loop: a bump of one of this worker's
+        # commits right after the synced version was applied by its handler
+        kind = TABLE_KINDS.get(table)
+        if kind is None:
+            return
+        with self._lock:
+            synced = self._synced.get(table)
+            if own and synced == version - 1:
+                self._synced[table] = version
+            elif synced is None or synced < version:
+                self._stale.add(kind)
+
+    def load(self, db, kinds=tuple(KIND_TABLES)):
+        """
+        (Re)load whole kinds from the database, e.g. at start-up.
+        """
+        queries = {
+            "child": (child_entry, select(Child.id, Child.name, Child.parent_name)),
+            "user": (user_entry, select(User.id, User.name, User.email, User.role, Staff.id).outerjoin(Staff, Staff.user_id == User.id)),
+            "activity": (activity_entry, select(Activity.id, Activity.title, Activity.scheduled_date, Activity.start_time)),
+        }
+        counts = {}
+        for kind in kinds:
+            with self._lock:
+                self._stale.discard(kind)
+                self._loading.add(kind)
+            try:
+                # Versions read first: a write during the load shows up as a change later
+                versions, _ = table_versions.get(db, KIND_TABLES[kind])
+                make_entry, stmt = queries[kind]
+                entries = [make_entry(*row) for row in db.execute(stmt)]
+            except Exception:
+                with self._lock:
+                    self._loading.discard(kind)
+                    self._stale.add(kind)
+                raise
+            words = sorted((word, kind, entry.id) for entry in entries for word in entry.words)
+            with self._lock:
+                others = [item for item in self._words if item[1] != kind]
+                self._words = sorted(others + words) if others else words
+                self._entries = {key: e for key, e in self._entries.items() if key[0] != kind}
+                self._entries.update(((kind, entry.id), entry) for entry in entries)
+                self._synced.update(zip(KIND_TABLES[kind], versions))
+                self._loading.discard(kind)
+            counts[kind] = len(entries)
+        return counts
+
+    def _reload_stale(self):
+        # At most one check (a version lookup without the feed, then reloads) in flight
+        following = version_feed.following
+        with self._lock:
+            if self._checking or time.monotonic() - self._checked < VERSION_CHECK_INTERVAL:
+                return
+            if following and not self._stale:
+                return
+            self._checking = True
+
+        def check():
+            try:
+                with SessionLocal() as db:
+                    with self._lock:
+                        stale = set(self._stale)
+                    if not following:
+                        tables = sorted(TABLE_KINDS)
+                        current = dict(zip(tables, table_versions.get(db, tables)[0]))
+                        stale.update(TABLE_KINDS[table] for table in tables if self._synced.get(table) != current[table])
+                    if stale:
+                        self.load(db, sorted(stale))
+            except Exception as e:
+                print(f"⚠️ Typeahead reload failed: {type(e).__name__}: {e}")
+            finally:
+                with self._lock:
+                    self._checking = False
+                    self._checked = time.monotonic()
+
+        threading.Thread(target=check, name="typeahead-reload", daemon=True).start()
+
+    # --- Queries -------------------------------------------------------------------
+
+    def search(self, q: str, limit: int = 10, kinds=tuple(KIND_TABLES), visible=None) -> list:
+        """
+        Top `limit` entries whose words start with every word of `q`, best
+        first: exact words over prefixes, names over secondary fields, then
+        shorter labels. `visible(entry)` filters what the caller may see.
+        """
+        self._reload_stale()
+        query_words = normalize(q)
+        if not query_words:
+            return []
+        wanted = max(MIN_CANDIDATES, limit * 20)
+        with self._lock:
+            words = self._words
+            # Scan the narrowest prefix range; the other words are checked per entry
+            ranges = [(bisect_left(words, (w,)), bisect_left(words, (w + "\uffff",))) for w in query_words]
+            lo, hi = min(ranges, key=lambda r: r[1] - r[0])
+            seen = set()
+            scored = []
+            for i in range(lo, hi):
+                _, kind, id = words[i]
+                if kind not in kinds or (kind, id) in seen:
+                    continue
+                seen.add((kind, id))
+                entry = self._entries[(kind, id)]
+                if visible is not None and not visible(entry):
+                    continue
+                score = entry.score(query_words)
+                if score:
+                    scored.append((score, entry))
+                    if len(scored) >= wanted:
+                        break
+        scored.sort(key=lambda item: (-item[0], len(item[1].label), item[1].label, -item[1].id))
+        return scored[:limit]
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {kind: 0 for kind in KIND_TABLES}
+            for kind, _ in self._entries:
+                counts[kind] += 1
+            return {"entries": counts, "words": len(self._words), "stale": sorted(self._stale)}
+
+
+typeahead_index = TypeaheadIndex()
+version_feed.add_listener(typeahead_index._on_version)
@@ -1,9 +1,9 @@
 # app/utils.py
-import bcrypt
 from datetime import datetime, timedelta
 from jose import jwt
 from typing import Optional
 from .config import settings
+from .password_pool import password_pool, hash_password_bytes, check_password_bytes
 
 MAX_BCRYPT_LENGTH = 72
 
@@ -14,7 +14,7 @@ def get_password_hash(password: str) -> str:
     Returns the hash as a UTF-8 string.
     """
     safe_password = password[:MAX_BCRYPT_LENGTH].encode("utf-8")
-    hashed = bcrypt.hashpw(safe_password, bcrypt.gensalt())
+    hashed = password_pool.run(hash_password_bytes, safe_password)
     return hashed.decode("utf-8")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,7 +22,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Verify a plain password against a hashed password.
     """
     safe_password = plain_password[:MAX_BCRYPT_LENGTH].encode("utf-8")
-    return bcrypt.checkpw(safe_password, hashed_password.encode("utf-8"))
+    return password_pool.run(check_password_bytes, safe_password, hashed_password.encode("utf-8"))
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
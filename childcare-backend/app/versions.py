@@ -0,0 +1,283 @@
+# app/versions.py
+import asyncio
+import threading
+import time
+from itertools import chain
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.models.table_version import TableVersion
+
+# Tables with a version row and write triggers (migrations 0005/0006)
+TRACKED_TABLES = (
+    "users", "staff", "children", "attendance", "health_records", "billing", "activities", "activity_exceptions",
+)
+
+
+class TableVersions:
+    """
+    Per-table write counters kept by the database itself: triggers bump
+    table_versions as part of the writing transaction, so every worker,
+    script (imports, aging, summary rebuilds) and manual edit counts, and a
+    reader sees exactly the versions of the data its session can see. On
+    PostgreSQL the bump happens at commit, version rows locked last and in
+    table-name order (migration 0006), so it never holds up other writers.
+    """
+
+    def get(self, db, tables) -> tuple:
+        """
+        -> ([version per table], last write time of any of them); one
+        primary-key lookup on `db` (a session or connection).
+        """
+        rows = dict(
+            (name, (version, modified))
+            for name, version, modified in db.execute(
+                select(TableVersion.table_name, TableVersion.version, TableVersion.modified)
+                .where(TableVersion.table_name.in_(tables))
+            )
+        )
+        missing = [table for table in tables if table not in rows]
+        if missing:
+            raise RuntimeError(f"No version row for {', '.join(missing)}; run `alembic upgrade head`")
+        versions = [rows[table][0] for table in tables]
+        modified = max((rows[table][1] for table in tables), default=0.0)
+        return versions, modified
+
+
+table_versions = TableVersions()
+
+# NOTIFY channel of the version bumps (migration 0006), payload "<table>:<version>"
+VERSIONS_CHANNEL = "table_versions"
+
+# Seconds between liveness checks of the LISTEN connection
+FEED_PING_INTERVAL = 5.0
+
+# Seconds a write of this worker keeps its tables out of current() while
+# its notification is awaited (a write that changed no row sends none)
+FEED_PENDING_SECONDS = 10.0
+
+
+class VersionFeed:
+    """
+    In-process copy of the primary's table versions, kept current by
+    LISTEN table_versions on one dedicated asyncpg connection (PostgreSQL,
+    TABLE_VERSIONS_LISTEN). Loaded from the table once LISTEN is in place,
+    so no bump falls in between; reloaded after every reconnect.
+
+    current() answers only while the connection is up, and not for a table
+    this worker is writing or has just committed to until that commit's
+    notification (matched by backend pid) is in: a request never sees
+    versions older than its own worker's writes. Listeners get every bump
+    with `own=True` for those of this worker's transactions.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}  # table -> latest committed version
+        self._pending = {}  # table -> {backend pid: [transactions, deadline]}
+        self._listeners = []
+        self._task = None
+        self._conn = None
+        self.following = False
+        self.received = 0
+        self.reconnects = 0
+
+    def start(self, database_url: str):
+        """
+        Follow the versions from the running event loop; no-op on SQLite.
+        """
+        if not database_url.startswith("postgresql"):
+            return
+        self.dsn = "postgresql://" + database_url.split("://", 1)[1]
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._lost()
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    @property
+    def active(self) -> bool:
+        return self._task is not None
+
+    def add_listener(self, callback):
+        """
+        callback(table, version, own) on the event loop for every bump, and
+        for every table after a (re)load with own=False.
+        """
+        self._listeners.append(callback)
+
+    def current(self, tables):
+        """
+        [version per table] as last committed on the primary, or None when
+        not following or a table has a write of this worker in flight.
+        """
+        if not self.following:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            for table in tables:
+                writers = self._pending.get(table)
+                if writers:
+                    for pid in [pid for pid, (_, deadline) in writers.items() if deadline < now]:
+                        del writers[pid]
+                    if writers:
+                        return None
+            try:
+                return [self._versions[table] for table in tables]
+            except KeyError:
+                return None
+
+    def writing(self, pid: int, tables):
+        """
+        A transaction of this worker on backend `pid` writes `tables`; each
+        is counted once per transaction (see mark_changed).
+        """
+        deadline = time.monotonic() + FEED_PENDING_SECONDS
+        with self._lock:
+            for table in tables:
+                entry = self._pending.setdefault(table, {}).setdefault(pid, [0, deadline])
+                entry[0] += 1
+                entry[1] = deadline
+
+    def settled(self, pid: int, tables):
+        """
+        Drop `writing` marks that will get no notification (rolled back).
+        """
+        with self._lock:
+            for table in tables:
+                self._settle(table, pid)
+
+    def _settle(self, table, pid) -> bool:
+        writers = self._pending.get(table)
+        entry = writers.get(pid) if writers else None
+        if entry is None:
+            return False
+        entry[0] -= 1
+        if entry[0] <= 0:
+            del writers[pid]
+            if not writers:
+                del self._pending[table]
+        return True
+
+    def _on_notify(self, connection, pid, channel, payload):
+        table, _, version = payload.rpartition(":")
+        version = int(version)
+        self.received += 1
+        with self._lock:
+            if version > self._versions.get(table, 0):
+                self._versions[table] = version
+            own = self._settle(table, pid)
+        for listener in self._listeners:
+            listener(table, version, own)
+
+    def _loaded(self, versions: dict):
+        with self._lock:
+            # Bumps notified since LISTEN may already be newer than the snapshot
+            for table, version in versions.items():
+                self._versions[table] = max(version, self._versions.get(table, 0))
+            self.following = True
+            versions = dict(self._versions)
+        for table, version in versions.items():
+            for listener in self._listeners:
+                listener(table, version, False)
+
+    def _lost(self, *args):
+        with self._lock:
+            self.following = False
+            self._versions.clear()
+
+    async def _run(self):
+        import asyncpg
+
+        backoff = 1
+        while True:
+            try:
+                self._conn = await asyncpg.connect(self.dsn)
+                self._conn.add_termination_listener(self._lost)
+                await self._conn.add_listener(VERSIONS_CHANNEL, self._on_notify)
+                rows = await self._conn.fetch("SELECT table_name, version FROM table_versions")
+                self._loaded({row["table_name"]: row["version"] for row in rows})
+                print(f"✅ Table versions followed over LISTEN {VERSIONS_CHANNEL}")
+                backoff = 1
+                while True:
+                    await asyncio.sleep(FEED_PING_INTERVAL)
+                    await asyncio.wait_for(self._conn.fetchval("SELECT 1"), FEED_PING_INTERVAL)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._lost()
+                self.reconnects += 1
+                print(f"⚠️ Table version feed down ({type(e).__name__}: {e}); retrying in {backoff}s")
+                if self._conn is not None:
+                    self._conn.terminate()
+                    self._conn = None
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = sum(len(writers) for writers in self._pending.values())
+        return {"following": self.following, "received": self.received, "reconnects": self.reconnects, "pending": pending}
+
+
+version_feed = VersionFeed()
+
+
+def _backend_pid(session: Session) -> int:
+    # Cached on the pooled connection: one query per connection
+    connection = session.connection()
+    info = connection.connection.info
+    if "backend_pid" not in info:
+        info["backend_pid"] = connection.exec_driver_sql("SELECT pg_backend_pid()").scalar()
+    return info["backend_pid"]
+
+
+def mark_changed(session: Session, *tables):
+    """
+    Record writes the ORM can't see (e.g. COPY on the raw connection), for
+    the read-your-writes window of app/database.py and the version feed.
+    """
+    changed = session.info.setdefault("changed_tables", set())
+    new = set(tables) - changed
+    changed.update(tables)
+    if new and version_feed.active and not session.info.get("replica"):
+        pid = session.info.get("backend_pid")
+        if pid is None:
+            pid = session.info["backend_pid"] = _backend_pid(session)
+        version_feed.writing(pid, new)
+
+
+# Every Session (sync, or the sync side of an AsyncSession) records the
+# tables it writes; app/database.py starts the read-your-writes window on commit
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session, flush_context):
+    mark_changed(session, *{obj.__table__.name for obj in chain(session.new, session.dirty, session.deleted)})
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mark_changed(orm_execute_state.session, orm_execute_state.statement.table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_committed(session):
+    # The feed's marks stay until the commit's notification arrives
+    session.info.pop("changed_tables", None)
+    session.info.pop("backend_pid", None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    changed = session.info.pop("changed_tables", None)
+    pid = session.info.pop("backend_pid", None)
+    if changed and pid is not None:
+        version_feed.settled(pid, changed)
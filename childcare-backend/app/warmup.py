@@ -0,0 +1,173 @@
+# app/warmup.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.routing import APIRoute
+from sqlalchemy.orm import configure_mappers
+from app.config import settings
+from app.database import SessionLocal, engine, async_engine, replica_engine, async_replica_engine, ASYNC_DB
+from app.migrations import check_schema
+from app.password_pool import password_pool
+from app.serialization import get_adapter
+from app.typeahead import typeahead_index
+from app.utils import create_access_token, decode_token
+
+
+class WarmupState:
+    """
+    Progress of the start-up warm-up, reported by GET /health/ready.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.error = None
+        self.steps = {}
+        self._lock = threading.Lock()
+
+    def record(self, step: str, started: float, detail=None):
+        with self._lock:
+            self.steps[step] = {"seconds": round(time.perf_counter() - started, 4), **(detail or {})}
+
+    def report(self) -> dict:
+        with self._lock:
+            status = "ready" if self.ready else "failed" if self.error else "warming"
+            return {"status": status, "error": self.error, "steps": dict(self.steps)}
+
+
+warmup_state = WarmupState()
+
+
+def _pool_capacity(pool) -> int:
+    # NullPool / StaticPool / SingletonThreadPool keep nothing worth warming
+    size = getattr(pool, "size", None)
+    return size() if callable(size) else 0
+
+
+def _open_connection(engine):
+    conn = engine.connect()
+    conn.exec_driver_sql("SELECT 1")
+    return conn
+
+
+def prewarm_pool(engine, count: int) -> int:
+    """
+    Open up to `count` pooled connections in parallel (connect + one round
+    trip each) and check them back in, so early requests don't pay for
+    connection set-up. Returns how many were opened.
+    """
+    count = min(count, _pool_capacity(engine.pool))
+    if count <= 0:
+        return 0
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        connections = list(executor.map(_open_connection, [engine] * count))
+    for conn in connections:
+        conn.close()
+    return count
+
+
+async def prewarm_async_pool(async_engine, count: int) -> int:
+    """
+    prewarm_pool for an async engine (DB_MODE=async).
+    """
+    count = min(count, _pool_capacity(async_engine.pool))
+    if count <= 0:
+        return 0
+
+    async def open_connection():
+        conn = await async_engine.connect()
+        await conn.exec_driver_sql("SELECT 1")
+        return conn
+
+    results = await asyncio.gather(*(open_connection() for _ in range(count)), return_exceptions=True)
+    for conn in results:
+        if not isinstance(conn, BaseException):
+            await conn.close()
+    for conn in results:
+        if isinstance(conn, BaseException):
+            raise conn
+    return count
+
+
+def precompile(app) -> dict:
+    """
+    Do the lazy one-time work of the first requests up front: configure the
+    ORM mappers (relationships, column properties), build the cached
+    TypeAdapters for every route's request and response models, and run one
+    JWT round trip.
+    """
+    configure_mappers()
+    models = set()
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        if route.response_model is not None:
+            models.add(route.response_model)
+        if route.body_field is not None:
+            models.add(route.body_field.field_info.annotation)
+    for model in models:
+        get_adapter(model)
+    decode_token(create_access_token({"sub": "0"}))
+    return {"models": len(models)}
+
+
+def load_typeahead() -> dict:
+    with SessionLocal() as db:
+        return typeahead_index.load(db)
+
+
+def _warm_password_pool() -> dict:
+    # Not fatal: hashing still works, the first login just pays for the spawn
+    try:
+        return {"workers": password_pool.warm()}
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+async def _warm_async_pool(step: str, async_engine):
+    started = time.perf_counter()
+    opened = await prewarm_async_pool(async_engine, settings.POOL_PREWARM)
+    warmup_state.record(step, started, {"connections": opened})
+
+
+def _timed(step: str, fn):
+    started = time.perf_counter()
+    warmup_state.record(step, started, fn())
+
+
+async def run_warmup(app, reraise: bool = True):
+    """
+    Schema revision check, then pool pre-warming, validator pre-compilation
+    and the typeahead index load in parallel. Marks the process ready when all of them succeed; a failure
+    is recorded (and re-raised with `reraise`). Password workers are spawned
+    alongside but don't hold up readiness (process start-up takes seconds).
+    """
+    app.state.password_warmup = asyncio.create_task(
+        asyncio.to_thread(_timed, "password_pool", _warm_password_pool)
+    )
+    try:
+        await asyncio.to_thread(_timed, "schema", lambda: {"up_to_date": check_schema(engine, settings.SCHEMA_CHECK)})
+
+        tasks = [
+            asyncio.to_thread(_timed, "precompile", lambda: precompile(app)),
+            asyncio.to_thread(_timed, "typeahead", load_typeahead),
+        ]
+        pools = {"pool": (engine, async_engine)}
+        if replica_engine is not None:
+            pools["replica_pool"] = (replica_engine, async_replica_engine)
+        for step, (sync_engine, async_engine_) in pools.items():
+            if ASYNC_DB:
+                tasks.append(_warm_async_pool(step, async_engine_))
+            else:
+                tasks.append(asyncio.to_thread(
+                    _timed, step, lambda e=sync_engine: {"connections": prewarm_pool(e, settings.POOL_PREWARM)}
+                ))
+        await asyncio.gather(*tasks)
+    except Exception as e:
+        warmup_state.error = f"{type(e).__name__}: {e}"
+        print("❌ Warm-up failed:", warmup_state.error)
+        if reraise:
+            raise
+        return
+    warmup_state.ready = True
+    print(f"✅ Warm-up finished: {warmup_state.report()['steps']}")
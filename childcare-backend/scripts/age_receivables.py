@@ -0,0 +1,34 @@
+# scripts/age_receivables.py
+# Daily receivables job: mark Unpaid invoices past due_date as Overdue and
+# re-age the receivables ledger (0-30/31-60/61-90/90+ buckets).
+# Schedule it once a day, e.g. from cron:
+#
+#   5 0 * * *  cd /srv/childcare-backend && python scripts/age_receivables.py
+#   python scripts/age_receivables.py --as-of 2025-01-31
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add project root to sys.path to import 'app' module
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from app.database import SessionLocal
+from app.crud.receivables import age_receivables
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mark overdue invoices and re-age receivables")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None, help="YYYY-MM-DD (default: today)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = age_receivables(db, args.as_of)
+        db.commit()
+    finally:
+        db.close()
+    print(
+        f"✅ Receivables aged as of {result['as_of']}: {result['marked_overdue']} invoice(s) marked Overdue, "
+        f"{result['children_owing']} child(ren) owing"
+    )
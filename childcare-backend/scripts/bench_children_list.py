@@ -0,0 +1,138 @@
+# scripts/bench_children_list.py
+# Compare GET /children/ list strategies: the old triple joined eager load
+# serialized as ChildResponse vs. the ChildSummary projection (counts in SQL,
+# optional selectin expansion).
+#
+#   python scripts/bench_children_list.py --children 1000
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add project root to sys.path to import 'app' module
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, joinedload
+
+from app.database import Base
+from app.models import Child, Attendance, HealthRecord, Billing
+from app.schemas.child_schema import ChildResponse, ChildSummary
+from app.crud.child import parse_includes, child_summary_query, child_summary
+
+
+def populate(Session, n_children, days, n_health, n_billing):
+    rng = random.Random(42)
+    start = date.today() - timedelta(days=days)
+    db = Session()
+    children = [Child(name=f"Child {i:05d}", parent_name=f"Parent {i}") for i in range(n_children)]
+    db.add_all(children)
+    db.flush()
+    for child in children:
+        db.add_all(
+            Attendance(child_id=child.id, date=start + timedelta(days=d), status=rng.choice(["Present", "Late", "Absent"]))
+            for d in range(days)
+        )
+        db.add_all(HealthRecord(child_id=child.id, description="checkup", record_date=start) for _ in range(n_health))
+        db.add_all(Billing(child_id=child.id, amount=100, due_date=start) for _ in range(n_billing))
+    db.commit()
+    db.close()
+
+
+class RowCounter:
+    """Counts statements and raw DBAPI rows fetched on an engine."""
+
+    def __init__(self, engine):
+        self.enabled = False
+        self.statements = 0
+        self.rows = 0
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        if not self.enabled:
+            return
+        self.statements += 1
+        # Re-run the statement on a side cursor to count rows without
+        # consuming the ORM's result.
+        if statement.lstrip().upper().startswith("SELECT"):
+            side = conn.connection.dbapi_connection.cursor()
+            side.execute(statement, parameters)
+            self.rows += len(side.fetchall())
+            side.close()
+
+    def reset(self):
+        self.statements = 0
+        self.rows = 0
+
+
+def run(label, Session, counter, fn, repeat):
+    # One counted pass (the side cursor skews timing), then timed passes
+    db = Session()
+    counter.reset()
+    counter.enabled = True
+    fn(db)
+    counter.enabled = False
+    db.close()
+
+    timings = []
+    for _ in range(repeat):
+        db = Session()
+        t0 = time.perf_counter()
+        payload = fn(db)
+        timings.append(time.perf_counter() - t0)
+        db.close()
+    timings.sort()
+    print(
+        f"{label:<34} rows fetched={counter.rows:>9}  statements={counter.statements:>3}  "
+        f"median={timings[len(timings) // 2] * 1000:8.1f} ms  items={len(payload)}"
+    )
+
+
+def before(db):
+    children = (
+        db.query(Child)
+        .options(
+            joinedload(Child.attendance_records),
+            joinedload(Child.health_records),
+            joinedload(Child.billings),
+        )
+        .all()
+    )
+    return [ChildResponse.model_validate(c).model_dump() for c in children]
+
+
+def after_with(include):
+    def fn(db):
+        includes = parse_includes(include)
+        children = child_summary_query(db, includes).order_by(Child.id).all()
+        return [ChildSummary.model_validate(child_summary(c, includes)).model_dump(exclude_unset=True) for c in children]
+    return fn
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GET /children/ list strategies")
+    parser.add_argument("--url", default="sqlite:///bench_children.sqlite")
+    parser.add_argument("--children", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=20, help="attendance rows per child")
+    parser.add_argument("--health", type=int, default=3, help="health records per child")
+    parser.add_argument("--billing", type=int, default=3, help="billing rows per child")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url, future=True)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        if db.query(Child).first() is not None:
+            sys.exit(f"❌ {args.url} already has children; point --url at an empty database")
+
+    print(f"Populating {args.children} children ({args.days} attendance, {args.health} health, {args.billing} billing each)...")
+    populate(Session, args.children, args.days, args.health, args.billing)
+
+    counter = RowCounter(engine)
+    run("before: joined ChildResponse", Session, counter, before, args.repeat)
+    run("after: ChildSummary", Session, counter, after_with(None), args.repeat)
+    run("after: include=attendance,billing", Session, counter, after_with("attendance,billing"), args.repeat)
@@ -0,0 +1,107 @@
+# scripts/bench_cold_start.py
+# Track cold-start regressions: import time of app.main (median of fresh
+# interpreters, plus the slowest modules from -X importtime), and for a real
+# uvicorn process the time from spawn to the first byte of GET /, to
+# GET /health/ready turning 200, and of the first request to --path.
+#
+#   python scripts/bench_cold_start.py --runs 5
+#   STARTUP_MODE=background python scripts/bench_cold_start.py --path /children/ --token <jwt>
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def import_times(runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=project_root,
+                             capture_output=True, text=True, check=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return sorted(timings)
+
+
+def slowest_imports(top: int) -> list:
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=project_root,
+                         capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.strip()))
+    # Cumulative microseconds (a module includes everything it imported first)
+    return sorted(rows, reverse=True)[:top]
+
+
+def get(url: str, token: str = None, timeout: float = 5):
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"} if token else {})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read(1)
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def time_to_first_byte(port: int, path: str, token: str, deadline: float) -> dict:
+    base = f"http://127.0.0.1:{port}"
+    spawned = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=project_root,
+    )
+    result = {}
+    try:
+        while "first_byte" not in result:
+            if server.poll() is not None:
+                sys.exit(f"❌ uvicorn exited with code {server.returncode}")
+            if time.perf_counter() - spawned > deadline:
+                sys.exit("❌ server did not answer in time")
+            try:
+                get(base + "/", timeout=0.5)
+                result["first_byte"] = time.perf_counter() - spawned
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.01)
+        while get(base + "/health/ready") != 200:
+            if time.perf_counter() - spawned > deadline:
+                sys.exit("❌ /health/ready never turned 200")
+            time.sleep(0.01)
+        result["ready"] = time.perf_counter() - spawned
+        if path:
+            started = time.perf_counter()
+            status = get(base + path, token)
+            result[f"first {path} ({status})"] = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure import time and time to first byte")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="", help="authenticated request to time after readiness")
+    parser.add_argument("--token", default=None, help="bearer token for --path")
+    parser.add_argument("--deadline", type=float, default=60)
+    args = parser.parse_args()
+
+    timings = import_times(args.runs)
+    print(f"import app.main      median={timings[len(timings) // 2] * 1000:8.1f} ms  min={timings[0] * 1000:8.1f} ms")
+    for cumulative, name in slowest_imports(args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    ttfb = [time_to_first_byte(args.port, args.path, args.token, args.deadline) for _ in range(args.runs)]
+    for key in ttfb[0]:
+        values = sorted(run[key] for run in ttfb)
+        print(f"{key:<20} median={values[len(values) // 2] * 1000:8.1f} ms  min={values[0] * 1000:8.1f} ms")
@@ -0,0 +1,102 @@
+# scripts/bench_serialization.py
+# Serialize a list of children (ChildResponse: three nested lists each) with
+# the default FastAPI path vs. the FAST_JSON path, without a database or HTTP.
+#
+#   default: validate from attributes -> dump to Python (json mode) -> json.dumps
+#   orjson:  same, but orjson.dumps (ORJSONResponse)
+#   validated: cached TypeAdapter validate -> dump_json in pydantic-core
+#              (the FAST_JSON path for schemas with validators/aliases)
+#   fast:      FAST_JSON direct path, ORM attributes -> orjson, no re-validation
+#   prevalidated: dump_json only (result already a model instance)
+#
+#   python scripts/bench_serialization.py --children 10000
+import argparse
+import json
+import sys
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+# Add project root to sys.path to import 'app' module
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+import orjson
+
+from app.models import Child, Attendance, HealthRecord, Billing
+from app.schemas.child_schema import ChildResponse
+from app.serialization import get_adapter, json_renderer
+
+
+def build_children(n, attendance, health, billing):
+    # Transient ORM objects: attribute access behaves as in a request
+    start = date(2025, 1, 1)
+    children = []
+    for i in range(n):
+        child = Child(id=i + 1, name=f"Child {i:05d}", parent_name=f"Parent {i}", dob=date(2020, 1, 1),
+                      created_at=datetime(2025, 1, 1))
+        child.attendance_records = [
+            Attendance(id=i * attendance + d, child_id=child.id, date=start + timedelta(days=d),
+                       check_in=dtime(8, 30), check_out=dtime(17, 0), status="Present",
+                       created_at=datetime(2025, 1, 1, 8, 30))
+            for d in range(attendance)
+        ]
+        child.health_records = [
+            HealthRecord(id=i * health + h, child_id=child.id, description="Routine checkup",
+                         doctor_name="Dr. Smith", record_date=start, created_at=datetime(2025, 1, 1))
+            for h in range(health)
+        ]
+        child.billings = [
+            Billing(id=i * billing + b, child_id=child.id, amount=Decimal("125.50"), status="Unpaid",
+                    issued_date=start, due_date=start + timedelta(days=15), created_at=datetime(2025, 1, 1))
+            for b in range(billing)
+        ]
+        children.append(child)
+    return children
+
+
+def default_path(adapter, rows):
+    content = adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+    # JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def orjson_path(adapter, rows):
+    content = adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+    return orjson.dumps(content)
+
+
+def timed(label, fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - t0)
+    timings.sort()
+    print(f"{label:<22} median={timings[len(timings) // 2] * 1000:8.1f} ms  bytes={len(body):>10}")
+    return body
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response serialization paths")
+    parser.add_argument("--children", type=int, default=10000)
+    parser.add_argument("--attendance", type=int, default=5, help="attendance rows per child")
+    parser.add_argument("--health", type=int, default=2, help="health records per child")
+    parser.add_argument("--billing", type=int, default=2, help="billing rows per child")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_children(args.children, args.attendance, args.health, args.billing)
+    adapter = get_adapter(List[ChildResponse])
+    render = json_renderer(List[ChildResponse], {})
+    prevalidated = adapter.validate_python(rows, from_attributes=True)
+
+    print(f"{args.children} children ({args.attendance} attendance, {args.health} health, {args.billing} billing each)")
+    expected = json.loads(timed("default (json)", lambda: default_path(adapter, rows), args.repeat))
+    assert json.loads(timed("orjson", lambda: orjson_path(adapter, rows), args.repeat)) == expected
+    validated = lambda: adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    assert json.loads(timed("validated", validated, args.repeat)) == expected
+    assert json.loads(timed("fast", lambda: render(rows), args.repeat)) == expected
+    assert json.loads(timed("prevalidated", lambda: adapter.dump_json(prevalidated), args.repeat)) == expected
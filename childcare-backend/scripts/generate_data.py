@@ -0,0 +1,368 @@
+# scripts/generate_data.py
+# Fill every table with realistic, deterministic synthetic data for local
+# performance work: staff (with logins), children, attendance over N years,
+# monthly billing, health records and activities. The same --seed and --end
+# always produce the same rows. New rows are appended after the existing ids,
+# so it can run on a seeded database (runs seed.py's admin set-up first).
+#
+# Each child is enrolled for a run of consecutive weekdays, so
+# UNIQUE(child_id, date) and UNIQUE(child_id, billing_period) always hold.
+# Rows are loaded with COPY on PostgreSQL/psycopg2 (children in parallel
+# across --workers processes), else executemany (SQLite: one process, it has
+# a single writer). The attendance summaries and receivables ledger are
+# rebuilt at the end.
+#
+#   python scripts/generate_data.py --children 1000
+#   python scripts/generate_data.py --children 50000 --staff 500 --years 5 --attendance 20000000 --workers 8
+import argparse
+import io
+import multiprocessing
+import os
+import random
+import sys
+import time
+from calendar import monthrange
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add project root to sys.path to import 'app' module
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.crud.attendance_summary import rebuild_summaries
+from app.crud.receivables import age_receivables
+from app.database import SessionLocal
+from app.utils import get_password_hash
+from seed import seed_admin
+
+STAFF_PASSWORD = "staff@123"
+
+FIRST_NAMES = (
+    "Olivia", "Liam", "Emma", "Noah", "Amelia", "Oliver", "Ava", "Elijah", "Sophia", "Mateo",
+    "Isabella", "Lucas", "Mia", "Levi", "Harper", "Asher", "Evelyn", "James", "Luna", "Leo",
+    "Aisha", "Kenji", "Priya", "Omar", "Zara", "Diego", "Mei", "Tariq", "Nia", "Ravi",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Khan", "Patel", "Nguyen", "Kim", "Okafor", "Silva", "Müller", "Rossi", "Cohen",
+)
+STREETS = ("Maple St", "Oak Ave", "Pine Rd", "Cedar Ln", "Elm St", "Birch Way", "Willow Ct", "Lake Dr")
+CITIES = ("Springfield", "Riverton", "Lakeside", "Fairview", "Greenville")
+ROOMS = ("Infants", "Toddlers A", "Toddlers B", "Preschool 1", "Preschool 2", "Pre-K", "After School")
+POSITIONS = ("Lead Teacher", "Assistant Teacher", "Caregiver", "Floater", "Cook", "Director")
+ALLERGIES = ("Peanuts", "Tree nuts", "Dairy", "Eggs", "Gluten", "Shellfish", "Pollen")
+CONDITIONS = ("Asthma (inhaler in bag)", "Eczema", "Type 1 diabetes", "Epilepsy", "ADHD")
+DOCTORS = ("Dr. Smith", "Dr. Patel", "Dr. Nguyen", "Dr. Okafor", "Dr. Rossi", "Dr. Kim", None)
+HEALTH_NOTES = (
+    "Routine checkup", "Vaccination (MMR)", "Vaccination (DTaP)", "Mild fever, sent home",
+    "Minor fall on playground, ice pack applied", "Ear infection, on antibiotics",
+    "Vision screening passed", "Hearing screening passed", "Rash observed, parent notified",
+    "Allergic reaction, antihistamine given",
+)
+ACTIVITIES = (
+    ("Story Time", "Picture books and a puppet show"), ("Outdoor Play", "Playground and sandpit"),
+    ("Music & Movement", "Songs, rhythm sticks and dancing"), ("Art & Craft", "Finger painting and collage"),
+    ("Nature Walk", "Leaf and bug spotting around the block"), ("Cooking Club", "Fruit kebabs"),
+    ("Circle Time", "Calendar, weather and sharing"), ("Water Play", None), ("Yoga for Kids", None),
+    ("Field Trip", "Local library visit"),
+)
+
+# Rows generated and loaded per worker task
+CHILDREN_PER_TASK = 500
+
+
+def _name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _phone(rng):
+    return f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+
+
+class Plan:
+    """
+    Calendar and sizes shared by the main process and the workers; every
+    child's rows derive from Random(seed, child index) alone.
+    """
+
+    def __init__(self, args, child_base, staff_base, time_suffix):
+        self.seed = args.seed
+        self.end = args.end
+        self.child_base = child_base
+        self.staff_base = staff_base
+        self.staff = args.staff
+        start = date(args.end.year - args.years, args.end.month, 1)
+        self.days = [start + timedelta(n) for n in range((args.end - start).days + 1)]
+        self.days = [d for d in self.days if d.weekday() < 5]
+        self.day_strings = [d.isoformat() for d in self.days]
+        self.mean_days = min(len(self.days), max(1, args.attendance // max(args.children, 1)))
+        self.mean_health = args.health_records / max(args.children, 1)
+        # SQLite stores TIME as HH:MM:SS.ffffff (what the ORM writes and compares)
+        self.check_ins = [f"{h:02d}:{m:02d}:00{time_suffix}" for h in (7, 8) for m in range(0, 60, 5)]
+        self.late_ins = [f"{h:02d}:{m:02d}:00{time_suffix}" for h in (9, 10) for m in range(15, 60, 5)]
+        self.check_outs = [f"{h:02d}:{m:02d}:00{time_suffix}" for h in (15, 16, 17) for m in range(0, 60, 5)]
+        self.time_suffix = time_suffix
+
+    def rng(self, index, stream):
+        return random.Random(self.seed * 1_000_003 + index * 7 + stream)
+
+    def enrollment(self, index):
+        """
+        -> (first weekday index, number of weekdays, monthly fee) for a child
+        """
+        rng = self.rng(index, 0)
+        length = min(len(self.days), max(1, round(self.mean_days * rng.uniform(0.5, 1.5))))
+        return rng.randrange(len(self.days) - length + 1), length, rng.choice((650, 800, 950, 1100, 1250))
+
+    def child_row(self, index):
+        rng = self.rng(index, 1)
+        first, length, _ = self.enrollment(index)
+        # Two to five years old when enrolled
+        dob = self.days[first] - timedelta(days=rng.randint(2 * 365, 5 * 365))
+        last_name = rng.choice(LAST_NAMES)
+        allergies = ", ".join(rng.sample(ALLERGIES, rng.randint(1, 2))) if rng.random() < 0.15 else None
+        medical = rng.choice(CONDITIONS) if rng.random() < 0.08 else None
+        return (
+            self.child_base + index + 1, f"{rng.choice(FIRST_NAMES)} {last_name}", dob.isoformat(),
+            rng.choice(("Male", "Female")), f"{rng.choice(FIRST_NAMES)} {last_name}", _phone(rng),
+            f"{rng.randint(1, 999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}", allergies, medical,
+        )
+
+    def child_rows(self, index):
+        """
+        -> (attendance, billing, health_records) rows for one child
+        """
+        child_id = self.child_base + index + 1
+        first, length, fee = self.enrollment(index)
+        rng = self.rng(index, 2)
+        rand = rng.random
+        days = self.day_strings
+        check_ins, late_ins, check_outs = self.check_ins, self.late_ins, self.check_outs
+
+        attendance = []
+        for day in range(first, first + length):
+            # 86% Present, 5% Late, 6% Absent, 3% Excused
+            r = rand()
+            if r < 0.86:
+                row = (child_id, days[day], check_ins[int(rand() * len(check_ins))],
+                       check_outs[int(rand() * len(check_outs))], "Present")
+            elif r < 0.91:
+                row = (child_id, days[day], late_ins[int(rand() * len(late_ins))],
+                       check_outs[int(rand() * len(check_outs))], "Late")
+            else:
+                row = (child_id, days[day], None, None, "Absent" if r < 0.97 else "Excused")
+            attendance.append(row)
+
+        billing = []
+        period = self.days[first].replace(day=1)
+        last = self.days[first + length - 1]
+        while period <= last:
+            due = period + timedelta(days=14)
+            if due <= self.end - timedelta(days=30):
+                status = "Paid" if rand() < 0.96 else "Unpaid"
+            elif due <= self.end:
+                status = "Paid" if rand() < 0.5 else "Unpaid"
+            else:
+                status = "Pending"
+            billing.append((child_id, f"{fee}.00", status, period.isoformat(), due.isoformat(), None, period.isoformat()))
+            period = period + timedelta(days=monthrange(period.year, period.month)[1])
+
+        health = []
+        for _ in range(rng.randint(0, round(2 * self.mean_health))):
+            record_date = days[first + rng.randrange(length)]
+            health.append((child_id, rng.choice(HEALTH_NOTES), rng.choice(DOCTORS), record_date))
+        return attendance, billing, health
+
+    def activity_rows(self, per_day):
+        rng = self.rng(-1, 3)
+        rows = []
+        for day in self.day_strings:
+            for _ in range(per_day):
+                title, description = rng.choice(ACTIVITIES)
+                start = rng.randint(18, 30) * 30  # 09:00 - 15:00, half hours
+                end = start + rng.choice((30, 45, 60, 90))
+                staff_id = self.staff_base + rng.randint(1, self.staff) if self.staff and rng.random() < 0.95 else None
+                rows.append((
+                    title, description, day,
+                    f"{start // 60:02d}:{start % 60:02d}:00{self.time_suffix}",
+                    f"{end // 60:02d}:{end % 60:02d}:00{self.time_suffix}",
+                    staff_id,
+                ))
+        return rows
+
+
+TABLE_COLUMNS = {
+    "users": ("id", "name", "email", "password_hash", "role"),
+    "staff": ("id", "user_id", "contact", "position", "assigned_room", "hire_date"),
+    "children": ("id", "name", "dob", "gender", "parent_name", "parent_contact", "address", "allergies", "medical_info"),
+    "attendance": ("child_id", "date", "check_in", "check_out", "status"),
+    "billing": ("child_id", "amount", "status", "issued_date", "due_date", "notes", "billing_period"),
+    "health_records": ("child_id", "description", "doctor_name", "record_date"),
+    "activities": ("title", "description", "scheduled_date", "start_time", "end_time", "assigned_staff_id"),
+}
+
+
+def loader_engine(url):
+    engine = create_engine(url, poolclass=NullPool)
+    if engine.dialect.name == "sqlite":
+        # Generated data can be regenerated: skip the fsync per commit
+        event.listen(engine, "connect", lambda dbapi_connection, record: dbapi_connection.execute("PRAGMA synchronous=OFF"))
+    return engine
+
+
+def _use_copy(conn) -> bool:
+    return conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2"
+
+
+def load_rows(conn, table: str, rows: list) -> int:
+    """
+    Bulk load tuples in TABLE_COLUMNS order: COPY on PostgreSQL/psycopg2,
+    else one executemany.
+    """
+    if not rows:
+        return 0
+    columns = TABLE_COLUMNS[table]
+    if _use_copy(conn):
+        # Generated values never contain tabs, newlines or backslashes
+        buf = io.StringIO()
+        buf.writelines(
+            "\t".join("\\N" if value is None else str(value) for value in row) + "\n" for row in rows
+        )
+        buf.seek(0)
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buf)
+        finally:
+            cursor.close()
+        return len(rows)
+    # Positional DBAPI placeholders: sqlite3 (qmark), psycopg / PyMySQL (format)
+    placeholders = ", ".join(["?" if conn.dialect.paramstyle == "qmark" else "%s"] * len(columns))
+    conn.exec_driver_sql(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+    return len(rows)
+
+
+# --- Worker processes ------------------------------------------------------------
+
+_worker = {}
+
+
+def _init_worker(plan, url):
+    _worker["plan"] = plan
+    _worker["engine"] = loader_engine(url)
+
+
+def _load_children(bounds):
+    """
+    Generate and load attendance, billing and health records for child
+    indexes [lo, hi) in one transaction.
+    """
+    lo, hi = bounds
+    plan = _worker["plan"]
+    attendance, billing, health = [], [], []
+    for index in range(lo, hi):
+        a, b, h = plan.child_rows(index)
+        attendance += a
+        billing += b
+        health += h
+    with _worker["engine"].begin() as conn:
+        return (
+            load_rows(conn, "attendance", attendance),
+            load_rows(conn, "billing", billing),
+            load_rows(conn, "health_records", health),
+        )
+
+
+def _max_id(conn, table):
+    return conn.exec_driver_sql(f"SELECT COALESCE(MAX(id), 0) FROM {table}").scalar()
+
+
+def generate(args):
+    seed_admin()
+    engine = loader_engine(settings.DATABASE_URL)
+    sqlite = engine.dialect.name == "sqlite"
+    started = time.perf_counter()
+
+    with engine.begin() as conn:
+        user_base, staff_base, child_base = (_max_id(conn, t) for t in ("users", "staff", "children"))
+        plan = Plan(args, child_base, staff_base, ".000000" if sqlite else "")
+
+        rng = plan.rng(-1, 4)
+        password_hash = get_password_hash(STAFF_PASSWORD)
+        users, staff = [], []
+        for n in range(1, args.staff + 1):
+            user_id = user_base + n
+            users.append((user_id, _name(rng), f"staff{user_id}.generated@childcare.com", password_hash, "staff"))
+            hired = plan.days[0] - timedelta(days=rng.randint(0, 3650))
+            staff.append((staff_base + n, user_id, _phone(rng), rng.choice(POSITIONS), rng.choice(ROOMS), hired.isoformat()))
+        load_rows(conn, "users", users)
+        load_rows(conn, "staff", staff)
+        load_rows(conn, "children", [plan.child_row(index) for index in range(args.children)])
+        activities = load_rows(conn, "activities", plan.activity_rows(args.activities_per_day))
+        if conn.dialect.name == "postgresql":
+            # Explicit ids above: move the SERIAL sequences past them
+            for table in ("users", "staff", "children"):
+                conn.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                )
+    print(f"✅ {args.staff} staff, {args.children} children, {activities} activities "
+          f"({len(plan.days)} weekdays from {plan.days[0]} to {plan.days[-1]})")
+
+    tasks = [(lo, min(lo + CHILDREN_PER_TASK, args.children)) for lo in range(0, args.children, CHILDREN_PER_TASK)]
+    workers = 1 if sqlite else max(1, args.workers)
+    totals = [0, 0, 0]
+
+    def progress(counts):
+        for i, count in enumerate(counts):
+            totals[i] += count
+        elapsed = time.perf_counter() - started
+        print(f"   {totals[0]:>12,} attendance  {totals[1]:>10,} billing  {totals[2]:>9,} health records"
+              f"  ({totals[0] / elapsed:,.0f} attendance rows/s)", end="\r")
+
+    if workers == 1:
+        _init_worker(plan, settings.DATABASE_URL)
+        for bounds in tasks:
+            progress(_load_children(bounds))
+    else:
+        # spawn: workers open their own connections instead of inheriting the pool's
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(workers, initializer=_init_worker, initargs=(plan, settings.DATABASE_URL)) as pool:
+            for counts in pool.imap_unordered(_load_children, tasks):
+                progress(counts)
+    print()
+    print(f"✅ Loaded {totals[0]:,} attendance, {totals[1]:,} billing and {totals[2]:,} health records "
+          f"with {workers} worker(s) in {time.perf_counter() - started:.1f}s")
+
+    db = SessionLocal()
+    try:
+        summaries = rebuild_summaries(db)
+        receivables = age_receivables(db, args.end)
+        db.commit()
+    finally:
+        db.close()
+    print(f"✅ Rebuilt {summaries['monthly_rows']} monthly attendance summaries; "
+          f"{receivables['marked_overdue']} invoice(s) overdue, {receivables['children_owing']} child(ren) owing; "
+          f"total {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic data at scale")
+    parser.add_argument("--children", type=int, default=1000)
+    parser.add_argument("--staff", type=int, default=50)
+    parser.add_argument("--years", type=int, default=1, help="attendance history length")
+    parser.add_argument("--attendance", type=int, default=None, help="approximate attendance rows (default: 200 per child)")
+    parser.add_argument("--health-records", type=int, default=None, help="approximate total (default: 3 per child)")
+    parser.add_argument("--activities-per-day", type=int, default=4)
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="last day of history, YYYY-MM-DD")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="loader processes (PostgreSQL only)")
+    args = parser.parse_args()
+    if args.attendance is None:
+        args.attendance = args.children * 200
+    if args.health_records is None:
+        args.health_records = args.children * 3
+    generate(args)
@@ -0,0 +1,47 @@
+# scripts/import_data.py
+# Bulk import children, staff or historical attendance from CSV/XLSX.
+#
+#   python scripts/import_data.py children children.csv
+#   python scripts/import_data.py staff staff.xlsx
+#   python scripts/import_data.py attendance attendance_2019_2024.csv --dry-run
+#
+# Columns follow the API schemas (ChildCreate, StaffCreate, AttendanceCreate).
+# Staff rows may give user_email instead of user_id; attendance rows may give
+# child_name instead of child_id.
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to sys.path to import 'app' module
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from app.database import SessionLocal
+from app.crud.importer import run_import, read_rows, IMPORT_KINDS
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import CSV/XLSX data")
+    parser.add_argument("kind", choices=IMPORT_KINDS)
+    parser.add_argument("path")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, load nothing")
+    parser.add_argument("--errors", type=int, default=20, help="row errors to print")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as fileobj:
+            report = run_import(db, args.kind, read_rows(fileobj, args.path), dry_run=args.dry_run)
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{'🔎 Validated' if args.dry_run else '✅ Imported'} {args.kind}: "
+        f"read={report['rows_read']} valid={report['rows_valid']} inserted={report['inserted']} "
+        f"duplicates={report['skipped_duplicates']} errors={report['errors_total']} "
+        f"in {elapsed:.1f}s"
+    )
+    for err in report["errors"][:args.errors]:
+        print(f"  row {err['row']}: {err['error']}")
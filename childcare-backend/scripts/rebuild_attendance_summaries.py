@@ -0,0 +1,38 @@
+# scripts/rebuild_attendance_summaries.py
+# Recompute the attendance reporting tables (attendance_monthly_summary,
+# attendance_daily_summary) from the raw attendance rows. The API keeps them
+# up to date on every write; run this after loading attendance outside the
+# API or to repair drift. Dates are widened to whole months.
+#
+#   python scripts/rebuild_attendance_summaries.py
+#   python scripts/rebuild_attendance_summaries.py --from 2024-01-01 --to 2024-06-30
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Add project root to sys.path to import 'app' module
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from app.database import SessionLocal
+from app.crud.attendance_summary import rebuild_summaries
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild attendance summary tables")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="YYYY-MM-DD")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        counts = rebuild_summaries(db, args.date_from, args.date_to)
+        db.commit()
+    finally:
+        db.close()
+    print(
+        f"✅ Rebuilt {counts['monthly_rows']} monthly and {counts['daily_rows']} daily rows "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
@@ -6,33 +6,41 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.append(str(project_root))
 
-from app.database import engine, Base, SessionLocal
+from app.database import SessionLocal
+from app.migrations import upgrade_to_head
 from app.models.user import User
 from app.utils import get_password_hash
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
-
-# Open DB session
-db = SessionLocal()
-
 # Admin credentials
 ADMIN_EMAIL = "admin@childcare.com"
 ADMIN_PASSWORD = "hello@123"
 
-# Check if admin exists
-admin_user = db.query(User).filter(User.email == ADMIN_EMAIL).first()
-if not admin_user:
-    admin = User(
-        name="Admin",
-        email=ADMIN_EMAIL,
-        password_hash=get_password_hash(ADMIN_PASSWORD),
-        role="admin"
-    )
-    db.add(admin)
-    db.commit()
-    print(f"✅ Admin user created: {ADMIN_EMAIL} / {ADMIN_PASSWORD}")
-else:
-    print("ℹ️ Admin user already exists")
-
-db.close()
+
+def seed_admin():
+    # Create / migrate the schema (alembic upgrade head)
+    upgrade_to_head()
+
+    # Open DB session
+    db = SessionLocal()
+
+    # Check if admin exists
+    admin_user = db.query(User).filter(User.email == ADMIN_EMAIL).first()
+    if not admin_user:
+        admin = User(
+            name="Admin",
+            email=ADMIN_EMAIL,
+            password_hash=get_password_hash(ADMIN_PASSWORD),
+            role="admin"
+        )
+        db.add(admin)
+        db.commit()
+        print(f"✅ Admin user created: {ADMIN_EMAIL} / {ADMIN_PASSWORD}")
+    else:
+        print("ℹ️ Admin user already exists")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    # Local data at production scale: scripts/generate_data.py (runs this first)
+    seed_admin()
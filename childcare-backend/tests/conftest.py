@@ -0,0 +1,59 @@
+# tests/conftest.py
+import os
+import sqlite3
+import sys
+import tempfile
+
+import pytest
+
+# Two local SQLite files stand in for the primary and the read replica.
+# app.config reads the environment at import time, so set it up first.
+_DB_DIR = tempfile.mkdtemp(prefix="childcare-tests-")
+PRIMARY_PATH = os.path.join(_DB_DIR, "primary.db")
+REPLICA_PATH = os.path.join(_DB_DIR, "replica.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{PRIMARY_PATH}"
+os.environ["DATABASE_REPLICA_URL"] = f"sqlite:///{REPLICA_PATH}"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("ASYNC_DATABASE_REPLICA_URL", None)
+os.environ.pop("CACHE_REDIS_URL", None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def replicate():
+    """
+    Bring the replica up to date with the primary (what streaming
+    replication does continuously; until then the replica lags).
+    """
+    with sqlite3.connect(PRIMARY_PATH) as primary, sqlite3.connect(REPLICA_PATH) as replica:
+        primary.backup(replica)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.migrations import upgrade_to_head
+    from app.main import app
+
+    upgrade_to_head()
+    replicate()
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def login(client):
+    """
+    login(name) -> (auth headers, user id) of an admin registered on the
+    primary and replicated.
+    """
+    def login(name: str):
+        email = f"{name}@example.com"
+        user = client.post("/auth/register", json={"name": name, "email": email, "password": "pw", "role": "admin"})
+        assert user.status_code == 200, user.text
+        token = client.post("/auth/login", json={"email": email, "password": "pw"}).json()["access_token"]
+        replicate()
+        return {"Authorization": f"Bearer {token}"}, user.json()["id"]
+
+    return login
@@ -0,0 +1,83 @@
+# tests/test_attendance_bulk.py
+import pytest
+
+from app.database import recent_writers
+from app.routers.attendance import MAX_BULK_ENTRIES
+from conftest import replicate
+
+BULK = "/attendance/bulk"
+
+
+@pytest.fixture(autouse=True)
+def caught_up():
+    yield
+    replicate()
+    recent_writers.clear()
+
+
+@pytest.fixture(scope="module")
+def staff(login):
+    return login("rollcall")[0]
+
+
+def _child(client, headers, name: str) -> int:
+    return client.post("/children/", json={"name": name}, headers=headers).json()["id"]
+
+
+def _monthly(client, headers, child_id: int) -> dict:
+    rows = client.get("/reports/attendance/monthly", params={"child_id": child_id}, headers=headers).json()
+    return {row["month"]: {k: row[k] for k in ("present", "late", "absent", "excused")} for row in rows}
+
+
+def test_superseded_and_unknown_entries_fail(client, staff):
+    child_id = _child(client, staff, "Twice listed")
+    entries = [
+        {"child_id": child_id, "date": "2025-03-03", "status": "Present"},
+        {"child_id": child_id, "date": "2025-03-03", "status": "Late"},
+        {"child_id": 999999, "date": "2025-03-03"},
+    ]
+    body = client.post(BULK, json=entries, headers=staff).json()
+
+    assert (body["saved"], body["failed"]) == (1, 2)
+    first, second, unknown = body["results"]
+    assert not first["ok"] and first["error"].startswith("Superseded")
+    assert second["ok"] and second["id"]
+    assert not unknown["ok"] and unknown["error"] == "Child not found"
+
+    records = client.get("/attendance/", params={"child_id": child_id}, headers=staff).json()
+    assert [(r["id"], r["status"]) for r in records] == [(second["id"], "Late")]
+    assert _monthly(client, staff, child_id) == {"2025-03-01": {"present": 0, "late": 1, "absent": 0, "excused": 0}}
+
+
+def test_entry_limit(client, staff):
+    child_id = _child(client, staff, "Too many")
+    entries = [{"child_id": child_id, "date": "2025-04-01"}] * (MAX_BULK_ENTRIES + 1)
+    response = client.post(BULK, json=entries, headers=staff)
+
+    assert response.status_code == 400
+    assert client.get("/attendance/", params={"child_id": child_id}, headers=staff).json() == []
+
+
+def test_existing_record_is_updated_and_summaries_move(client, staff):
+    child_id = _child(client, staff, "Checked in")
+    existing = client.post(
+        "/attendance/", json={"child_id": child_id, "date": "2025-05-02", "check_in": "08:30:00"}, headers=staff
+    ).json()
+    entries = [
+        {"child_id": child_id, "date": "2025-05-02", "check_in": "08:30:00", "check_out": "16:00:00", "status": "Late"},
+        {"child_id": child_id, "date": "2025-05-05", "status": "Absent"},
+        {"child_id": child_id, "date": "2025-06-02", "status": "Excused"},
+    ]
+    body = client.post(BULK, json=entries, headers=staff).json()
+
+    assert (body["saved"], body["failed"]) == (3, 0)
+    assert body["results"][0]["id"] == existing["id"]
+    records = {r["date"]: r for r in client.get("/attendance/", params={"child_id": child_id}, headers=staff).json()}
+    assert len(records) == 3
+    assert (records["2025-05-02"]["status"], records["2025-05-02"]["check_out"]) == ("Late", "16:00:00")
+
+    # The overwritten Present moved to Late instead of being counted twice
+    assert _monthly(client, staff, child_id) == {
+        "2025-05-01": {"present": 0, "late": 1, "absent": 1, "excused": 0},
+        "2025-06-01": {"present": 0, "late": 0, "absent": 0, "excused": 1},
+    }
@@ -0,0 +1,71 @@
+# tests/test_attendance_summary.py
+from datetime import date
+
+from sqlalchemy import select
+
+from app.crud.attendance_summary import COUNT_COLUMNS, rebuild_summaries
+from app.database import SessionLocal, recent_writers
+from app.models.attendance_summary import AttendanceDailySummary, AttendanceMonthlySummary
+from conftest import replicate
+
+# Months no other test writes attendance for
+FIRST_DAY, LAST_DAY = date(2024, 7, 1), date(2024, 8, 31)
+
+
+def _summaries(db) -> tuple:
+    """
+    Both summary tables over FIRST_DAY..LAST_DAY; rows whose counts all
+    went back to 0 are the same as no row.
+    """
+    def counts(table, keys):
+        columns = [getattr(table, c) for c in COUNT_COLUMNS]
+        rows = db.execute(select(*keys, *columns).where(keys[-1].between(FIRST_DAY, LAST_DAY))).all()
+        return sorted(tuple(row) for row in rows if any(row[len(keys):]))
+
+    monthly = counts(AttendanceMonthlySummary, [AttendanceMonthlySummary.child_id, AttendanceMonthlySummary.month])
+    daily = counts(AttendanceDailySummary, [AttendanceDailySummary.date])
+    return monthly, daily
+
+
+def test_incremental_summaries_match_rebuild(client, login):
+    headers, _ = login("summaries")
+
+    def call(method, url, body=None):
+        response = client.request(method, url, json=body, headers=headers)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    first, second, leaving = (call("POST", "/children/", {"name": name})["id"] for name in ("Summed", "Moved to", "Leaving"))
+
+    def record(child_id, day, status="Present"):
+        return call("POST", "/attendance/", {"child_id": child_id, "date": day, "status": status})["id"]
+
+    # Create
+    changed = record(first, "2024-07-01")
+    moved = record(first, "2024-07-02", "Late")
+    deleted = record(first, "2024-07-03", "Absent")
+    record(leaving, "2024-07-01", "Excused")
+    # Update: status, date across months, child
+    call("PUT", f"/attendance/{changed}", {"status": "Absent"})
+    call("PUT", f"/attendance/{moved}", {"date": "2024-08-30"})
+    call("PUT", f"/attendance/{moved}", {"child_id": second})
+    # Delete, and a deleted child's records
+    call("DELETE", f"/attendance/{deleted}")
+    call("DELETE", f"/children/{leaving}")
+    # Bulk: new rows, and an overwrite of an existing one
+    assert call("POST", "/attendance/bulk", [
+        {"child_id": first, "date": "2024-07-01", "status": "Excused"},
+        {"child_id": second, "date": "2024-07-01", "status": "Present"},
+        {"child_id": second, "date": "2024-08-01", "status": "Late"},
+    ])["failed"] == 0
+
+    with SessionLocal() as db:
+        incremental = _summaries(db)
+        rebuild_summaries(db, FIRST_DAY, LAST_DAY)
+        rebuilt = _summaries(db)
+        db.rollback()
+
+    assert incremental == rebuilt
+    assert rebuilt[0]  # the writes above did land in the summaries
+    replicate()
+    recent_writers.clear()
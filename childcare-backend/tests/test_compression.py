@@ -0,0 +1,33 @@
+# tests/test_compression.py
+import gzip
+import os
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.compression import CompressionMiddleware
+
+TEXT = b"child,date,status\n" * 500
+GZIPPED = gzip.compress(TEXT + os.urandom(2048))
+
+
+def _client() -> TestClient:
+    app = Starlette(routes=[
+        Route("/text", lambda request: Response(TEXT, media_type="text/csv")),
+        Route("/file", lambda request: Response(GZIPPED, media_type="application/gzip")),
+    ])
+    return TestClient(CompressionMiddleware(app, minimum_size=100))
+
+
+def test_compresses_text():
+    response = _client().get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == TEXT
+
+
+def test_passes_compressed_files_through():
+    response = _client().get("/file", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.content == GZIPPED
@@ -0,0 +1,40 @@
+# tests/test_live.py
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.database import recent_writers
+from conftest import replicate
+
+
+@pytest.fixture(autouse=True)
+def caught_up():
+    yield
+    replicate()
+    recent_writers.clear()
+
+
+@pytest.fixture(scope="module")
+def token(login):
+    return login("watcher")[0]["Authorization"][7:]
+
+
+def test_room_filter_rejected_for_roomless_events(client, token):
+    for types in ("attendance", "health_record", "activity,attendance"):
+        response = client.get("/live/events", params={"token": token, "types": types, "room": "Blue"})
+        assert response.status_code == 400, types
+        assert "child_id=" in response.json()["detail"]
+
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect(f"/live/ws?token={token}&types=attendance&room=Blue") as ws:
+            ws.receive_text()
+    assert closed.value.code == 1008
+
+
+def test_attendance_followed_by_child_alongside_room(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    child_id = client.post("/children/", json={"name": "Followed"}, headers=headers).json()["id"]
+
+    with client.websocket_connect(f"/live/ws?token={token}&types=attendance&room=Blue&child_id={child_id}") as ws:
+        client.post("/attendance/", json={"child_id": child_id, "date": "2025-09-01", "check_in": "08:00:00"}, headers=headers)
+        event = ws.receive_json()
+    assert (event["type"], event["action"], event["child_id"]) == ("attendance", "check_in", child_id)
@@ -0,0 +1,154 @@
+# tests/test_migrations.py
+import argparse
+from datetime import date
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.crud.attendance import upsert_attendance
+from app.migrations import alembic_config
+from app.models.billing import Billing
+from app.models.child import Child
+from app.models.user import User
+
+
+def _baseline_create_all(url: str):
+    """
+    The tables as the API's create_all made them before migrations existed
+    (no photo_url / billing_period, no unique or check constraints).
+    """
+    metadata = sa.MetaData()
+    sa.Table(
+        "users", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("email", sa.String(255), unique=True, index=True, nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("role", sa.String(32), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    sa.Table(
+        "staff", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("contact", sa.String(50)),
+        sa.Column("position", sa.String(100)),
+        sa.Column("assigned_room", sa.String(100)),
+        sa.Column("hire_date", sa.Date),
+    )
+    sa.Table(
+        "children", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("dob", sa.Date),
+        sa.Column("gender", sa.String(20)),
+        sa.Column("parent_name", sa.String(255)),
+        sa.Column("parent_contact", sa.String(100)),
+        sa.Column("address", sa.Text),
+        sa.Column("allergies", sa.Text),
+        sa.Column("medical_info", sa.Text),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    sa.Table(
+        "attendance", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("child_id", sa.Integer, sa.ForeignKey("children.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("date", sa.Date, nullable=False),
+        sa.Column("check_in", sa.Time),
+        sa.Column("check_out", sa.Time),
+        sa.Column("status", sa.String(32)),
+        sa.Column("created_at", sa.DateTime),
+    )
+    sa.Table(
+        "health_records", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("child_id", sa.Integer, sa.ForeignKey("children.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("description", sa.Text, nullable=False),
+        sa.Column("doctor_name", sa.String(255)),
+        sa.Column("record_date", sa.Date),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    sa.Table(
+        "activities", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text),
+        sa.Column("scheduled_date", sa.Date),
+        sa.Column("start_time", sa.Time),
+        sa.Column("end_time", sa.Time),
+        sa.Column("assigned_staff_id", sa.Integer, sa.ForeignKey("staff.id", ondelete="SET NULL")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    sa.Table(
+        "billing", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("child_id", sa.Integer, sa.ForeignKey("children.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("amount", sa.Numeric(10, 2), nullable=False),
+        sa.Column("status", sa.String(32), nullable=False),
+        sa.Column("issued_date", sa.Date),
+        sa.Column("due_date", sa.Date),
+        sa.Column("notes", sa.Text),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    engine = sa.create_engine(url)
+    metadata.create_all(engine)
+    return engine
+
+
+def _upgrade(url: str):
+    from alembic import command
+    config = alembic_config()
+    config.cmd_opts = argparse.Namespace(x=[f"url={url}"])
+    command.upgrade(config, "head")
+
+
+@pytest.fixture
+def upgraded(tmp_path):
+    url = f"sqlite:///{tmp_path / 'create_all.db'}"
+    engine = _baseline_create_all(url)
+    with engine.begin() as conn:
+        conn.execute(sa.text("INSERT INTO children (name) VALUES ('Existing')"))
+    _upgrade(url)
+    yield engine
+    engine.dispose()
+
+
+def test_upgrade_adds_missing_columns_and_constraints(upgraded):
+    inspector = sa.inspect(upgraded)
+    assert "photo_url" in {c["name"] for c in inspector.get_columns("children")}
+    assert "billing_period" in {c["name"] for c in inspector.get_columns("billing")}
+    assert {"attendance_child_id_date_key"} <= {u["name"] for u in inspector.get_unique_constraints("attendance")}
+    assert {"billing_child_id_billing_period_key"} <= {u["name"] for u in inspector.get_unique_constraints("billing")}
+    assert {"users_role_check"} <= {c["name"] for c in inspector.get_check_constraints("users")}
+
+
+def test_upgraded_database_serves_the_models(upgraded):
+    with Session(upgraded) as db:
+        child = db.query(Child).filter(Child.name == "Existing").one()
+        db.add(Billing(child_id=child.id, amount=10, status="Unpaid", billing_period=date(2025, 1, 1)))
+        db.commit()
+        assert [b.billing_period for b in db.get(Child, child.id).billings] == [date(2025, 1, 1)]
+
+        # The bulk roll-call upsert needs the (child_id, date) unique constraint
+        row = {"child_id": child.id, "date": date(2025, 1, 2), "check_in": None, "check_out": None}
+        first = upsert_attendance(db, [{**row, "status": "Present"}])
+        second = upsert_attendance(db, [{**row, "status": "Late"}])
+        db.commit()
+        assert first == second
+
+        db.add(User(name="X", email="x@example.com", password_hash="-", role="superuser"))
+        with pytest.raises(IntegrityError):
+            db.commit()
+
+
+def test_upgrade_refuses_duplicate_attendance(tmp_path):
+    url = f"sqlite:///{tmp_path / 'duplicates.db'}"
+    engine = _baseline_create_all(url)
+    with engine.begin() as conn:
+        conn.execute(sa.text("INSERT INTO children (id, name) VALUES (1, 'Twice')"))
+        conn.execute(sa.text("INSERT INTO attendance (child_id, date) VALUES (1, '2025-01-02'), (1, '2025-01-02')"))
+    engine.dispose()
+    with pytest.raises(RuntimeError, match="duplicated"):
+        _upgrade(url)
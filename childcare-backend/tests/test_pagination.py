@@ -0,0 +1,35 @@
+# tests/test_pagination.py
+from datetime import date
+
+from app.database import SessionLocal
+from app.models.child import Child
+from app.models.health_record import HealthRecord
+from app.pagination import keyset_page
+from conftest import replicate
+
+
+def test_keyset_pages_cover_nulls_last_order(client):
+    with SessionLocal() as db:
+        child = Child(name="Paged")
+        db.add(child)
+        db.flush()
+        days = [date(2025, 1, 3), None, date(2025, 1, 1), date(2025, 1, 3), None, date(2025, 1, 2)] * 3
+        db.add_all(HealthRecord(child_id=child.id, description="x", record_date=day) for day in days)
+        db.commit()
+
+        query = db.query(HealthRecord).filter(HealthRecord.child_id == child.id)
+        expected = sorted(query.all(), key=lambda r: (r.record_date is None, r.record_date or date.min, r.id))
+
+        seen, cursor = [], None
+        while True:
+            page = keyset_page(query, [HealthRecord.record_date, HealthRecord.id], cursor, 4)
+            seen += page["items"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert [r.id for r in seen] == [r.id for r in expected]
+
+        query.delete()
+        db.delete(child)
+        db.commit()
+    replicate()
@@ -0,0 +1,124 @@
+# tests/test_receivables.py
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.crud.receivables import mark_overdue, rebuild_receivables, refresh_receivables
+from app.database import SessionLocal, recent_writers
+from app.models.billing import Billing
+from app.models.child import Child
+from app.models.receivable import Receivable
+from conftest import replicate
+
+AS_OF = date(2025, 6, 30)
+BUCKETS = ("aged_0_30", "aged_31_60", "aged_61_90", "aged_90_plus")
+
+
+@pytest.fixture(autouse=True)
+def caught_up():
+    yield
+    replicate()
+    recent_writers.clear()
+
+
+@pytest.fixture(scope="module")
+def admin(login):
+    return login("receivables")[0]
+
+
+def _ledger(db, child_id) -> dict:
+    row = db.get(Receivable, child_id, populate_existing=True)
+    if row is None:
+        return None
+    return {"balance": row.balance, "open_invoices": row.open_invoices, **{b: getattr(row, b) for b in BUCKETS}}
+
+
+def _child_with_invoices(db, *invoices) -> int:
+    child = Child(name="Billed")
+    db.add(child)
+    db.flush()
+    db.add_all(Billing(child_id=child.id, amount=amount, status=status, due_date=due) for amount, status, due in invoices)
+    db.flush()
+    return child.id
+
+
+def test_aging_buckets(client):
+    days_past_due = lambda n: AS_OF - timedelta(days=n)
+    with SessionLocal() as db:
+        child_id = _child_with_invoices(
+            db,
+            (1, "Unpaid", None),                  # no due date: 0-30
+            (2, "Unpaid", days_past_due(-5)),     # not yet due: 0-30
+            (4, "Pending", days_past_due(30)),
+            (8, "Overdue", days_past_due(31)),
+            (16, "Unpaid", days_past_due(60)),
+            (32, "Unpaid", days_past_due(61)),
+            (64, "Overdue", days_past_due(90)),
+            (128, "Overdue", days_past_due(91)),
+            (256, "Paid", days_past_due(200)),    # settled: not owed
+        )
+        refresh_receivables(db, [child_id], AS_OF)
+
+        assert _ledger(db, child_id) == {
+            "balance": Decimal(255), "open_invoices": 8,
+            "aged_0_30": Decimal(7), "aged_31_60": Decimal(24), "aged_61_90": Decimal(96), "aged_90_plus": Decimal(128),
+        }
+        assert db.get(Receivable, child_id).oldest_due_date == days_past_due(91)
+        db.rollback()
+
+
+def test_billing_writes_refresh_the_ledger(client, admin):
+    def balance(child_id):
+        rows = client.get("/billing/receivables", params={"child_id": child_id}, headers=admin).json()
+        return [Decimal(row["balance"]) for row in rows]
+
+    first, second = (client.post("/children/", json={"name": name}, headers=admin).json()["id"] for name in ("Owes", "Takes over"))
+    invoice = {"child_id": first, "amount": "40.00", "due_date": "2025-06-01"}
+    billing_id = client.post("/billing/", json=invoice, headers=admin).json()["id"]
+    client.post("/billing/", json={**invoice, "amount": "2.50"}, headers=admin)
+    assert balance(first) == [Decimal("42.50")]
+
+    client.put(f"/billing/{billing_id}", json={**invoice, "child_id": second}, headers=admin)
+    assert (balance(first), balance(second)) == ([Decimal("2.50")], [Decimal("40.00")])
+
+    client.put(f"/billing/{billing_id}", json={**invoice, "child_id": second, "status": "Paid"}, headers=admin)
+    assert balance(second) == []
+
+    client.delete(f"/billing/{billing_id}", headers=admin)
+    other = client.get("/billing/", params={"child_id": first}, headers=admin).json()
+    for row in other:
+        client.delete(f"/billing/{row['id']}", headers=admin)
+    assert balance(first) == []
+
+
+def test_mark_overdue(client):
+    with SessionLocal() as db:
+        child_id = _child_with_invoices(
+            db,
+            (1, "Unpaid", AS_OF - timedelta(days=1)),
+            (2, "Unpaid", AS_OF),
+            (4, "Unpaid", None),
+            (8, "Pending", AS_OF - timedelta(days=1)),
+            (16, "Paid", AS_OF - timedelta(days=1)),
+        )
+        assert mark_overdue(db, AS_OF) >= 1
+        statuses = dict(db.query(Billing.amount, Billing.status).filter(Billing.child_id == child_id))
+        assert {int(amount): status for amount, status in statuses.items()} == {
+            1: "Overdue", 2: "Unpaid", 4: "Unpaid", 8: "Pending", 16: "Paid",
+        }
+        db.rollback()
+
+
+def test_rebuild_matches_refresh_and_drops_settled_children(client):
+    with SessionLocal() as db:
+        owing = _child_with_invoices(db, (10, "Unpaid", AS_OF - timedelta(days=45)), (5, "Unpaid", None))
+        settled = _child_with_invoices(db, (7, "Unpaid", AS_OF))
+        refresh_receivables(db, [owing, settled], AS_OF)
+        refreshed = _ledger(db, owing)
+
+        db.query(Billing).filter(Billing.child_id == settled).update({"status": "Paid"})
+        assert rebuild_receivables(db, AS_OF) >= 1
+        assert _ledger(db, owing) == refreshed
+        assert _ledger(db, settled) is None
+        db.rollback()
@@ -0,0 +1,105 @@
+# tests/test_replica.py
+import pytest
+
+from app.database import ReplicaSessionLocal, SessionLocal, recent_writers
+from app.models.child import Child
+from conftest import replicate
+
+
+@pytest.fixture(autouse=True)
+def caught_up():
+    # Each test starts with the replica in sync and no read-your-writes windows
+    yield
+    replicate()
+    recent_writers.clear()
+
+
+@pytest.fixture(scope="module")
+def writer(login):
+    return login("writer")
+
+
+@pytest.fixture(scope="module")
+def reader(login):
+    return login("reader")
+
+
+def _add_child_on_primary(name: str) -> int:
+    # A write no API user made (another worker, a script): opens no read-your-writes window
+    with SessionLocal() as db:
+        child = Child(name=name)
+        db.add(child)
+        db.commit()
+        return child.id
+
+
+def test_get_reads_from_replica(client, reader):
+    headers, _ = reader
+    child_id = _add_child_on_primary("Lagging")
+
+    assert client.get(f"/children/{child_id}", headers=headers).status_code == 404
+    replicate()
+    assert client.get(f"/children/{child_id}", headers=headers).json()["name"] == "Lagging"
+
+
+def test_writes_go_to_primary(client, reader):
+    headers, _ = reader
+    child_id = _add_child_on_primary("Primary only")
+
+    response = client.put(f"/children/{child_id}", json={"name": "Renamed"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+
+
+def test_writer_reads_own_writes(client, writer, reader):
+    headers, user_id = writer
+    child_id = client.post("/children/", json={"name": "Mine"}, headers=headers).json()["id"]
+
+    # Within the window the writer reads the primary; everyone else the replica
+    assert client.get(f"/children/{child_id}", headers=headers).status_code == 200
+    assert client.get(f"/children/{child_id}", headers=reader[0]).status_code == 404
+
+    # Window over: back to the (still lagging) replica
+    recent_writers.delete(user_id)
+    assert client.get(f"/children/{child_id}", headers=headers).status_code == 404
+
+
+def test_replica_etag_matches_replica_body(client, writer):
+    headers, user_id = writer
+    # Uncompressed: a compressed list would carry the weak form of the ETag
+    headers = {**headers, "Accept-Encoding": "identity"}
+    child_id = client.post("/children/", json={"name": "Tagged"}, headers=headers).json()["id"]
+    primary_etag = client.get(f"/children/{child_id}", headers=headers).headers["etag"]
+
+    # The replica hasn't got the write: no 304 for the primary's ETag, and
+    # the replica's own (older) ETag for its body
+    recent_writers.delete(user_id)
+    response = client.get("/children/", headers={**headers, "If-None-Match": primary_etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != primary_etag
+    assert child_id not in [child["id"] for child in response.json()]
+    replica_etag = response.headers["etag"]
+    assert client.get("/children/", headers={**headers, "If-None-Match": replica_etag}).status_code == 304
+
+    # Caught up: the replica's versions now match the primary's
+    replicate()
+    response = client.get("/children/", headers={**headers, "If-None-Match": replica_etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] == primary_etag
+    assert child_id in [child["id"] for child in response.json()]
+
+
+def test_new_user_authenticates_before_replication(client):
+    client.post("/auth/register", json={"name": "New", "email": "new@example.com", "password": "pw", "role": "admin"})
+    token = client.post("/auth/login", json={"email": "new@example.com", "password": "pw"}).json()["access_token"]
+
+    # The replica has no users row yet: the principal is looked up on the primary
+    response = client.get("/children/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+
+def test_replica_session_refuses_writes():
+    with ReplicaSessionLocal() as db:
+        db.add(Child(name="Nope"))
+        with pytest.raises(RuntimeError):
+            db.flush()
@@ -0,0 +1,38 @@
+# tests/test_typeahead.py
+from app.typeahead import TypeaheadIndex, child_entry
+
+
+def _synced_index(versions: dict) -> TypeaheadIndex:
+    index = TypeaheadIndex()
+    index._synced.update(versions)
+    return index
+
+
+def test_own_commit_advances_without_reload():
+    index = _synced_index({"children": 4})
+    index.upsert(child_entry(1, "Own", None))
+    index._on_version("children", 5, True)
+    assert index._synced["children"] == 5
+    assert not index._stale
+
+
+def test_other_writers_make_the_kind_stale():
+    index = _synced_index({"children": 4, "users": 2, "staff": 1})
+    index._on_version("users", 3, False)
+    assert index._stale == {"user"}
+
+    # Own commit after someone else's: the entries miss the other write
+    index._on_version("children", 6, True)
+    assert index._stale == {"user", "child"}
+
+    # Versions the entries already reflect (e.g. the feed reloading)
+    index = _synced_index({"children": 4})
+    index._on_version("children", 4, False)
+    assert not index._stale
+
+
+def test_change_applied_during_reload_reloads_again():
+    index = _synced_index({"children": 4})
+    index._loading.add("child")
+    index.delete("child", 1)
+    assert index._stale == {"child"}
@@ -0,0 +1,51 @@
+# tests/test_version_feed.py
+from app.versions import VersionFeed
+
+OWN_PID, OTHER_PID = 101, 202
+
+
+def _following(versions: dict) -> tuple:
+    feed = VersionFeed()
+    bumps = []
+    feed.add_listener(lambda table, version, own: bumps.append((table, version, own)))
+    feed._loaded(versions)
+    bumps.clear()
+    return feed, bumps
+
+
+def test_current_follows_notifications():
+    feed, bumps = _following({"children": 4, "billing": 2})
+    assert feed.current(["children", "billing"]) == [4, 2]
+
+    feed._on_notify(None, OTHER_PID, "table_versions", "children:5")
+    assert feed.current(["children", "billing"]) == [5, 2]
+    assert bumps == [("children", 5, False)]
+
+    # Not loaded, or connection lost: no answer, the caller reads the database
+    assert feed.current(["attendance"]) is None
+    feed._lost()
+    assert feed.current(["children"]) is None
+
+
+def test_own_write_hides_table_until_its_notification():
+    feed, bumps = _following({"children": 4})
+    feed.writing(OWN_PID, ["children"])
+    assert feed.current(["children"]) is None
+
+    # An earlier commit of another worker doesn't settle ours
+    feed._on_notify(None, OTHER_PID, "table_versions", "children:5")
+    assert feed.current(["children"]) is None
+
+    feed._on_notify(None, OWN_PID, "table_versions", "children:6")
+    assert feed.current(["children"]) == [6]
+    assert bumps == [("children", 5, False), ("children", 6, True)]
+
+
+def test_rolled_back_write_settles():
+    feed, _ = _following({"children": 4})
+    feed.writing(OWN_PID, ["children"])
+    feed.writing(OWN_PID, ["children"])  # the connection's next transaction
+    feed.settled(OWN_PID, ["children"])
+    assert feed.current(["children"]) is None
+    feed.settled(OWN_PID, ["children"])
+    assert feed.current(["children"]) == [4]
@@ -1,10 +1,20 @@
+import sys
 from logging.config import fileConfig
+from pathlib import Path
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
 from alembic import context
 
+# Import the backend's models (childcare-backend/app) for autogenerate
+backend_root = Path(__file__).resolve().parents[2] / "childcare-backend"
+sys.path.append(str(backend_root))
+
+from app.config import settings  # noqa: E402
+from app.database import Base  # noqa: E402
+import app.models  # noqa: E402,F401
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -14,11 +24,26 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# add your model's MetaData object here
-# for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = None
+# The app's models, for 'autogenerate' support
+target_metadata = Base.metadata
+
+# Same database as the API (DATABASE_URL) unless sqlalchemy.url is set in the
+# .ini or passed with `alembic -x url=...`
+url = context.get_x_argument(as_dictionary=True).get("url")
+if url or config.get_main_option("sqlalchemy.url") is None:
+    config.set_main_option("sqlalchemy.url", (url or settings.DATABASE_URL).replace("%", "%%"))
+
+# Dialect-specific objects created by hand in migrations, not declared on the
+# models: the health record full-text search column / index / FTS5 tables (0003)
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name == "idx_health_records_search":
+        return False
+    if type_ == "table" and name.startswith("health_records_fts"):
+        return False
+    return True
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -44,6 +69,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -65,7 +92,12 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            compare_type=True,
+            include_object=include_object,
+            # SQLite can't ALTER most things in place; batch mode copies the table
+            render_as_batch=connection.dialect.name == "sqlite",
         )
 
         with context.begin_transaction():
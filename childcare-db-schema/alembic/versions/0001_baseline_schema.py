@@ -0,0 +1,246 @@
+"""baseline schema (schema.sql)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 09:00:00.000000
+
+Tables and indexes as created by schema.sql. Every statement is IF NOT
+EXISTS, so databases bootstrapped from schema.sql (or by the API's old
+create_all on startup) upgrade in place without a manual `alembic stamp`;
+columns and constraints those tables lack are added to them.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# What the API's old create_all (and older copies of schema.sql) didn't
+# create: added to existing tables by _complete_existing_tables()
+LATE_COLUMNS = (
+    ("children", "photo_url", sa.Text),
+    ("billing", "billing_period", sa.Date),
+)
+UNIQUE_CONSTRAINTS = (
+    ("attendance", "attendance_child_id_date_key", ("child_id", "date")),
+    ("billing", "billing_child_id_billing_period_key", ("child_id", "billing_period")),
+)
+CHECK_CONSTRAINTS = (
+    ("users", "users_role_check", "role", "role IN ('admin','staff','parent')"),
+    ("attendance", "attendance_status_check", "status", "status IN ('Present','Absent','Late','Excused')"),
+    ("billing", "billing_status_check", "status", "status IN ('Paid','Unpaid','Pending','Overdue')"),
+)
+
+
+def _complete_existing_tables() -> None:
+    """
+    Add the LATE_COLUMNS and constraints missing from tables created before
+    this migration. Constraints are matched by columns (schema.sql's are
+    unnamed on SQLite), so fresh databases are left alone. SQLite copies the
+    table (batch mode) to add constraints.
+    """
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for table in ("users", "children", "attendance", "billing"):
+        columns = {c["name"] for c in inspector.get_columns(table)}
+        add_columns = [(name, type_) for t, name, type_ in LATE_COLUMNS if t == table and name not in columns]
+
+        unique_sets = [set(u["column_names"]) for u in inspector.get_unique_constraints(table)]
+        unique_sets += [set(i["column_names"]) for i in inspector.get_indexes(table) if i["unique"]]
+        add_unique = [(name, cols) for t, name, cols in UNIQUE_CONSTRAINTS if t == table and set(cols) not in unique_sets]
+
+        checks = inspector.get_check_constraints(table)
+        add_checks = [
+            (name, condition)
+            for t, name, column, condition in CHECK_CONSTRAINTS
+            if t == table and not any(c.get("name") == name or column in c["sqltext"] for c in checks)
+        ]
+        if not (add_columns or add_unique or add_checks):
+            continue
+
+        for name, cols in add_unique:
+            if any(col not in columns for col in cols):
+                continue  # column added just now: all NULL, nothing to collide
+            key = ", ".join(cols)
+            duplicates = bind.execute(sa.text(
+                f"SELECT count(*) FROM (SELECT 1 FROM {table} GROUP BY {key} HAVING count(*) > 1) AS duplicated"
+            )).scalar()
+            if duplicates:
+                raise RuntimeError(
+                    f"{table} has {duplicates} duplicated ({key}) group(s); remove the extra rows, then upgrade again"
+                )
+
+        with op.batch_alter_table(table) as batch:
+            for name, type_ in add_columns:
+                batch.add_column(sa.Column(name, type_()))
+            for name, cols in add_unique:
+                batch.create_unique_constraint(name, list(cols))
+            for name, condition in add_checks:
+                batch.create_check_constraint(name, condition)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False, unique=True),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("role", sa.String(32), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.CheckConstraint("role IN ('admin','staff','parent')", name="users_role_check"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "staff",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("contact", sa.String(50)),
+        sa.Column("position", sa.String(100)),
+        sa.Column("assigned_room", sa.String(100)),
+        sa.Column("hire_date", sa.Date()),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "children",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("dob", sa.Date()),
+        sa.Column("gender", sa.String(20)),
+        sa.Column("parent_name", sa.String(255)),
+        sa.Column("parent_contact", sa.String(100)),
+        sa.Column("address", sa.Text()),
+        sa.Column("allergies", sa.Text()),
+        sa.Column("medical_info", sa.Text()),
+        sa.Column("photo_url", sa.Text()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "attendance",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("child_id", sa.Integer(), sa.ForeignKey("children.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("check_in", sa.Time()),
+        sa.Column("check_out", sa.Time()),
+        sa.Column("status", sa.String(32), nullable=False, server_default="Present"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("child_id", "date", name="attendance_child_id_date_key"),
+        sa.CheckConstraint("status IN ('Present','Absent','Late','Excused')", name="attendance_status_check"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "health_records",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("child_id", sa.Integer(), sa.ForeignKey("children.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("doctor_name", sa.String(255)),
+        sa.Column("record_date", sa.Date(), server_default=sa.text("CURRENT_DATE")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "activities",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("scheduled_date", sa.Date()),
+        sa.Column("start_time", sa.Time()),
+        sa.Column("end_time", sa.Time()),
+        sa.Column("assigned_staff_id", sa.Integer(), sa.ForeignKey("staff.id", ondelete="SET NULL")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "billing",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("child_id", sa.Integer(), sa.ForeignKey("children.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("amount", sa.Numeric(10, 2), nullable=False),
+        sa.Column("status", sa.String(32), nullable=False, server_default="Unpaid"),
+        sa.Column("issued_date", sa.Date(), server_default=sa.text("CURRENT_DATE")),
+        sa.Column("due_date", sa.Date()),
+        sa.Column("notes", sa.Text()),
+        sa.Column("billing_period", sa.Date()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("child_id", "billing_period", name="billing_child_id_billing_period_key"),
+        sa.CheckConstraint("status IN ('Paid','Unpaid','Pending','Overdue')", name="billing_status_check"),
+        if_not_exists=True,
+    )
+
+    counters = lambda: [
+        sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+        for name in ("present", "late", "absent", "excused")
+    ]
+    op.create_table(
+        "attendance_monthly_summary",
+        sa.Column("child_id", sa.Integer(), sa.ForeignKey("children.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("month", sa.Date(), primary_key=True),
+        *counters(),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "attendance_daily_summary",
+        sa.Column("date", sa.Date(), primary_key=True),
+        *counters(),
+        if_not_exists=True,
+    )
+
+    money = lambda name: sa.Column(name, sa.Numeric(12, 2), nullable=False, server_default="0")
+    op.create_table(
+        "receivables",
+        sa.Column("child_id", sa.Integer(), sa.ForeignKey("children.id", ondelete="CASCADE"), primary_key=True),
+        money("balance"),
+        sa.Column("open_invoices", sa.Integer(), nullable=False, server_default="0"),
+        money("aged_0_30"),
+        money("aged_31_60"),
+        money("aged_61_90"),
+        money("aged_90_plus"),
+        sa.Column("oldest_due_date", sa.Date()),
+        sa.Column("as_of", sa.Date(), nullable=False),
+        if_not_exists=True,
+    )
+
+    # Tables that already existed were skipped above: bring them up to date
+    if not context.is_offline_mode():
+        _complete_existing_tables()
+
+    for name, table, columns in (
+        ("idx_attendance_monthly_summary_month", "attendance_monthly_summary", ["month", "child_id"]),
+        ("idx_children_name", "children", ["name"]),
+        ("idx_attendance_date", "attendance", ["date"]),
+        ("idx_billing_status_due_date", "billing", ["status", "due_date"]),
+        ("idx_children_name_id", "children", ["name", "id"]),
+        ("idx_attendance_date_id", "attendance", ["date", "id"]),
+        ("idx_billing_due_date_id", "billing", ["due_date", "id"]),
+        ("idx_health_records_record_date_id", "health_records", ["record_date", "id"]),
+        ("idx_activities_scheduled_date_id", "activities", ["scheduled_date", "id"]),
+        ("ix_health_records_child_id", "health_records", ["child_id"]),
+        ("ix_billing_child_id", "billing", ["child_id"]),
+    ):
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in (
+        "receivables",
+        "attendance_daily_summary",
+        "attendance_monthly_summary",
+        "billing",
+        "activities",
+        "health_records",
+        "attendance",
+        "children",
+        "staff",
+        "users",
+    ):
+        op.drop_table(table)
@@ -0,0 +1,63 @@
+"""foreign key and composite indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 09:30:00.000000
+
+Index every foreign key that cascades or is filtered on, as composites that
+also serve the per-parent list queries, then drop the single-column indexes
+they make redundant. On PostgreSQL the indexes are built and dropped
+CONCURRENTLY (outside the migration transaction), so writes to the large
+tables are not blocked while they build.
+
+attendance.child_id is already the leading column of UNIQUE (child_id, date).
+If a concurrent build is interrupted PostgreSQL leaves an INVALID index behind;
+drop it and rerun the upgrade.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_INDEXES = (
+    # staff lookups by login (auth, staff creation) and the users -> staff cascade
+    ("ix_staff_user_id", "staff", ["user_id"]),
+    # a staff member's schedule and the staff -> activities SET NULL
+    ("idx_activities_assigned_staff_id_scheduled_date", "activities", ["assigned_staff_id", "scheduled_date"]),
+    # ?child_id= lists in (record_date, id) / (due_date, id) order and the children cascades
+    ("idx_health_records_child_id_record_date", "health_records", ["child_id", "record_date", "id"]),
+    ("idx_billing_child_id_due_date", "billing", ["child_id", "due_date", "id"]),
+)
+
+# Prefixes of the indexes above or of the keyset (key, id) indexes
+REDUNDANT_INDEXES = (
+    ("ix_health_records_child_id", "health_records", ["child_id"]),
+    ("ix_billing_child_id", "billing", ["child_id"]),
+    ("idx_children_name", "children", ["name"]),
+    ("idx_attendance_date", "attendance", ["date"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in NEW_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in NEW_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,89 @@
+"""health record full-text search
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:00:00.000000
+
+GET /health-records/search. On PostgreSQL: a stored generated tsvector
+column over description (weight A) and doctor_name (weight B), so inserts
+and updates keep it current without triggers, and a GIN index built
+CONCURRENTLY. Adding the generated column rewrites health_records once.
+
+On SQLite: an FTS5 external-content table over the same columns, kept in
+sync by triggers and filled from the existing rows. A later batch-mode
+migration that recreates health_records drops the triggers; recreate them.
+
+Neither is declared on the models (dialect-specific); env.py excludes them
+from autogenerate.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_TRIGGERS = {
+    "health_records_fts_ai": """
+        AFTER INSERT ON health_records BEGIN
+            INSERT INTO health_records_fts(rowid, description, doctor_name)
+            VALUES (new.id, new.description, new.doctor_name);
+        END""",
+    "health_records_fts_ad": """
+        AFTER DELETE ON health_records BEGIN
+            INSERT INTO health_records_fts(health_records_fts, rowid, description, doctor_name)
+            VALUES ('delete', old.id, old.description, old.doctor_name);
+        END""",
+    "health_records_fts_au": """
+        AFTER UPDATE OF description, doctor_name ON health_records BEGIN
+            INSERT INTO health_records_fts(health_records_fts, rowid, description, doctor_name)
+            VALUES ('delete', old.id, old.description, old.doctor_name);
+            INSERT INTO health_records_fts(rowid, description, doctor_name)
+            VALUES (new.id, new.description, new.doctor_name);
+        END""",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "ALTER TABLE health_records ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(description, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(doctor_name, '')), 'B')"
+            ") STORED"
+        )
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_health_records_search "
+                "ON health_records USING GIN (search_vector)"
+            )
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS health_records_fts USING fts5("
+            "description, doctor_name, content='health_records', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        for name, body in SQLITE_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        op.execute("INSERT INTO health_records_fts(health_records_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_health_records_search")
+        op.execute("ALTER TABLE health_records DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS health_records_fts")
@@ -0,0 +1,72 @@
+"""recurring activities
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 10:00:00.000000
+
+An activity can carry a recurrence rule (RRULE subset, starting on
+scheduled_date) instead of being stored once per day. recurrence_until
+holds the series' last possible date (NULL = indefinite) so a calendar
+window selects the series overlapping it from a small partial index, built
+CONCURRENTLY on PostgreSQL. Changed or cancelled occurrences are stored
+sparsely in activity_exceptions.
+
+Both new columns are nullable without defaults: adding them doesn't
+rewrite activities.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("activities", sa.Column("recurrence_rule", sa.String(255)))
+    op.add_column("activities", sa.Column("recurrence_until", sa.Date()))
+    op.create_table(
+        "activity_exceptions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("activity_id", sa.Integer(), sa.ForeignKey("activities.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("occurrence_date", sa.Date(), nullable=False),
+        sa.Column("cancelled", sa.Boolean(), nullable=False),
+        sa.Column("title", sa.String(255)),
+        sa.Column("description", sa.Text()),
+        sa.Column("start_time", sa.Time()),
+        sa.Column("end_time", sa.Time()),
+        sa.Column("assigned_staff_id", sa.Integer(), sa.ForeignKey("staff.id", ondelete="SET NULL")),
+        sa.UniqueConstraint("activity_id", "occurrence_date", name="activity_exceptions_activity_id_occurrence_date_key"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_activity_exceptions_assigned_staff_id", "activity_exceptions", ["assigned_staff_id"], if_not_exists=True
+    )
+    # activities may be large: build without blocking writes on PostgreSQL
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_activities_recurring",
+            "activities",
+            ["scheduled_date"],
+            postgresql_where=sa.text("recurrence_rule IS NOT NULL"),
+            sqlite_where=sa.text("recurrence_rule IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("idx_activities_recurring", table_name="activities", postgresql_concurrently=True, if_exists=True)
+    op.drop_table("activity_exceptions", if_exists=True)
+    with op.batch_alter_table("activities") as batch_op:
+        batch_op.drop_column("recurrence_until")
+        batch_op.drop_column("recurrence_rule")
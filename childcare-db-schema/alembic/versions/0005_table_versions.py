@@ -0,0 +1,94 @@
+"""table versions kept by triggers
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 12:00:00.000000
+
+ETags (conditional GETs), the calendar cache key and the typeahead reload
+check compare per-table write counters. They were counted per process, so
+writes from another worker or a script never changed them. Now a trigger on
+each tracked table bumps its row in table_versions inside the writing
+transaction: every writer counts, including COPY and manual edits.
+
+On PostgreSQL the triggers are FOR EACH STATEMENT (a bulk load bumps once
+per statement). The version row stays locked until the writer commits, so
+concurrent writes to the same table serialize at that point; the API's
+write transactions are short. On SQLite (one writer at a time) triggers are
+per row. A later batch-mode migration that recreates a tracked table on
+SQLite drops its triggers; recreate them.
+
+"""
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = (
+    "users", "staff", "children", "attendance", "health_records", "billing", "activities", "activity_exceptions",
+)
+
+PG_FUNCTION = """
+    CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+    BEGIN
+        UPDATE table_versions
+        SET version = version + 1, modified = extract(epoch FROM clock_timestamp())
+        WHERE table_name = TG_TABLE_NAME;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql"""
+
+SQLITE_OPERATIONS = ("insert", "update", "delete")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table = op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(63), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("modified", sa.Float(), nullable=False),
+        if_not_exists=True,
+    )
+    now = time.time()
+    op.bulk_insert(table, [{"table_name": name, "version": 0, "modified": now} for name in TRACKED_TABLES])
+
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        op.execute(PG_FUNCTION)
+        for name in TRACKED_TABLES:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}_version ON {name}")
+            op.execute(
+                f"CREATE TRIGGER {name}_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {name} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+            )
+    elif dialect == "sqlite":
+        for name in TRACKED_TABLES:
+            for operation in SQLITE_OPERATIONS:
+                op.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {name}_version_{operation} AFTER {operation.upper()} ON {name} BEGIN "
+                    "UPDATE table_versions SET version = version + 1, "
+                    "modified = (julianday('now') - 2440587.5) * 86400.0 "
+                    f"WHERE table_name = '{name}'; END"
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        for name in TRACKED_TABLES:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}_version ON {name}")
+        op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    elif dialect == "sqlite":
+        for name in TRACKED_TABLES:
+            for operation in SQLITE_OPERATIONS:
+                op.execute(f"DROP TRIGGER IF EXISTS {name}_version_{operation}")
+    op.drop_table("table_versions", if_exists=True)
@@ -0,0 +1,138 @@
+"""bump table versions at commit and NOTIFY them
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 15:00:00.000000
+
+0005 bumped a table's version row from a statement trigger, so the row
+stayed locked from a transaction's first write to its commit: a 5000-row
+roll-call, an import or a billing run made every other write to the table
+wait, and two transactions could lock child rows and version rows in
+opposite orders and deadlock.
+
+On PostgreSQL the per-row trigger now only notes the table in a
+transaction-local setting (the WHEN clause queues one deferred event per
+table per transaction). The deferred constraint trigger fires at commit,
+after all of the transaction's other locks are taken, and bumps every
+table it wrote in table-name order: version rows are locked last, in one
+order, and only while the transaction commits. Each bump is also sent as
+NOTIFY table_versions '<table>:<version>' (delivered after the commit), so
+workers can keep the versions in memory.
+
+TRUNCATE (never issued by the API) can't queue a deferred event; it still
+bumps immediately, while it holds the table's exclusive lock anyway.
+
+SQLite has a single writer; its row triggers from 0005 are unchanged.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = (
+    "users", "staff", "children", "attendance", "health_records", "billing", "activities", "activity_exceptions",
+)
+
+# Tables written by the current transaction, "children,attendance,"
+NOTE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION note_table_change(name text) RETURNS boolean AS $$
+    DECLARE
+        changed text := coalesce(current_setting('childcare.changed_tables', true), '');
+    BEGIN
+        IF position(',' || name || ',' IN ',' || changed) > 0 THEN
+            RETURN false;
+        END IF;
+        PERFORM set_config('childcare.changed_tables', changed || name || ',', true);
+        RETURN true;
+    END
+    $$ LANGUAGE plpgsql"""
+
+BUMP_AT_COMMIT_FUNCTION = """
+    CREATE OR REPLACE FUNCTION bump_table_versions() RETURNS trigger AS $$
+    DECLARE
+        changed text := coalesce(current_setting('childcare.changed_tables', true), '');
+        name text;
+        new_version bigint;
+    BEGIN
+        IF changed = '' THEN
+            RETURN NULL;
+        END IF;
+        PERFORM set_config('childcare.changed_tables', '', true);
+        FOR name IN SELECT unnest(string_to_array(rtrim(changed, ','), ',')) ORDER BY 1 LOOP
+            UPDATE table_versions
+            SET version = version + 1, modified = extract(epoch FROM clock_timestamp())
+            WHERE table_name = name
+            RETURNING version INTO new_version;
+            PERFORM pg_notify('table_versions', name || ':' || new_version);
+        END LOOP;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql"""
+
+BUMP_NOW_FUNCTION = """
+    CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+    DECLARE
+        new_version bigint;
+    BEGIN
+        UPDATE table_versions
+        SET version = version + 1, modified = extract(epoch FROM clock_timestamp())
+        WHERE table_name = TG_TABLE_NAME
+        RETURNING version INTO new_version;
+        PERFORM pg_notify('table_versions', TG_TABLE_NAME || ':' || new_version);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql"""
+
+# 0005's function, for downgrade
+PG_0005_FUNCTION = """
+    CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+    BEGIN
+        UPDATE table_versions
+        SET version = version + 1, modified = extract(epoch FROM clock_timestamp())
+        WHERE table_name = TG_TABLE_NAME;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.execute(NOTE_FUNCTION)
+    op.execute(BUMP_AT_COMMIT_FUNCTION)
+    op.execute(BUMP_NOW_FUNCTION)
+    for name in TRACKED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}_version ON {name}")
+        op.execute(
+            f"CREATE CONSTRAINT TRIGGER {name}_version AFTER INSERT OR UPDATE OR DELETE ON {name} "
+            f"DEFERRABLE INITIALLY DEFERRED FOR EACH ROW WHEN (note_table_change('{name}')) "
+            "EXECUTE FUNCTION bump_table_versions()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {name}_version_truncate AFTER TRUNCATE ON {name} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.execute(PG_0005_FUNCTION)
+    for name in TRACKED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}_version_truncate ON {name}")
+        op.execute(f"DROP TRIGGER IF EXISTS {name}_version ON {name}")
+        op.execute(
+            f"CREATE TRIGGER {name}_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {name} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
+    op.execute("DROP FUNCTION IF EXISTS bump_table_versions()")
+    op.execute("DROP FUNCTION IF EXISTS note_table_change(text)")
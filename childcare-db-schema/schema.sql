@@ -1,5 +1,7 @@
 -- schema.sql
 -- Run this against your 'childcare_db' database.
+-- Reference copy of the schema at the latest migration; the Alembic migrations
+-- in alembic/versions are authoritative (`alembic upgrade head`).
 
 -- Enable uuid extension if you prefer UUIDs (optional)
 -- CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
@@ -70,9 +72,25 @@ CREATE TABLE IF NOT EXISTS activities (
   start_time TIME,
   end_time TIME,
   assigned_staff_id INTEGER REFERENCES staff(id) ON DELETE SET NULL,
+  recurrence_rule VARCHAR(255), -- RRULE subset starting on scheduled_date; NULL for one-off activities
+  recurrence_until DATE, -- last possible occurrence; NULL = runs indefinitely
   created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
 );
 
+-- activity_exceptions: changed or cancelled occurrences of recurring activities
+CREATE TABLE IF NOT EXISTS activity_exceptions (
+  id SERIAL PRIMARY KEY,
+  activity_id INTEGER NOT NULL REFERENCES activities(id) ON DELETE CASCADE,
+  occurrence_date DATE NOT NULL,
+  cancelled BOOLEAN NOT NULL,
+  title VARCHAR(255), -- NULL overrides keep the series' value
+  description TEXT,
+  start_time TIME,
+  end_time TIME,
+  assigned_staff_id INTEGER REFERENCES staff(id) ON DELETE SET NULL,
+  UNIQUE (activity_id, occurrence_date)
+);
+
 -- billing: fees and payments
 CREATE TABLE IF NOT EXISTS billing (
   id SERIAL PRIMARY KEY,
@@ -82,10 +100,145 @@ CREATE TABLE IF NOT EXISTS billing (
   issued_date DATE DEFAULT CURRENT_DATE,
   due_date DATE,
   notes TEXT,
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+  billing_period DATE, -- first day of month for invoices created by a billing run
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+  UNIQUE (child_id, billing_period) -- one generated invoice per child per month
+);
+
+-- attendance summaries: reporting tables maintained incrementally by the API
+CREATE TABLE IF NOT EXISTS attendance_monthly_summary (
+  child_id INTEGER NOT NULL REFERENCES children(id) ON DELETE CASCADE,
+  month DATE NOT NULL, -- first day of the month
+  present INTEGER NOT NULL DEFAULT 0,
+  late INTEGER NOT NULL DEFAULT 0,
+  absent INTEGER NOT NULL DEFAULT 0,
+  excused INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (child_id, month)
+);
+
+CREATE TABLE IF NOT EXISTS attendance_daily_summary (
+  date DATE PRIMARY KEY,
+  present INTEGER NOT NULL DEFAULT 0,
+  late INTEGER NOT NULL DEFAULT 0,
+  absent INTEGER NOT NULL DEFAULT 0,
+  excused INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_attendance_monthly_summary_month ON attendance_monthly_summary(month, child_id);
+
+-- receivables: outstanding balance and aging buckets per child (maintained by the API)
+CREATE TABLE IF NOT EXISTS receivables (
+  child_id INTEGER PRIMARY KEY REFERENCES children(id) ON DELETE CASCADE,
+  balance NUMERIC(12,2) NOT NULL DEFAULT 0,
+  open_invoices INTEGER NOT NULL DEFAULT 0,
+  aged_0_30 NUMERIC(12,2) NOT NULL DEFAULT 0, -- days past due_date (not yet due counts here)
+  aged_31_60 NUMERIC(12,2) NOT NULL DEFAULT 0,
+  aged_61_90 NUMERIC(12,2) NOT NULL DEFAULT 0,
+  aged_90_plus NUMERIC(12,2) NOT NULL DEFAULT 0,
+  oldest_due_date DATE,
+  as_of DATE NOT NULL
 );
 
 -- Indexes for faster queries
-CREATE INDEX IF NOT EXISTS idx_children_name ON children(name);
-CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance(date);
-CREATE INDEX IF NOT EXISTS idx_billing_status ON billing(status);
+CREATE INDEX IF NOT EXISTS idx_billing_status_due_date ON billing(status, due_date);
+
+-- Keyset pagination indexes (ORDER BY key, id on the list endpoints)
+CREATE INDEX IF NOT EXISTS idx_children_name_id ON children(name, id);
+CREATE INDEX IF NOT EXISTS idx_attendance_date_id ON attendance(date, id);
+CREATE INDEX IF NOT EXISTS idx_billing_due_date_id ON billing(due_date, id);
+CREATE INDEX IF NOT EXISTS idx_health_records_record_date_id ON health_records(record_date, id);
+CREATE INDEX IF NOT EXISTS idx_activities_scheduled_date_id ON activities(scheduled_date, id);
+
+-- Foreign keys (cascades, per-parent lookups); attendance.child_id leads UNIQUE (child_id, date)
+CREATE INDEX IF NOT EXISTS ix_staff_user_id ON staff(user_id);
+CREATE INDEX IF NOT EXISTS idx_activities_assigned_staff_id_scheduled_date ON activities(assigned_staff_id, scheduled_date);
+CREATE INDEX IF NOT EXISTS idx_health_records_child_id_record_date ON health_records(child_id, record_date, id);
+CREATE INDEX IF NOT EXISTS idx_billing_child_id_due_date ON billing(child_id, due_date, id);
+CREATE INDEX IF NOT EXISTS ix_activity_exceptions_assigned_staff_id ON activity_exceptions(assigned_staff_id);
+
+-- Recurring activity series (calendar expansion)
+CREATE INDEX IF NOT EXISTS idx_activities_recurring ON activities(scheduled_date) WHERE recurrence_rule IS NOT NULL;
+
+-- Full-text search over health records (GET /health-records/search)
+ALTER TABLE health_records ADD COLUMN IF NOT EXISTS search_vector tsvector
+  GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(description, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(doctor_name, '')), 'B')
+  ) STORED;
+CREATE INDEX IF NOT EXISTS idx_health_records_search ON health_records USING GIN (search_vector);
+
+-- Per-table write counters for ETags and caches, bumped by triggers (so other
+-- workers, scripts and manual edits count). Rows only note the table in the
+-- transaction; a deferred trigger bumps each written table once, at commit,
+-- in table-name order, and NOTIFYs table_versions '<table>:<version>'.
+CREATE TABLE IF NOT EXISTS table_versions (
+  table_name VARCHAR(63) PRIMARY KEY,
+  version BIGINT NOT NULL,
+  modified DOUBLE PRECISION NOT NULL -- epoch seconds of the last write
+);
+INSERT INTO table_versions (table_name, version, modified)
+SELECT name, 0, extract(epoch FROM now())
+FROM unnest(ARRAY['users', 'staff', 'children', 'attendance', 'health_records', 'billing', 'activities', 'activity_exceptions']) AS name
+ON CONFLICT (table_name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION note_table_change(name text) RETURNS boolean AS $$
+DECLARE
+  changed text := coalesce(current_setting('childcare.changed_tables', true), '');
+BEGIN
+  IF position(',' || name || ',' IN ',' || changed) > 0 THEN
+    RETURN false;
+  END IF;
+  PERFORM set_config('childcare.changed_tables', changed || name || ',', true);
+  RETURN true;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION bump_table_versions() RETURNS trigger AS $$
+DECLARE
+  changed text := coalesce(current_setting('childcare.changed_tables', true), '');
+  name text;
+  new_version bigint;
+BEGIN
+  IF changed = '' THEN
+    RETURN NULL;
+  END IF;
+  PERFORM set_config('childcare.changed_tables', '', true);
+  FOR name IN SELECT unnest(string_to_array(rtrim(changed, ','), ',')) ORDER BY 1 LOOP
+    UPDATE table_versions
+    SET version = version + 1, modified = extract(epoch FROM clock_timestamp())
+    WHERE table_name = name
+    RETURNING version INTO new_version;
+    PERFORM pg_notify('table_versions', name || ':' || new_version);
+  END LOOP;
+  RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+-- TRUNCATE can't queue a deferred event: bump right away
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+DECLARE
+  new_version bigint;
+BEGIN
+  UPDATE table_versions
+  SET version = version + 1, modified = extract(epoch FROM clock_timestamp())
+  WHERE table_name = TG_TABLE_NAME
+  RETURNING version INTO new_version;
+  PERFORM pg_notify('table_versions', TG_TABLE_NAME || ':' || new_version);
+  RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE name TEXT;
+BEGIN
+  FOREACH name IN ARRAY ARRAY['users', 'staff', 'children', 'attendance', 'health_records', 'billing', 'activities', 'activity_exceptions'] LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', name || '_version', name);
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', name || '_version_truncate', name);
+    EXECUTE format('CREATE CONSTRAINT TRIGGER %I AFTER INSERT OR UPDATE OR DELETE ON %I '
+                   'DEFERRABLE INITIALLY DEFERRED FOR EACH ROW WHEN (note_table_change(%L)) '
+                   'EXECUTE FUNCTION bump_table_versions()', name || '_version', name, name);
+    EXECUTE format('CREATE TRIGGER %I AFTER TRUNCATE ON %I '
+                   'FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()', name || '_version_truncate', name);
+  END LOOP;
+END
+$$;
@@ -191,4 +191,10 @@ export const billingApi = {
     api.delete(`/billing/${id}`).then((res) => res.data).catch(handleError),
 };
 
+// ---------------- DASHBOARD ----------------
+export const dashboardApi = {
+  get: async () =>
+    api.get("/dashboard").then((res) => res.data).catch(handleError),
+};
+
 export default api;
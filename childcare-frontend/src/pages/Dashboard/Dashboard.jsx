@@ -2,7 +2,7 @@ import React, { useContext, useEffect, useState } from "react";
 import { Link } from "react-router-dom";
 import { AuthContext } from "../../contexts/AuthContext";
 import { motion } from "framer-motion";
-import { childrenApi, staffApi, attendanceApi } from "../../api/api";
+import { dashboardApi } from "../../api/api";
 import {
   User,
   Users,
@@ -32,20 +32,13 @@ const Dashboard = () => {
     const fetchStats = async () => {
       try {
         setStats(prev => ({ ...prev, loading: true }));
-        const [childrenData, staffData, attendanceData] = await Promise.all([
-          childrenApi.getAll(),
-          staffApi.getAll(),
-          attendanceApi.getAll(),
-        ]);
-
-        // Calculate today's attendance
-        const today = new Date().toISOString().split('T')[0];
-        const todayAttendance = attendanceData.filter(a => a.date === today).length;
+        // One aggregated request instead of fetching every table
+        const dashboard = await dashboardApi.get();
 
         setStats({
-          totalChildren: childrenData.length,
-          totalStaff: staffData.length,
-          todayAttendance,
+          totalChildren: dashboard.children_enrolled,
+          totalStaff: dashboard.staff_total,
+          todayAttendance: dashboard.present_today,
           loading: false
         });
       } catch (error) {